@@ -8,25 +8,25 @@ import os
 import argparse
 import binascii
 import logging
-
-from prompt_toolkit.contrib.completers import WordCompleter
-from prompt_toolkit import prompt
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.interface import AbortAction
-from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+import random
 
 from .compiler import compile_dict
 from .compiler import compile_string
 from .compiler import compile_files
 from .compiler import pre_process_dict
-from .parser import parse_string
-from .parser import parse_files
-from .parser import ParseError
+from .compiler import parse_string
+from .compiler import parse_files
+from .compiler import transcode
+from .frozen import generate_python_source
+from .batch import convert_stream
+from .watcher import SpecificationWatcher
+from .errors import ParseError
 from .errors import Error
 from .errors import EncodeError
 from .errors import DecodeError
 from .errors import CompileError
 from .errors import ConstraintsError
+from .codecs import Encoded
 
 
 __author__ = 'Erik Moqvist'
@@ -82,34 +82,148 @@ def _compile_files(specifications, input_codec, output_codec):
 
 
 def _do_convert(args):
-    input_spec, output_spec = _compile_files(args.specification,
-                                             args.input_codec,
-                                             args.output_codec)
-
     if args.hexstring == '-':
-        for hexstring in sys.stdin:
+        statistics = convert_stream(parse_files(args.specification),
+                                    args.input_codec,
+                                    args.output_codec,
+                                    args.type,
+                                    getattr(sys.stdin, 'buffer', sys.stdin),
+                                    sys.stdout,
+                                    args.framing,
+                                    args.prefix_size,
+                                    args.jobs)
+
+        if args.stats:
+            sys.stderr.write(str(statistics) + '\n')
+    else:
+        input_spec, output_spec = _compile_files(args.specification,
+                                                 args.input_codec,
+                                                 args.output_codec)
+        _convert_hexstring(input_spec,
+                           output_spec,
+                           args.output_codec,
+                           args.type,
+                           args.hexstring)
+
+
+def _transcode_hexstring(bundle, input_codec, output_codec, type_name, hexstring):
+    try:
+        encoded = binascii.unhexlify(hexstring)
+    except Exception as e:
+        raise TypeError("'{}': {}".format(hexstring, str(e)))
+
+    encoded = transcode(bundle, type_name, encoded, input_codec, output_codec)
+
+    if output_codec in ['gser', 'xer', 'jer']:
+        return encoded.decode('utf-8')
+    else:
+        return binascii.hexlify(encoded).decode('ascii')
+
+
+def _do_transcode(args):
+    bundle = compile_files(args.specification,
+                           codecs=sorted(set([args.input_codec,
+                                              args.output_codec])))
+
+    if args.input == '-':
+        fin = sys.stdin
+    else:
+        fin = open(args.input, 'r')
+
+    try:
+        for hexstring in fin:
             hexstring = hexstring.strip('\r\n')
 
             if hexstring:
                 try:
-                    _convert_hexstring(input_spec,
-                                       output_spec,
-                                       args.output_codec,
-                                       args.type,
-                                       hexstring)
+                    print(_transcode_hexstring(bundle,
+                                               args.input_codec,
+                                               args.output_codec,
+                                               args.type,
+                                               hexstring))
                 except TypeError:
                     print(hexstring)
-                except DecodeError as e:
+                except (DecodeError, EncodeError) as e:
                     print(hexstring)
                     print(str(e))
             else:
                 print(hexstring)
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+
+
+def _do_profile(args):
+    spec = compile_files(args.specification, args.codec)
+
+    try:
+        encoded = binascii.unhexlify(args.hexstring)
+    except Exception as e:
+        raise TypeError("'{}': {}".format(args.hexstring, str(e)))
+
+    decoded = spec.decode(args.type, encoded)
+    profiler = spec.enable_profiling()
+
+    for _ in range(args.iterations):
+        spec.decode(args.type, encoded)
+
+    for _ in range(args.iterations):
+        spec.encode(args.type, decoded)
+
+    spec.disable_profiling()
+
+    if args.json:
+        print(profiler.as_json(indent=4))
+        return
+
+    print('{:50s} {:20s} {:>10s} {:>12s} {:>12s}'.format(
+        'PATH',
+        'TYPE',
+        'CALLS',
+        'ENCODE [s]',
+        'DECODE [s]'))
+
+    for path, statistics in profiler.top(args.top):
+        print('{:50s} {:20s} {:10d} {:12f} {:12f}'.format(
+            path,
+            statistics['type'],
+            statistics['encode']['calls'] + statistics['decode']['calls'],
+            statistics['encode']['time'],
+            statistics['decode']['time']))
+
+
+def _do_generate(args):
+    spec = compile_files(args.specification, args.codec)
+    randomizer = random.Random(args.seed)
+
+    if args.output == '-':
+        fout = sys.stdout
     else:
-        _convert_hexstring(input_spec,
-                           output_spec,
-                           args.output_codec,
-                           args.type,
-                           args.hexstring)
+        fout = open(args.output, 'w')
+
+    try:
+        for _ in range(args.number_of_samples):
+            decoded = spec.generate(args.type, randomizer, args.size_hint)
+            encoded = spec.encode(args.type, decoded)
+            fout.write(binascii.hexlify(encoded).decode('ascii') + '\n')
+    finally:
+        if fout is not sys.stdout:
+            fout.close()
+
+
+def _do_generate_python(args):
+    if args.output == '-':
+        module_name = 'generated'
+    else:
+        module_name = os.path.splitext(os.path.basename(args.output))[0]
+
+    source = generate_python_source(args.specification, args.codec, module_name)
+
+    if args.output == '-':
+        sys.stdout.write(source)
+    else:
+        with open(args.output, 'w') as fout:
+            fout.write(source)
 
 
 def _handle_command_compile(line):
@@ -176,7 +290,23 @@ def _handle_command_help():
     print('  help')
 
 
+def prompt(*args, **kwargs):
+    """The shell prompt. prompt_toolkit is only needed by the shell, and
+    is therefore imported on first use.
+
+    """
+
+    from prompt_toolkit import prompt as prompt_toolkit_prompt
+
+    return prompt_toolkit_prompt(*args, **kwargs)
+
+
 def _do_shell(_args):
+    from prompt_toolkit.contrib.completers import WordCompleter
+    from prompt_toolkit.history import FileHistory
+    from prompt_toolkit.interface import AbortAction
+    from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+
     commands = ['compile', 'convert', 'help', 'exit']
     completer = WordCompleter(commands, WORD=True)
     user_home = os.path.expanduser('~')
@@ -250,15 +380,138 @@ def _main():
                            choices=('ber', 'der', 'jer', 'per', 'uper', 'xer', 'gser'),
                            default='gser',
                            help='Output format (default: gser).')
+    subparser.add_argument('-f', '--framing',
+                           choices=('hex', 'ber', 'length-prefixed'),
+                           default='hex',
+                           help=('Framing of messages read from standard input; '
+                                 'one hexstring per line, a stream of BER or DER '
+                                 'encoded messages, or binary messages prefixed '
+                                 'by their length (default: hex).'))
+    subparser.add_argument('--prefix-size',
+                           type=int,
+                           choices=(1, 2, 4),
+                           default=4,
+                           help=('Size in bytes of the big endian length prefix '
+                                 'of the length-prefixed framing (default: 4).'))
+    subparser.add_argument('-j', '--jobs',
+                           type=int,
+                           default=1,
+                           help=('Number of worker processes converting messages '
+                                 'read from standard input (default: 1).'))
+    subparser.add_argument('--stats',
+                           action='store_true',
+                           help=('Print the number of converted messages per '
+                                 'second and the number of errors to standard '
+                                 'error when done.'))
     subparser.add_argument('specification',
                            nargs='+',
                            help='ASN.1 specification as one or more .asn files.')
     subparser.add_argument('type', help='Type to convert.')
     subparser.add_argument(
         'hexstring',
-        help='Hexstring to convert, or - to read hexstrings from standard input.')
+        help='Hexstring to convert, or - to read messages from standard input.')
     subparser.set_defaults(func=_do_convert)
 
+    # The 'transcode' subparser.
+    subparser = subparsers.add_parser(
+        'transcode',
+        description=('Transcode hexstrings, one per line, from one codec to '
+                     'another, and print them to standard output. PER and '
+                     'UPER to BER write the output while reading the input, '
+                     'other codecs are decoded and encoded.'))
+    subparser.add_argument('-i', '--input-codec',
+                           choices=('ber', 'der', 'jer', 'per', 'uper', 'xer'),
+                           default='uper',
+                           help='Input codec (default: uper).')
+    subparser.add_argument('-o', '--output-codec',
+                           choices=('ber', 'der', 'jer', 'per', 'uper', 'xer', 'gser'),
+                           default='ber',
+                           help='Output codec (default: ber).')
+    subparser.add_argument('--input',
+                           default='-',
+                           help=('File of hexstrings, or - for standard input '
+                                 '(default: -).'))
+    subparser.add_argument('specification',
+                           nargs='+',
+                           help='ASN.1 specification as one or more .asn files.')
+    subparser.add_argument('type', help='Type to transcode.')
+    subparser.set_defaults(func=_do_transcode)
+
+    # The 'profile' subparser.
+    subparser = subparsers.add_parser(
+        'profile',
+        description=('Decode and encode given hexstring a number of times and '
+                     'print the types with the highest cumulative time.'))
+    subparser.add_argument('-c', '--codec',
+                           choices=('ber', 'der', 'jer', 'per', 'uper', 'xer'),
+                           default='ber',
+                           help='Codec (default: ber).')
+    subparser.add_argument('-n', '--iterations',
+                           type=int,
+                           default=1000,
+                           help='Number of iterations (default: 1000).')
+    subparser.add_argument('-t', '--top',
+                           type=int,
+                           default=20,
+                           help='Number of types to print (default: 20).')
+    subparser.add_argument('--json',
+                           action='store_true',
+                           help='Print the statistics of all types as JSON.')
+    subparser.add_argument('specification',
+                           nargs='+',
+                           help='ASN.1 specification as one or more .asn files.')
+    subparser.add_argument('type', help='Type to profile.')
+    subparser.add_argument('hexstring', help='Hexstring to decode and encode.')
+    subparser.set_defaults(func=_do_profile)
+
+    # The 'generate' subparser.
+    subparser = subparsers.add_parser(
+        'generate',
+        description=('Encode random values of given type and write them as '
+                     'hexstrings, one per line.'))
+    subparser.add_argument('-c', '--codec',
+                           choices=('ber', 'der', 'jer', 'per', 'uper', 'xer'),
+                           default='ber',
+                           help='Codec (default: ber).')
+    subparser.add_argument('-n', '--number-of-samples',
+                           type=int,
+                           default=1,
+                           help='Number of values to generate (default: 1).')
+    subparser.add_argument('-s', '--seed',
+                           type=int,
+                           help='Random seed, for a reproducible corpus.')
+    subparser.add_argument('--size-hint',
+                           type=int,
+                           default=8,
+                           help=('Maximum number of elements, characters, octets '
+                                 'and bits above the SIZE constraint minimum '
+                                 '(default: 8).'))
+    subparser.add_argument('-o', '--output',
+                           default='-',
+                           help='Output file, or - for standard output (default: -).')
+    subparser.add_argument('specification',
+                           nargs='+',
+                           help='ASN.1 specification as one or more .asn files.')
+    subparser.add_argument('type', help='Type to generate values of.')
+    subparser.set_defaults(func=_do_generate)
+
+    # The 'generate-python' subparser.
+    subparser = subparsers.add_parser(
+        'generate-python',
+        description=('Generate a Python module of given specification compiled '
+                     'for given codec, which is imported without parsing it.'))
+    subparser.add_argument('-c', '--codec',
+                           choices=('ber', 'der', 'gser', 'jer', 'per', 'uper', 'xer'),
+                           default='ber',
+                           help='Codec (default: ber).')
+    subparser.add_argument('-o', '--output',
+                           default='-',
+                           help='Output file, or - for standard output (default: -).')
+    subparser.add_argument('specification',
+                           nargs='+',
+                           help='ASN.1 specification as one or more .asn files.')
+    subparser.set_defaults(func=_do_generate_python)
+
     # The 'shell' subparser.
     shell_parser = subparsers.add_parser('shell',
                                          description='An interactive shell.')
@@ -0,0 +1,556 @@
+"""Conversion of streams of encoded messages from one codec to
+another, used by the ``convert`` subcommand.
+
+Messages are read in one of several framings, converted in chunks,
+optionally by several worker processes, and the converted chunks are
+written in order, one write per chunk.
+
+"""
+
+import os
+import stat
+import time
+import struct
+import select
+import binascii
+from collections import deque
+
+from .compiler import compile_dict
+from .compiler import import_codec
+from .codecs import DecodeError
+from .errors import Error
+
+
+FRAMINGS = ('hex', 'ber', 'length-prefixed')
+
+# Big endian length prefix formats per prefix size in bytes.
+LENGTH_PREFIX_FORMATS = {
+    1: '>B',
+    2: '>H',
+    4: '>I'
+}
+
+TEXT_CODECS = ('gser', 'jer', 'xer')
+
+READ_SIZE = 65536
+
+CHUNK_SIZE = 1000
+
+# Seconds between checks for input while waiting for converted chunks.
+POLL_INTERVAL = 0.05
+
+
+class FramingError(object):
+    """The rest of a stream that could not be split into messages, and
+    why. Output as a message that could not be converted.
+
+    """
+
+    def __init__(self, data, reason):
+        self.data = data
+        self.reason = reason
+
+
+def _select_fileno(fin):
+    """Returns the file descriptor of given file object if reading from
+    it may block, as for pipes and terminals, otherwise None.
+
+    """
+
+    try:
+        fileno = fin.fileno()
+        mode = os.fstat(fileno).st_mode
+    except (AttributeError, OSError, ValueError):
+        return None
+
+    if stat.S_ISREG(mode):
+        return None
+
+    return fileno
+
+
+class Reader(object):
+    """Iterates over the messages of given file object, and tells if
+    reading more would block, so messages arriving slowly, for example
+    from ``tail -f``, can be converted before a chunk is full.
+
+    The data available is read at once, and the complete messages in
+    it are kept, so reading would only block once they are all
+    consumed.
+
+    """
+
+    def __init__(self, fin):
+        self._fin = fin
+        self._fileno = _select_fileno(fin)
+
+        if hasattr(fin, 'read1'):
+            self._read = self._read_available
+        elif self._fileno is None:
+            self._read = self._read_size
+        else:
+            # Text and Python 2 files have no read1(), and read() would
+            # wait for READ_SIZE bytes.
+            self._read = self._read_line
+
+        self._messages = deque()
+        self._buffered = None
+
+    def _read_available(self):
+        return self._fin.read1(READ_SIZE)
+
+    def _read_size(self):
+        return self._fin.read(READ_SIZE)
+
+    def _read_line(self):
+        return self._fin.readline(READ_SIZE)
+
+    def __iter__(self):
+        messages = self._messages
+
+        while True:
+            while messages:
+                yield messages.popleft()
+
+            data = self._read()
+
+            if not data:
+                break
+
+            if self._buffered is None:
+                self._buffered = data
+            else:
+                self._buffered += data
+
+            self._split()
+
+        for message in self._finish():
+            yield message
+
+    def would_block(self):
+        """Returns True if there are no messages left to iterate over
+        without reading, and reading would block.
+
+        """
+
+        if self._messages or self._fileno is None:
+            return False
+
+        # select() only supports sockets on Windows, so assume that any
+        # other input may block.
+        if os.name == 'nt':
+            return True
+
+        return not select.select([self._fileno], [], [], 0)[0]
+
+    def _split(self):
+        """Moves the complete messages of the buffered data to the message
+        queue.
+
+        """
+
+        raise NotImplementedError()
+
+    def _finish(self):
+        """Returns the messages of the data left at the end of the stream.
+
+        """
+
+        if self._buffered:
+            return [self._buffered]
+        else:
+            return []
+
+
+class HexReader(Reader):
+    """Lines without their line ending, of a text or binary file object.
+
+    """
+
+    def _split(self):
+        buffered = self._buffered
+
+        if isinstance(buffered, bytes):
+            lines = buffered.split(b'\n')
+        else:
+            lines = buffered.split('\n')
+
+        self._buffered = lines.pop()
+        self._messages.extend([self._decode(line) for line in lines])
+
+    def _finish(self):
+        if self._buffered:
+            return [self._decode(self._buffered)]
+        else:
+            return []
+
+    @staticmethod
+    def _decode(line):
+        if not isinstance(line, str):
+            line = line.decode('utf-8', 'replace')
+
+        return line.strip('\r')
+
+
+class BerReader(Reader):
+    """Consecutive BER or DER encoded messages of a binary file object,
+    split by their definite length. A truncated last message is
+    returned as is.
+
+    If the length of a message can not be decoded, for example as it
+    is indefinite, the end of the message is unknown and the rest of
+    the stream is returned as a :class:`.FramingError`.
+
+    """
+
+    def __init__(self, fin, decode_length):
+        super(BerReader, self).__init__(fin)
+        self._decode_length = decode_length
+        self._reason = None
+
+    def _split(self):
+        if self._reason is not None:
+            return
+
+        buffered = self._buffered
+        offset = 0
+
+        while offset < len(buffered):
+            # The tag and length are within the first few bytes.
+            try:
+                length = self._decode_length(buffered[offset:offset + 16])
+            except DecodeError as e:
+                self._reason = str(e)
+                break
+
+            if length is None or offset + length > len(buffered):
+                break
+
+            self._messages.append(buffered[offset:offset + length])
+            offset += length
+
+        self._buffered = buffered[offset:]
+
+    def _finish(self):
+        if self._reason is not None:
+            return [FramingError(self._buffered, self._reason)]
+        else:
+            return super(BerReader, self)._finish()
+
+
+class LengthPrefixedReader(Reader):
+    """Messages of a binary file object prefixed by their length as a
+    big endian integer of `prefix_size` bytes. A truncated last
+    message is returned as is, without its length prefix.
+
+    """
+
+    def __init__(self, fin, prefix_size):
+        super(LengthPrefixedReader, self).__init__(fin)
+        self._prefix_size = prefix_size
+        self._prefix_format = LENGTH_PREFIX_FORMATS[prefix_size]
+
+    def _split(self):
+        buffered = self._buffered
+        prefix_size = self._prefix_size
+        offset = 0
+
+        while offset + prefix_size <= len(buffered):
+            begin = offset + prefix_size
+            length = struct.unpack(self._prefix_format,
+                                   buffered[offset:begin])[0]
+
+            if begin + length > len(buffered):
+                break
+
+            self._messages.append(buffered[begin:begin + length])
+            offset = begin + length
+
+        self._buffered = buffered[offset:]
+
+    def _finish(self):
+        buffered = self._buffered
+
+        if not buffered:
+            return []
+        elif len(buffered) < self._prefix_size:
+            return [buffered]
+        else:
+            return [buffered[self._prefix_size:]]
+
+
+def read_chunks(reader, chunk_size=CHUNK_SIZE):
+    """Yields lists of at most `chunk_size` messages from given
+    :class:`.Reader`. A chunk is yielded early if reading more would
+    block.
+
+    """
+
+    chunk = []
+
+    for message in reader:
+        chunk.append(message)
+
+        if len(chunk) == chunk_size or reader.would_block():
+            yield chunk
+            chunk = []
+
+    if chunk:
+        yield chunk
+
+
+class Converter(object):
+    """Converts messages of type `type_name` of given parsed
+    specification from `input_codec` to `output_codec`, as the lines
+    written by the ``convert`` subcommand.
+
+    Binary output codecs are transcoded, see
+    :func:`~asn1tools.transcode()`.
+
+    """
+
+    def __init__(self, specification, input_codec, output_codec, type_name):
+        self._bundle = compile_dict(specification,
+                                    codecs=sorted(set([input_codec,
+                                                       output_codec])))
+        self._input_codec = input_codec
+        self._output_codec = output_codec
+        self._type_name = type_name
+
+    def convert(self, encoded):
+        """Returns given encoded message converted to a string.
+
+        """
+
+        if self._output_codec in TEXT_CODECS:
+            decoded = self._bundle[self._input_codec].decode(self._type_name,
+                                                             encoded)
+            converted = self._bundle[self._output_codec].encode(self._type_name,
+                                                                decoded,
+                                                                indent=4).strip()
+        else:
+            converted = binascii.hexlify(
+                self._bundle.transcode(self._type_name,
+                                       encoded,
+                                       self._input_codec,
+                                       self._output_codec))
+
+        return converted.decode('latin-1')
+
+    def convert_chunk(self, framing, chunk):
+        """Returns a tuple of the output of given chunk of messages, the
+        number of messages and the number of messages that could not
+        be converted.
+
+        Hexstring lines that are empty or not hexstrings are output as
+        they are, and are not counted as messages. Messages that could
+        not be converted are output as a hexstring followed by the
+        error.
+
+        """
+
+        lines = []
+        number_of_messages = 0
+        number_of_errors = 0
+
+        for message in chunk:
+            if isinstance(message, FramingError):
+                lines.append(binascii.hexlify(message.data).decode('ascii'))
+                lines.append(message.reason)
+                number_of_messages += 1
+                number_of_errors += 1
+                continue
+
+            if framing == 'hex':
+                hexstring = message
+
+                if not hexstring:
+                    lines.append(hexstring)
+                    continue
+
+                try:
+                    encoded = binascii.unhexlify(hexstring)
+                except (TypeError, ValueError):
+                    lines.append(hexstring)
+                    continue
+            else:
+                encoded = message
+                hexstring = None
+
+            number_of_messages += 1
+
+            # Any error is output, instead of stopping the conversion of
+            # the remaining messages.
+            try:
+                lines.append(self.convert(encoded))
+            except Exception as e:
+                if hexstring is None:
+                    hexstring = binascii.hexlify(encoded).decode('ascii')
+
+                lines.append(hexstring)
+                lines.append(str(e))
+                number_of_errors += 1
+
+        if lines:
+            lines.append('')
+
+        return '\n'.join(lines), number_of_messages, number_of_errors
+
+
+# The converter of a worker process.
+_CONVERTER = None
+
+
+def _init_worker(specification, input_codec, output_codec, type_name):
+    global _CONVERTER
+
+    _CONVERTER = Converter(specification, input_codec, output_codec, type_name)
+
+
+def _convert_chunk(framing, chunk):
+    return _CONVERTER.convert_chunk(framing, chunk)
+
+
+class Statistics(object):
+    """Number of converted messages and errors, and the elapsed time.
+
+    """
+
+    def __init__(self):
+        self.number_of_messages = 0
+        self.number_of_errors = 0
+        self.start_time = time.time()
+        self.elapsed_time = 0.0
+
+    def update(self, number_of_messages, number_of_errors):
+        self.number_of_messages += number_of_messages
+        self.number_of_errors += number_of_errors
+        self.elapsed_time = time.time() - self.start_time
+
+    def __str__(self):
+        if self.elapsed_time > 0:
+            rate = self.number_of_messages / self.elapsed_time
+        else:
+            rate = 0.0
+
+        return ('Converted {} messages in {:.3f} s ({:.0f} messages/s) '
+                'with {} errors.'.format(self.number_of_messages,
+                                         self.elapsed_time,
+                                         rate,
+                                         self.number_of_errors))
+
+
+def create_reader(fin, framing, decode_length=None, prefix_size=4):
+    """Returns a :class:`.Reader` of the messages of given file object,
+    which is a text or binary file for the hexstring framing and a
+    binary file otherwise.
+
+    """
+
+    if framing == 'hex':
+        return HexReader(fin)
+    elif framing == 'ber':
+        return BerReader(fin, decode_length)
+    elif framing == 'length-prefixed':
+        if prefix_size not in LENGTH_PREFIX_FORMATS:
+            raise Error(
+                "expected length prefix size in {}, but got {}".format(
+                    sorted(LENGTH_PREFIX_FORMATS),
+                    prefix_size))
+
+        return LengthPrefixedReader(fin, prefix_size)
+    else:
+        raise Error("expected framing in {}, but got '{}'".format(
+            list(FRAMINGS),
+            framing))
+
+
+def convert_stream(specification,
+                   input_codec,
+                   output_codec,
+                   type_name,
+                   fin,
+                   fout,
+                   framing='hex',
+                   prefix_size=4,
+                   jobs=1):
+    """Convert the messages of type `type_name` of given parsed
+    specification read from file object `fin` in given framing from
+    `input_codec` to `output_codec`, and write them to text file
+    object `fout`. Returns a :class:`.Statistics` object.
+
+    The messages are converted in chunks by `jobs` worker processes,
+    and each converted chunk is written with a single write, in the
+    order the messages were read. Each chunk is flushed as it is
+    written. A chunk is converted early, and the converted chunks are
+    written, when reading from a pipe or terminal would block.
+
+    """
+
+    if jobs < 1:
+        raise Error("expected at least one job, but got {}".format(jobs))
+
+    if framing == 'ber':
+        if input_codec not in ['ber', 'der']:
+            raise Error(
+                "the ber framing requires the ber or der input codec, but "
+                "got '{}'".format(input_codec))
+
+        decode_length = import_codec('ber').decode_length
+    else:
+        decode_length = None
+
+    reader = create_reader(fin, framing, decode_length, prefix_size)
+    chunks = read_chunks(reader)
+    statistics = Statistics()
+
+    if jobs == 1:
+        converter = Converter(specification, input_codec, output_codec, type_name)
+
+        for chunk in chunks:
+            output, number_of_messages, number_of_errors = converter.convert_chunk(
+                framing,
+                chunk)
+            fout.write(output)
+            fout.flush()
+            statistics.update(number_of_messages, number_of_errors)
+    else:
+        # Only imported if needed as it is not part of Python 2.
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures import wait
+
+        pending = deque()
+
+        def write_oldest():
+            output, number_of_messages, number_of_errors = (
+                pending.popleft().result())
+            fout.write(output)
+            fout.flush()
+            statistics.update(number_of_messages, number_of_errors)
+
+        with ProcessPoolExecutor(jobs,
+                                 initializer=_init_worker,
+                                 initargs=(specification,
+                                           input_codec,
+                                           output_codec,
+                                           type_name)) as executor:
+            for chunk in chunks:
+                pending.append(executor.submit(_convert_chunk, framing, chunk))
+
+                # Keep a few chunks per worker in flight, instead of
+                # reading all messages into memory.
+                if len(pending) >= 2 * jobs:
+                    write_oldest()
+
+                # Write the chunks converted while waiting for input,
+                # in order, without waiting for the others.
+                while pending and reader.would_block():
+                    wait([pending[0]], timeout=POLL_INTERVAL)
+
+                    while pending and pending[0].done():
+                        write_oldest()
+
+            while pending:
+                write_oldest()
+
+    return statistics
@@ -0,0 +1,207 @@
+"""A bounded least recently used cache of decoded data.
+
+"""
+
+import sys
+import threading
+from collections import namedtuple
+from collections import OrderedDict
+
+from .records import Record
+
+
+DecodeCacheInfo = namedtuple('DecodeCacheInfo',
+                             [
+                                 'hits',
+                                 'misses',
+                                 'size',
+                                 'maximum_size',
+                                 'number_of_bytes',
+                                 'maximum_number_of_bytes'
+                             ])
+
+
+def copy_decoded(value):
+    """Returns a copy of given decoded value. Only the mutable types
+    created by the decoders are copied, which is a lot faster than
+    copy.deepcopy().
+
+    """
+
+    copy = COPIERS.get(type(value))
+
+    if copy is not None:
+        return copy(value)
+    elif isinstance(value, Record):
+        return copy_record(value)
+    else:
+        return value
+
+
+def copy_dict(value):
+    return {
+        key: item if type(item) in IMMUTABLE_TYPES else copy_decoded(item)
+        for key, item in value.items()
+    }
+
+
+def copy_record(value):
+    return type(value)({
+        key: item if type(item) in IMMUTABLE_TYPES else copy_decoded(item)
+        for key, item in value.items()
+    })
+
+
+def copy_list(value):
+    return [copy_decoded(item) for item in value]
+
+
+def copy_tuple(value):
+    return tuple([copy_decoded(item) for item in value])
+
+
+COPIERS = {
+    dict: copy_dict,
+    list: copy_list,
+    tuple: copy_tuple,
+    bytearray: bytearray
+}
+
+IMMUTABLE_TYPES = frozenset([int, float, bool, str, bytes, type(None)])
+
+
+def size_of_decoded(value):
+    """Returns the approximate number of bytes of given decoded value,
+    including its members and elements, but not the member names,
+    which are shared by all values of a type.
+
+    """
+
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        for item in value.values():
+            size += size_of_decoded(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += size_of_decoded(item)
+    elif isinstance(value, Record):
+        for _, item in value.items():
+            size += size_of_decoded(item)
+
+    return size
+
+
+class DecodeCache(object):
+    """A least recently used cache of decoded data, keyed by type name and
+    encoded data. The cache holds at most `maximum_size` entries and
+    `maximum_number_of_bytes` bytes of encoded and decoded data, the
+    latter as estimated by :func:`size_of_decoded()`. The number of
+    bytes is not limited if None.
+
+    Decoded data is copied both when added to and when returned from
+    the cache, so callers may modify it freely.
+
+    """
+
+    def __init__(self, maximum_size, maximum_number_of_bytes=None):
+        self._maximum_size = maximum_size
+        self._maximum_number_of_bytes = maximum_number_of_bytes
+        self._entries = OrderedDict()
+        self._number_of_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def decode(self, name, data, decode):
+        """Returns given data `data` decoded as given type `name`, from the
+        cache if present, otherwise by calling `decode`.
+
+        """
+
+        data = bytes(data)
+        key = (name, data)
+
+        with self._lock:
+            try:
+                entry = self._entries.pop(key)
+            except KeyError:
+                self._misses += 1
+            else:
+                self._entries[key] = entry
+                self._hits += 1
+
+                return copy_decoded(entry[0])
+
+        decoded = decode(data)
+
+        if self._maximum_size > 0:
+            copy = copy_decoded(decoded)
+            number_of_bytes = len(data) + size_of_decoded(copy)
+
+            if self._fits(number_of_bytes):
+                self._add(key, copy, number_of_bytes)
+
+        return decoded
+
+    def _fits(self, number_of_bytes):
+        if self._maximum_number_of_bytes is None:
+            return True
+
+        return number_of_bytes <= self._maximum_number_of_bytes
+
+    def _add(self, key, decoded, number_of_bytes):
+        with self._lock:
+            if key in self._entries:
+                return
+
+            self._entries[key] = (decoded, number_of_bytes)
+            self._number_of_bytes += number_of_bytes
+
+            while self._is_full():
+                _, (_, number_of_bytes) = self._entries.popitem(last=False)
+                self._number_of_bytes -= number_of_bytes
+
+    def _is_full(self):
+        if len(self._entries) > self._maximum_size:
+            return True
+
+        if self._maximum_number_of_bytes is None:
+            return False
+
+        return self._number_of_bytes > self._maximum_number_of_bytes
+
+    def info(self):
+        with self._lock:
+            return DecodeCacheInfo(self._hits,
+                                   self._misses,
+                                   len(self._entries),
+                                   self._maximum_size,
+                                   self._number_of_bytes,
+                                   self._maximum_number_of_bytes)
+
+    def copy(self, excluded_names):
+        """Returns a copy of this cache, without the entries of given types
+        `excluded_names`.
+
+        """
+
+        copy = DecodeCache(self._maximum_size, self._maximum_number_of_bytes)
+
+        with self._lock:
+            for key, entry in self._entries.items():
+                if key[0] not in excluded_names:
+                    copy._entries[key] = entry
+                    copy._number_of_bytes += entry[1]
+
+            copy._hits = self._hits
+            copy._misses = self._misses
+
+        return copy
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._number_of_bytes = 0
+            self._hits = 0
+            self._misses = 0
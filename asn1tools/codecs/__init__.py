@@ -11,6 +11,21 @@ class EncodeError(_EncodeError):
     pass
 
 
+class Encoded(bytes):
+    """Already encoded data of a BER or DER type. Give an instance of this
+    class instead of a value to insert its bytes as they are in the
+    encoding, after checking its tag.
+
+    >>> encoded = asn1tools.Encoded(b'\\x30\\x03\\x02\\x01\\x05')
+
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'Encoded({})'.format(super(Encoded, self).__repr__())
+
+
 class DecodeError(_DecodeError):
     """General ASN.1 decode error.
 
@@ -18,9 +33,19 @@ class DecodeError(_DecodeError):
 
     def __init__(self, message):
         super(DecodeError, self).__init__()
-        self.message = message
+        self._message = message
         self.location = []
 
+    @property
+    def message(self):
+        """The error message, formatted when first used. Decoders often
+        catch and discard errors, so subclasses postpone formatting
+        until it is needed.
+
+        """
+
+        return self._message
+
     def __str__(self):
         return "{}: {}".format(': '.join(self.location[::-1]),
                                self.message)
@@ -32,12 +57,19 @@ class DecodeTagError(DecodeError):
     """
 
     def __init__(self, type_name, expected_tag, actual_tag, offset):
-        message = "expected {} with tag '{}' at offset {}, but got '{}'".format(
-            type_name,
-            binascii.hexlify(expected_tag).decode('ascii'),
-            offset,
-            binascii.hexlify(actual_tag).decode('ascii'))
-        super(DecodeTagError, self).__init__(message)
+        super(DecodeTagError, self).__init__(None)
+        self.type_name = type_name
+        self.expected_tag = expected_tag
+        self.actual_tag = actual_tag
+        self.offset = offset
+
+    @property
+    def message(self):
+        return "expected {} with tag '{}' at offset {}, but got '{}'".format(
+            self.type_name,
+            binascii.hexlify(self.expected_tag).decode('ascii'),
+            self.offset,
+            binascii.hexlify(self.actual_tag).decode('ascii'))
 
 
 class DecodeContentsLengthError(DecodeError):
@@ -46,12 +78,14 @@ class DecodeContentsLengthError(DecodeError):
     """
 
     def __init__(self, length, offset, contents_max):
-        message = ('expected at least {} contents byte(s) at offset {}, '
-                   'but got {}').format(length,
-                                        offset,
-                                        contents_max - offset)
-        super(DecodeContentsLengthError, self).__init__(message)
-
+        super(DecodeContentsLengthError, self).__init__(None)
         self.length = length
         self.offset = offset
         self.contents_max = contents_max
+
+    @property
+    def message(self):
+        return ('expected at least {} contents byte(s) at offset {}, '
+                'but got {}').format(self.length,
+                                     self.offset,
+                                     self.contents_max - self.offset)
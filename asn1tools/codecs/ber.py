@@ -2,18 +2,29 @@
 
 """
 
+import sys
 import math
 import binascii
 from copy import copy
 
 from ..errors import Error
-from ..parser import EXTENSION_MARKER
+from .compiler import EXTENSION_MARKER
 from . import EncodeError
 from . import DecodeError
 from . import DecodeTagError
 from . import DecodeContentsLengthError
+from . import Encoded
 from . import compiler
 from .compiler import enum_values_as_dict
+from .compiler import flatten
+
+
+# Indexing Python 2 strings gives characters instead of integers, so
+# only bytearray can be decoded as is.
+if sys.version_info[0] > 2:
+    BYTES_TYPES = (bytes, bytearray)
+else:
+    BYTES_TYPES = (bytearray, )
 
 
 class Class(object):
@@ -128,6 +139,17 @@ def decode_integer(data):
     return value
 
 
+def insert_tag_and_length(encoded, offset, tag):
+    """Insert given tag and the definite length of the contents starting
+    at `offset` into `encoded` at `offset`. This way constructed types
+    are encoded in place instead of in a temporary buffer per nesting
+    level.
+
+    """
+
+    encoded[offset:offset] = tag + encode_length_definite(len(encoded) - offset)
+
+
 def encode_signed_integer(data):
     encoded = bytearray()
 
@@ -277,6 +299,10 @@ def decode_real(data):
 
 class Type(object):
 
+    # Tags replaced by implicit tags, which already encoded data of
+    # this type may have.
+    replaced_tags = ()
+
     def __init__(self, name, type_name, number, flags=0):
         self.name = name
         self.type_name = type_name
@@ -293,6 +319,9 @@ class Type(object):
         if not Class.APPLICATION & flags:
             flags |= Class.CONTEXT_SPECIFIC
 
+        if self.tag is not None:
+            self.replaced_tags += (self.tag, )
+
         self.tag = encode_tag(number, flags)
 
     def decode_tag(self, data, offset):
@@ -309,6 +338,8 @@ class Type(object):
 
 class PrimitiveOrConstructedType(object):
 
+    replaced_tags = ()
+
     def __init__(self, name, type_name, number, segment, flags=0):
         self.name = name
         self.type_name = type_name
@@ -329,6 +360,9 @@ class PrimitiveOrConstructedType(object):
         if not Class.APPLICATION & flags:
             flags |= Class.CONTEXT_SPECIFIC
 
+        if self.tag is not None:
+            self.replaced_tags += (self.tag, self.constructed_tag)
+
         self.tag = encode_tag(number, flags)
         self.constructed_tag = copy(self.tag)
         self.constructed_tag[0] |= Encoding.CONSTRUCTED
@@ -509,40 +543,61 @@ class MembersType(Type):
                                           Encoding.CONSTRUCTED)
         self.root_members = root_members
         self.additions = additions
+        self.record_class = None
+        self.open_types = [
+            open_type
+            for open_type in get_open_types(root_members
+                                            + flatten(additions or []))
+            if open_type.table is not None
+        ]
+
+        # First tag octets of OPTIONAL and DEFAULT members with known
+        # tags. Absent members are found by peeking at the next octet
+        # instead of trying to decode them.
+        self.members_first_octets = {}
+
+        for member in root_members + flatten(additions or []):
+            if not member.optional and member.default is None:
+                continue
+
+            tags = get_tags(member)
+
+            if tags is not None:
+                self.members_first_octets[member.name] = frozenset(
+                    [tag[0] for tag in tags])
 
     def set_tag(self, number, flags):
         super(MembersType, self).set_tag(number,
                                          flags | Encoding.CONSTRUCTED)
 
     def encode(self, data, encoded):
-        encoded_members = bytearray()
+        if self.open_types:
+            data = self.encode_open_types(data)
+
+        offset = len(encoded)
 
         for member in self.root_members:
-            self.encode_member(member, data, encoded_members)
+            self.encode_member(member, data, encoded)
 
         if self.additions:
-            self.encode_additions(data, encoded_members)
+            self.encode_additions(data, encoded)
 
-        encoded.extend(self.tag)
-        encoded.extend(encode_length_definite(len(encoded_members)))
-        encoded.extend(encoded_members)
+        insert_tag_and_length(encoded, offset, self.tag)
 
     def encode_additions(self, data, encoded_members):
         try:
             for addition in self.additions:
-                encoded_addition = bytearray()
+                offset = len(encoded_members)
 
                 if isinstance(addition, list):
                     for member in addition:
-                        self.encode_member(member, data, encoded_addition)
+                        self.encode_member(member, data, encoded_members)
                 else:
                     self.encode_member(addition,
                                        data,
-                                       encoded_addition)
-
-                encoded_members.extend(encoded_addition)
+                                       encoded_members)
         except EncodeError:
-            pass
+            del encoded_members[offset:]
 
     def encode_member(self, member, data, encoded_members):
         name = member.name
@@ -550,7 +605,9 @@ class MembersType(Type):
         if name in data:
             value = data[name]
 
-            if isinstance(member, AnyDefinedBy):
+            if isinstance(value, Encoded):
+                encode_encoded(member, value, encoded_members)
+            elif isinstance(member, AnyDefinedBy):
                 member.encode(value, encoded_members, data)
             elif member.default != value or isinstance(member, Null):
                 member.encode(value, encoded_members)
@@ -586,8 +643,38 @@ class MembersType(Type):
                                   offset,
                                   end_offset)
 
+        if self.open_types:
+            self.decode_open_types(values)
+
+        if self.record_class is not None:
+            values = self.record_class(values)
+
         return values, end_offset
 
+    def encode_open_types(self, data):
+        data = dict(data)
+
+        for open_type in self.open_types:
+            if open_type.name in data:
+                data[open_type.name] = open_type.encode_value(
+                    data[open_type.name],
+                    data)
+
+        return data
+
+    def decode_open_types(self, values):
+        # Open types are decoded once all members are known, as the
+        # member giving the type may follow the open type.
+        for open_type in self.open_types:
+            if open_type.name in values:
+                try:
+                    values[open_type.name] = open_type.decode_value(
+                        values[open_type.name],
+                        values)
+                except DecodeError as e:
+                    e.location.append(open_type.name)
+                    raise
+
     def decode_additions(self, data, values, offset, end_offset):
         try:
             for addition in self.additions:
@@ -612,6 +699,15 @@ class MembersType(Type):
             pass
 
     def decode_member(self, member, data, values, offset, end_offset):
+        first_octets = self.members_first_octets.get(member.name)
+
+        if first_octets is not None:
+            if offset >= end_offset or data[offset] not in first_octets:
+                if not member.optional:
+                    values[member.name] = member.default
+
+                return offset
+
         try:
             if offset < end_offset:
                 if isinstance(member, AnyDefinedBy):
@@ -678,14 +774,15 @@ class ArrayType(Type):
                                        flags | Encoding.CONSTRUCTED)
 
     def encode(self, data, encoded):
-        encoded_elements = bytearray()
+        offset = len(encoded)
 
         for entry in data:
-            self.element_type.encode(entry, encoded_elements)
+            if isinstance(entry, Encoded):
+                encode_encoded(self.element_type, entry, encoded)
+            else:
+                self.element_type.encode(entry, encoded)
 
-        encoded.extend(self.tag)
-        encoded.extend(encode_length_definite(len(encoded_elements)))
-        encoded.extend(encoded_elements)
+        insert_tag_and_length(encoded, offset, self.tag)
 
     def decode(self, data, offset):
         offset = self.decode_tag(data, offset)
@@ -1099,7 +1196,10 @@ class Choice(Type):
 
         for member in self.root_members:
             if member.name == data[0]:
-                member.encode(data[1], encoded)
+                if isinstance(data[1], Encoded):
+                    encode_encoded(member, data[1], encoded)
+                else:
+                    member.encode(data[1], encoded)
 
                 return
 
@@ -1165,6 +1265,57 @@ class Any(Type):
         return 'Any({})'.format(self.name)
 
 
+class OpenType(Type):
+    """An open type, encoded as the complete encoding of its value. The
+    value is given as bytes unless the type is known from a component
+    relation constraint table, see :meth:`encode_value()` and
+    :meth:`decode_value()`.
+
+    """
+
+    def __init__(self, name):
+        super(OpenType, self).__init__(name, 'OpenType', None)
+        self.type_member = None
+        self.table = None
+
+    def set_table(self, type_member, table):
+        self.type_member = type_member
+        self.table = table
+
+    def encode(self, data, encoded):
+        encoded.extend(data)
+
+    def encode_value(self, data, values):
+        try:
+            type_ = self.table[values[self.type_member]]
+        except KeyError:
+            return data
+
+        encoded = bytearray()
+        type_.encode(data, encoded)
+
+        return encoded
+
+    def decode(self, data, offset):
+        start = offset
+        _, _, offset = decode_tag(data, offset)
+        length, offset = decode_length_definite(data, offset)
+        end_offset = offset + length
+
+        return data[start:end_offset], end_offset
+
+    def decode_value(self, data, values):
+        try:
+            type_ = self.table[values[self.type_member]]
+        except KeyError:
+            return data
+
+        return type_.decode(data, 0)[0]
+
+    def __repr__(self):
+        return 'OpenType({})'.format(self.name)
+
+
 class AnyDefinedBy(Type):
 
     def __init__(self, name, type_member, choices):
@@ -1248,11 +1399,9 @@ class ExplicitTag(Type):
                                          flags | Encoding.CONSTRUCTED)
 
     def encode(self, data, encoded):
-        encoded_inner = bytearray()
-        self.inner.encode(data, encoded_inner)
-        encoded.extend(self.tag)
-        encoded.extend(encode_length_definite(len(encoded_inner)))
-        encoded.extend(encoded_inner)
+        offset = len(encoded)
+        self.inner.encode(data, encoded)
+        insert_tag_and_length(encoded, offset, self.tag)
 
     def decode(self, data, offset):
         offset = self.decode_tag(data, offset)
@@ -1293,24 +1442,153 @@ class Recursive(Type):
         return 'Recursive({})'.format(self.name)
 
 
+def get_tags(type_):
+    """Returns a list of all tags given type may be encoded with, or None
+    if not known at compile time.
+
+    """
+
+    if isinstance(type_, Choice):
+        tags = []
+
+        for member in type_.root_members:
+            member_tags = get_tags(member)
+
+            if member_tags is None:
+                return None
+
+            tags.extend(member_tags)
+
+        return tags
+    elif type_.tag is None:
+        return None
+    elif isinstance(type_, PrimitiveOrConstructedType):
+        return [type_.tag, type_.constructed_tag]
+    else:
+        return [type_.tag]
+
+
+def has_tag(data, tags):
+    for tag in tags:
+        if data[:len(tag)] == tag:
+            return True
+
+    return False
+
+
+def encode_replaced_tag(type_, data, encoded):
+    """Append given already encoded data `data` to `encoded` with its
+    tag replaced by the implicit tag of given type `type_`, keeping
+    its constructed bit. Returns False if the data does not have a tag
+    replaced by the implicit tag.
+
+    """
+
+    for tag in type_.replaced_tags:
+        if data[:len(tag)] == tag:
+            offset = len(encoded)
+            encoded.extend(type_.tag)
+            encoded[offset] |= (ord(data[:1]) & Encoding.CONSTRUCTED)
+            encoded.extend(data[len(tag):])
+
+            return True
+
+    return False
+
+
+def encode_encoded(type_, data, encoded):
+    """Append given already encoded data `data` of given type `type_` to
+    `encoded`. The tag is checked if known at compile time. Data of
+    the inner type of an explicitly tagged type is wrapped in the
+    explicit tag, and the tag of data of the inner type of an
+    implicitly tagged type is replaced by the implicit tag.
+
+    """
+
+    tags = get_tags(type_)
+
+    if tags is None or has_tag(data, tags):
+        encoded.extend(data)
+
+        return
+
+    if isinstance(type_, ExplicitTag):
+        inner_tags = get_tags(type_.inner)
+
+        if (inner_tags is None
+            or has_tag(data, inner_tags)
+            or has_tag(data, type_.inner.replaced_tags)):
+            offset = len(encoded)
+            encode_encoded(type_.inner, data, encoded)
+            insert_tag_and_length(encoded, offset, type_.tag)
+
+            return
+    elif encode_replaced_tag(type_, data, encoded):
+        return
+
+    raise EncodeError(
+        "expected encoded data with tag {}, but got '{}'".format(
+            ' or '.join([
+                "'{}'".format(binascii.hexlify(tag).decode('ascii'))
+                for tag in tags
+            ]),
+            binascii.hexlify(data[:len(tags[0])]).decode('ascii')))
+
+
+def get_open_types(members):
+    """Returns all open types in given list of members, including
+    explicitly tagged open types.
+
+    """
+
+    open_types = []
+
+    for member in members:
+        if isinstance(member, ExplicitTag):
+            member = member.inner
+
+        if isinstance(member, OpenType):
+            open_types.append(member)
+
+    return open_types
+
+
 class CompiledType(compiler.CompiledType):
 
     def __init__(self, type_, constraints):
         super(CompiledType, self).__init__(constraints)
         self._type = type_
 
-    @property
-    def type(self):
-        return self._type
-
     def encode(self, data):
         encoded = bytearray()
-        self._type.encode(data, encoded)
+        self.encode_into(data, encoded)
 
         return encoded
 
+    def encode_into(self, data, buffer):
+        offset = len(buffer)
+
+        try:
+            if isinstance(data, Encoded):
+                encode_encoded(self._type, data, buffer)
+            else:
+                self._type.encode(data, buffer)
+        except Exception:
+            del buffer[offset:]
+            raise
+
+        return len(buffer) - offset
+
+    def pre_encode(self, data):
+        return Encoded(self.encode(data))
+
     def decode(self, data):
-        return self._type.decode(bytearray(data), 0)[0]
+        # Slices of bytes and bytearray objects have the methods the
+        # types need, but slices of memoryview objects do not.
+        if not isinstance(data, BYTES_TYPES):
+            data = bytearray(data)
+
+        return self._type.decode(data, 0)[0]
 
     def __repr__(self):
         return repr(self._type)
@@ -1407,6 +1685,8 @@ class Compiler(compiler.Compiler):
             compiled = AnyDefinedBy(name,
                                     type_descriptor['value'],
                                     choices)
+        elif type_name == 'OpenType':
+            compiled = OpenType(name)
         elif type_name == 'NULL':
             compiled = Null(name)
         else:
@@ -1470,6 +1750,11 @@ class Compiler(compiler.Compiler):
                                          module_name,
                                          compiled_members)
 
+        self.compile_open_type_tables(
+            members,
+            get_open_types(compiled_members + flatten(additions or [])),
+            module_name)
+
         return compiled_members, additions
 
     def compile_extension_member(self,
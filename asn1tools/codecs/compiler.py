@@ -4,7 +4,19 @@
 
 from copy import deepcopy
 from ..errors import CompileError
-from ..parser import EXTENSION_MARKER
+
+
+# Marks the position of the extension marker, ..., in member, value
+# and constraint lists created by the parser.
+EXTENSION_MARKER = None
+
+# Default upper limit of the number of elements, characters, octets
+# and bits above the SIZE constraint's minimum of generated values.
+DEFAULT_SIZE_HINT = 8
+
+# Specification module sections that may be imported from other
+# modules.
+SECTIONS = ['types', 'values', 'object-classes', 'object-sets']
 
 
 def flatten(dlist):
@@ -23,15 +35,60 @@ class CompiledType(object):
 
     def __init__(self, constraints):
         self._constraints = constraints
+        self._type_descriptor = None
+        self._generator = None
+
+    @property
+    def type(self):
+        return self._type
 
     def check_constraints(self, data):
         self._constraints.check(data)
 
+    def set_type_descriptor(self,
+                            specification,
+                            type_name,
+                            type_descriptor,
+                            module_name):
+        """Set the pre-processed specification and the descriptor this
+        type was compiled from, used by the codec independent features
+        below.
+
+        """
+
+        self._type_descriptor = (specification,
+                                 type_name,
+                                 type_descriptor,
+                                 module_name)
+
+    def generate(self, seed=None, size_hint=DEFAULT_SIZE_HINT):
+        if self._generator is None:
+            # Imported here as the generator depends on this module.
+            from .generator import Generator
+
+            self._generator = Generator(*self._type_descriptor)
 
-class Constraints(object):
+        return self._generator.generate(seed, size_hint)
 
-    def check(self, data):
-        raise NotImplementedError('constraints check is not yet implemented')
+    def decode_columns(self, messages, fields=None):
+        from ..columns import decode_columns
+
+        specification, _, type_descriptor, module_name = self._type_descriptor
+
+        return decode_columns(self.decode,
+                              specification,
+                              type_descriptor,
+                              module_name,
+                              messages,
+                              fields)
+
+    def encode_into(self, data, buffer):
+        raise NotImplementedError(
+            'encoding into a buffer is only supported by the BER and DER codecs')
+
+    def pre_encode(self, data):
+        raise NotImplementedError(
+            'pre-encoding is only supported by the BER and DER codecs')
 
 
 class Compiler(object):
@@ -39,37 +96,58 @@ class Compiler(object):
     def __init__(self, specification):
         self._specification = specification
         self._types_backtrace = []
+        self._types_backtrace_set = set()
+        self._imports = {}
+        self._symbols = {section: {} for section in SECTIONS}
         self.recurvise_types = []
 
     def types_backtrace_push(self, type_name):
         self._types_backtrace.append(type_name)
+        self._types_backtrace_set.add(type_name)
 
     def types_backtrace_pop(self):
-        self._types_backtrace.pop()
+        self._types_backtrace_set.discard(self._types_backtrace.pop())
 
     @property
     def types_backtrace(self):
-        return self._types_backtrace
+        """The names of the types being compiled, as a set for fast
+        recursion detection.
 
-    def process(self):
-        self.pre_process()
+        """
 
-        compiled = {}
+        return self._types_backtrace_set
 
-        for module_name in self._specification:
-            items = self._specification[module_name]['types'].items()
+    def process(self, compiled=None, pre_processed=False):
+        """Compile the specification and return a dictionary of modules of
+        compiled types. Types in given dictionary of modules of
+        compiled types `compiled` are not compiled again, but added
+        to the returned dictionary. The specification is not
+        pre-processed if `pre_processed` is True.
 
-            for type_name, type_descriptor in items:
-                self.types_backtrace_push(type_name)
-                compiled_type = self.process_type(type_name,
-                                                  type_descriptor,
-                                                  module_name)
-                self.types_backtrace_pop()
+        """
+
+        if pre_processed:
+            self.build_symbol_index()
+        else:
+            self.pre_process()
 
-                if module_name not in compiled:
-                    compiled[module_name] = {}
+        if compiled is None:
+            compiled = {}
+        else:
+            compiled = {
+                module_name: dict(types)
+                for module_name, types in compiled.items()
+            }
+
+        for module_name, type_name in self.iter_type_names():
+            if module_name not in compiled:
+                compiled[module_name] = {}
+            elif type_name in compiled[module_name]:
+                continue
 
-                compiled[module_name][type_name] = compiled_type
+            compiled[module_name][type_name] = self.process_named_type(
+                module_name,
+                type_name)
 
         for recursive_type in self.recurvise_types:
             compiled_module = compiled[recursive_type.module_name]
@@ -78,7 +156,42 @@ class Compiler(object):
 
         return compiled
 
+    def iter_type_names(self):
+        """Yields the module name and type name of each type to compile in
+        the pre-processed specification.
+
+        """
+
+        for module_name in self._specification:
+            items = self._specification[module_name]['types'].items()
+
+            for type_name, type_descriptor in items:
+                if not self.is_parameterized_type(type_name, type_descriptor):
+                    yield module_name, type_name
+
+    def process_named_type(self, module_name, type_name):
+        """Compile given type in the pre-processed specification. Recursive
+        types found are added to ``recurvise_types``, and must be given
+        their inner type by the caller.
+
+        """
+
+        type_descriptor = self._specification[module_name]['types'][type_name]
+        self.types_backtrace_push(type_name)
+        compiled_type = self.process_type(type_name,
+                                          type_descriptor,
+                                          module_name)
+        self.types_backtrace_pop()
+        compiled_type.set_type_descriptor(self._specification,
+                                          type_name,
+                                          type_descriptor,
+                                          module_name)
+
+        return compiled_type
+
     def pre_process(self):
+        self.build_symbol_index()
+
         for module_name in self._specification:
             module = self._specification[module_name]
 
@@ -89,6 +202,11 @@ class Compiler(object):
 
             self.pre_process_tags(module, module_name)
 
+        for module_name in self._specification:
+            module = self._specification[module_name]
+
+            self.pre_process_parameterization(module, module_name)
+
         return self._specification
 
     def pre_process_components_of(self, module, module_name):
@@ -163,7 +281,8 @@ class Compiler(object):
             tag = type_descriptor['tag']
 
             if 'kind' not in tag:
-                if self.resolve_type_name(type_name, module_name) == 'CHOICE':
+                if self.resolve_type_name(type_name, module_name) in ['CHOICE',
+                                                                      'OpenType']:
                     tag['kind'] = 'EXPLICIT'
                 elif module_tags in ['IMPLICIT', 'EXPLICIT']:
                     tag['kind'] = module_tags
@@ -217,6 +336,104 @@ class Compiler(object):
                                        module_tags,
                                        module_name)
 
+    def pre_process_parameterization(self, module, module_name):
+        for type_descriptor in list(module['types'].values()):
+            if 'parameters' in type_descriptor:
+                continue
+
+            self.pre_process_parameterization_type(type_descriptor,
+                                                   module_name)
+
+    def pre_process_parameterization_type(self, type_descriptor, module_name):
+        type_name = type_descriptor['type']
+
+        if 'actual-parameters' in type_descriptor:
+            self.pre_process_parameterization_instantiate(type_descriptor,
+                                                          module_name)
+        elif type_name in ['SEQUENCE', 'SET', 'CHOICE']:
+            for member in flatten(type_descriptor['members']):
+                if member == EXTENSION_MARKER:
+                    continue
+
+                self.pre_process_parameterization_type(member, module_name)
+        elif type_name in ['SEQUENCE OF', 'SET OF']:
+            self.pre_process_parameterization_type(type_descriptor['element'],
+                                                   module_name)
+
+    def pre_process_parameterization_instantiate(self,
+                                                 type_descriptor,
+                                                 module_name):
+        """Replace given reference to a parameterized type with a reference
+        to an instance of it, added to the module the parameterized
+        type is defined in. Actual parameters are given as external
+        references as they are likely not visible in that module.
+
+        """
+
+        type_name = type_descriptor['type']
+        parameterized_type_descriptor, parameterized_module_name = (
+            self.lookup_type_descriptor(type_name, module_name))
+
+        if 'parameters' not in parameterized_type_descriptor:
+            raise CompileError("Type '{}' is not parameterized.".format(
+                type_name))
+
+        actual_parameters = [
+            self.qualify_actual_parameter(parameter, module_name)
+            for parameter in type_descriptor.pop('actual-parameters')
+        ]
+        instance_name = '{}{{{}}}'.format(
+            type_name.split('.')[-1],
+            ', '.join([str(parameter) for parameter in actual_parameters]))
+        types = self._specification[parameterized_module_name]['types']
+
+        if instance_name not in types:
+            parameters = dict(zip(parameterized_type_descriptor['parameters'],
+                                  actual_parameters))
+            instance = substitute_parameters(
+                {
+                    key: value
+                    for key, value in parameterized_type_descriptor.items()
+                    if key != 'parameters'
+                },
+                parameters)
+            types[instance_name] = instance
+            self.pre_process_parameterization_type(instance,
+                                                   parameterized_module_name)
+
+        type_descriptor['type'] = '{}.{}'.format(parameterized_module_name,
+                                                 instance_name)
+
+    def qualify_actual_parameter(self, parameter, module_name):
+        if isinstance(parameter, dict):
+            parameter = dict(parameter)
+            parameter['type'] = self.qualify_actual_parameter(
+                parameter['type'],
+                module_name)
+        elif isinstance(parameter, str) and '.' not in parameter:
+            for section, debug_string in [('object-sets', 'object set'),
+                                          ('values', 'value'),
+                                          ('types', 'type')]:
+                try:
+                    _, module_name = self.lookup_in_modules(section,
+                                                            debug_string,
+                                                            parameter,
+                                                            module_name)
+                except CompileError:
+                    continue
+
+                return '{}.{}'.format(module_name, parameter)
+
+        return parameter
+
+    def is_parameterized_type(self, type_name, type_descriptor):
+        """Parameterized types and their instances are only compiled where
+        referenced.
+
+        """
+
+        return 'parameters' in type_descriptor or '{' in type_name
+
     def resolve_type_name(self, type_name, module_name):
         try:
             while True:
@@ -236,7 +453,14 @@ class Compiler(object):
                             type_name,
                             type_descriptor,
                             module_name):
-        return Constraints()
+        # Imported here as the constraints checker depends on this
+        # module.
+        from .constraints_checker import Constraints
+
+        return Constraints(self._specification,
+                           type_name,
+                           type_descriptor,
+                           module_name)
 
     def get_size_range(self, type_descriptor, module_name):
         """Returns a tuple of the minimum and maximum values allowed according
@@ -302,110 +526,381 @@ class Compiler(object):
 
         return False
 
-    def lookup_type_descriptor(self, type_name, module_name):
-        module = self._specification[module_name]
-        type_descriptor = None
+    def get_imports(self, module_name):
+        """Returns a dictionary of names imported by given module to the
+        name of the module each is imported from.
 
-        if type_name in module['types']:
-            type_descriptor = module['types'][type_name]
-        else:
-            for from_module_name, imports in module['imports'].items():
-                if type_name in imports:
-                    try:
-                        from_module = self._specification[from_module_name]
-                    except KeyError:
-                        raise CompileError(
-                            "Module '{}' cannot import type '{}' from missing "
-                            "module '{}'.".format(module_name,
-                                                  type_name,
-                                                  from_module_name))
-
-                    try:
-                        type_descriptor = from_module['types'][type_name]
-                    except KeyError:
-                        raise CompileError(
-                            "Type '{}' imported by module '{}' not found "
-                            "in module '{}'.".format(type_name,
-                                                     module_name,
-                                                     from_module_name))
-
-                    module_name = from_module_name
-                    break
-
-        if type_descriptor is None:
-            raise CompileError("Type '{}' not found in module '{}'.".format(
-                type_name,
-                module_name))
+        """
 
-        return type_descriptor, module_name
+        try:
+            return self._imports[module_name]
+        except KeyError:
+            imports = {}
+            items = self._specification[module_name]['imports'].items()
 
-    def lookup_value(self, value_name, module_name):
-        module = self._specification[module_name]
-        value = None
+            for from_module_name, names in items:
+                for name in names:
+                    imports.setdefault(name, from_module_name)
 
-        if value_name in module['values']:
-            value = module['values'][value_name]
-        else:
-            for from_module_name, imports in module['imports'].items():
-                if value_name in imports:
-                    try:
-                        from_module = self._specification[from_module_name]
-                    except KeyError:
-                        raise CompileError(
-                            "Module '{}' cannot import value '{}' from missing "
-                            "module '{}'.".format(module_name,
-                                                  value_name,
-                                                  from_module_name))
-
-                    try:
-                        value = from_module['values'][value_name]
-                    except KeyError:
-                        raise CompileError(
-                            "Value '{}' imported by module '{}' not found "
-                            "in module '{}'.".format(value_name,
-                                                     module_name,
-                                                     from_module_name))
-
-                    module_name = from_module_name
-                    break
-
-        if value is None:
-            raise CompileError("Value '{}' not found in module '{}'.".format(
-                value_name,
-                module_name))
+            self._imports[module_name] = imports
 
-        return value, module_name
+            return imports
 
-    def lookup_object_class_descriptor(self, object_class_name, module_name):
-        module = self._specification[module_name]
-        object_class_descriptor = None
+    def resolve_import(self, section, name, module_name):
+        """Returns the value of given name imported by given module, and
+        the name of the module it is defined in, following re-exports
+        transitively, or None if not found.
 
-        if object_class_name in module['object-classes']:
-            object_class_descriptor = module['object-classes'][object_class_name]
-        else:
-            raise NotImplementedError()
+        """
+
+        visited = set()
+
+        while module_name not in visited:
+            visited.add(module_name)
+            from_module_name = self.get_imports(module_name).get(name)
+
+            if from_module_name not in self._specification:
+                break
+
+            from_module_section = self._specification[from_module_name].get(
+                section,
+                {})
+
+            if name in from_module_section:
+                return from_module_section[name], from_module_name
 
-        if object_class_descriptor is None:
-            raise CompileError("Object class '{}' not found in module '{}'.".format(
-                object_class_name,
+            module_name = from_module_name
+
+        return None
+
+    def build_symbol_index(self):
+        """Index the imported types, values, object classes and object sets
+        of all modules by module name and name. Definitions local to a
+        module are looked up in the module directly.
+
+        """
+
+        for module_name in self._specification:
+            for name in self.get_imports(module_name):
+                for section in SECTIONS:
+                    symbol = self.resolve_import(section, name, module_name)
+
+                    if symbol is not None:
+                        self._symbols[section][(module_name, name)] = symbol
+
+    def lookup_in_modules(self, section, debug_string, name, module_name):
+        # An external reference, Module.name.
+        if '.' in name:
+            module_name, name = name.split('.', 1)
+
+            if module_name not in self._specification:
+                raise CompileError(
+                    "{} '{}' references missing module '{}'.".format(
+                        debug_string.capitalize(),
+                        name,
+                        module_name))
+
+        module_section = self._specification[module_name].get(section, {})
+
+        if name in module_section:
+            return module_section[name], module_name
+
+        symbols = self._symbols[section]
+
+        try:
+            return symbols[(module_name, name)]
+        except KeyError:
+            pass
+
+        symbol = self.resolve_import(section, name, module_name)
+
+        if symbol is None:
+            raise self.lookup_error(debug_string, name, module_name)
+
+        symbols[(module_name, name)] = symbol
+
+        return symbol
+
+    def lookup_error(self, debug_string, name, module_name):
+        from_module_name = self.get_imports(module_name).get(name)
+
+        if from_module_name is None:
+            return CompileError("{} '{}' not found in module '{}'.".format(
+                debug_string.capitalize(),
+                name,
                 module_name))
+        elif from_module_name not in self._specification:
+            return CompileError(
+                "Module '{}' cannot import {} '{}' from missing module "
+                "'{}'.".format(module_name,
+                               debug_string,
+                               name,
+                               from_module_name))
+        else:
+            return CompileError(
+                "{} '{}' imported by module '{}' not found in module "
+                "'{}'.".format(debug_string.capitalize(),
+                               name,
+                               module_name,
+                               from_module_name))
 
-        return object_class_descriptor, module_name
+    def lookup_type_descriptor(self, type_name, module_name):
+        if '.&' in type_name:
+            return self.lookup_object_class_type_descriptor(type_name,
+                                                            module_name)
 
-    def convert_class_member_type(self, type_descriptor, module_name):
-        type_name = type_descriptor['type']
-        class_name, member_name = type_name.split('.')
+        return self.lookup_in_modules('types', 'type', type_name, module_name)
+
+    def lookup_value(self, value_name, module_name):
+        return self.lookup_in_modules('values', 'value', value_name, module_name)
+
+    def lookup_object_class_descriptor(self, object_class_name, module_name):
+        return self.lookup_in_modules('object-classes',
+                                      'object class',
+                                      object_class_name,
+                                      module_name)
+
+    def lookup_object_set(self, object_set_name, module_name):
+        return self.lookup_in_modules('object-sets',
+                                      'object set',
+                                      object_set_name,
+                                      module_name)
+
+    def lookup_object_class_type_descriptor(self, type_name, module_name):
+        """Returns the type descriptor of given object class field type
+        name, for example 'ITEM.&id', and the name of the module the
+        object class is defined in.
+
+        """
+
+        class_name, member_name = type_name.split('.&', 1)
+        member_name = '&' + member_name
         result = self.lookup_object_class_descriptor(class_name,
                                                      module_name)
         object_class_descriptor, module_name = result
-        type_descriptor = deepcopy(type_descriptor)
 
         for member in object_class_descriptor['members']:
             if member['name'] == member_name:
-                type_descriptor['type'] = member['type']
+                return member, module_name
+
+        raise CompileError("Member '{}' not found in object class '{}'.".format(
+            member_name,
+            class_name))
+
+    def lookup_object_set_objects(self, object_set_name, module_name):
+        """Returns a list of all objects in given object set, recursively
+        following references to other object sets and objects. Each
+        object is a tuple of a dictionary of field name to setting, and
+        the name of the module the object is defined in.
+
+        """
+
+        object_set, module_name = self.lookup_object_set(object_set_name,
+                                                         module_name)
+        object_class_descriptor, _ = self.lookup_object_class_descriptor(
+            object_set['class'],
+            module_name)
+        objects = []
+
+        for member in object_set['members']:
+            object_module_name = module_name
+
+            if isinstance(member, str):
+                try:
+                    objects.extend(self.lookup_object_set_objects(member,
+                                                                  module_name))
+                    continue
+                except CompileError:
+                    value, object_module_name = self.lookup_value(member,
+                                                                  module_name)
+                    member = value['value']
+
+            objects.append((self.convert_object(member,
+                                                object_set['class'],
+                                                object_class_descriptor),
+                            object_module_name))
+
+        return objects
+
+    def convert_object(self, object_, class_name, object_class_descriptor):
+        """Returns given object as a dictionary of field name to setting. An
+        object in defined syntax is a list of words, matched against
+        the WITH SYNTAX of its object class.
+
+        """
+
+        if isinstance(object_, dict):
+            return object_
+
+        try:
+            syntax = object_class_descriptor['with-syntax']
+        except KeyError:
+            raise CompileError(
+                "Object class '{}' has no WITH SYNTAX.".format(class_name))
+
+        fields = {}
+        literals = set(flatten_syntax(syntax))
+        position = self.convert_object_syntax(syntax,
+                                              object_,
+                                              0,
+                                              fields,
+                                              literals)
+
+        if position != len(object_):
+            raise CompileError(
+                "Object {} does not match the syntax of object class "
+                "'{}'.".format(object_, class_name))
+
+        # Type field settings are type names.
+        for name, setting in fields.items():
+            if name[1].isupper() and isinstance(setting, str):
+                fields[name] = {'type': setting}
+
+        return fields
+
+    def convert_object_syntax(self, syntax, words, position, fields, literals):
+        for item in syntax:
+            if isinstance(item, list):
+                # An optional group, present if its first literal is.
+                if position < len(words) and words[position] == item[0]:
+                    position = self.convert_object_syntax(item,
+                                                          words,
+                                                          position,
+                                                          fields,
+                                                          literals)
+            elif item.startswith('&'):
+                # A setting is one or more words, for example OCTET
+                # STRING.
+                end = position + 1
+
+                while end < len(words) and words[end] not in literals:
+                    end += 1
+
+                setting = words[position:end]
+
+                if len(setting) == 1:
+                    setting = setting[0]
+                else:
+                    setting = ' '.join([str(word) for word in setting])
+
+                fields[item] = setting
+                position = end
+            elif position < len(words) and words[position] == item:
+                position += 1
+            elif item != ',':
                 break
 
-        return type_descriptor
+        return position
+
+    def convert_object_key(self, setting, module_name):
+        """Returns the value of given object field setting, which may be a
+        reference to a value.
+
+        """
+
+        if isinstance(setting, str):
+            try:
+                setting = self.lookup_value(setting, module_name)[0]['value']
+            except CompileError:
+                pass
+
+        return setting
+
+    def compile_open_type_tables(self, members, open_types, module_name):
+        """Set the table of types of given open types constrained by a
+        component relation constraint, for example {Items}{@id}, where
+        the referenced component is a sibling member. Open types
+        without a table are encoded and decoded as raw bytes.
+
+        """
+
+        members = {
+            member['name']: member
+            for member in flatten(members)
+            if member != EXTENSION_MARKER
+        }
+
+        for open_type in open_types:
+            table = members[open_type.name].get('table')
+
+            if not isinstance(table, list):
+                continue
+
+            object_set_name, component_ids = table
+
+            if len(component_ids) != 1:
+                continue
+
+            type_member_name = component_ids[0].lstrip('.')
+
+            if type_member_name not in members:
+                continue
+
+            key_field = '&' + members[type_member_name]['type'].split('.&')[-1]
+            field = '&' + members[open_type.name]['type'].split('.&')[-1]
+            types = {}
+
+            for object_, object_module_name in self.lookup_object_set_objects(
+                    object_set_name,
+                    module_name):
+                if key_field not in object_ or field not in object_:
+                    continue
+
+                key = self.convert_object_key(object_[key_field],
+                                              object_module_name)
+                types[key] = self.compile_type(open_type.name,
+                                               object_[field],
+                                               object_module_name)
+
+            open_type.set_table(type_member_name, types)
+
+
+def flatten_syntax(syntax):
+    """Returns all literals in given WITH SYNTAX syntax list.
+
+    """
+
+    literals = []
+
+    for item in syntax:
+        if isinstance(item, list):
+            literals.extend(flatten_syntax(item))
+        elif not item.startswith('&'):
+            literals.append(item)
+
+    return literals
+
+
+def substitute_parameters(value, parameters):
+    """Returns a copy of given type descriptor with all dummy references
+    replaced by their actual parameters.
+
+    """
+
+    if isinstance(value, dict):
+        substituted = {}
+
+        for key, item in value.items():
+            if key == 'name':
+                substituted[key] = item
+            else:
+                substituted[key] = substitute_parameters(item, parameters)
+
+        # A dummy type reference is replaced by its actual type.
+        if isinstance(substituted.get('type'), dict):
+            actual_type = substituted.pop('type')
+            actual_type.update(substituted)
+            substituted = actual_type
+
+        return substituted
+    elif isinstance(value, list):
+        return [substitute_parameters(item, parameters) for item in value]
+    elif isinstance(value, tuple):
+        return tuple([substitute_parameters(item, parameters) for item in value])
+    elif isinstance(value, str) and value in parameters:
+        return deepcopy(parameters[value])
+    else:
+        return value
 
 
 def enum_values_as_dict(values):
@@ -0,0 +1,491 @@
+"""Constraints checker.
+
+The SIZE, value range and permitted alphabet (FROM) constraints of a
+type are compiled to a tree of checkers. Types without constraints,
+and members without constrained descendants, are left out of the
+tree, so only the constrained parts of a value are visited when
+checking it. Extensible constraints are not checked, as values
+outside their root are valid, and are encoded as such. Already
+encoded values, :class:`~asn1tools.Encoded` objects, are not checked
+either.
+
+"""
+
+from ..errors import ConstraintsError
+from . import Encoded
+from . import compiler
+from .compiler import EXTENSION_MARKER
+
+
+STRING_TYPES = frozenset([
+    'OCTET STRING',
+    'IA5String',
+    'VisibleString',
+    'UTF8String',
+    'NumericString',
+    'PrintableString',
+    'TeletexString',
+    'GeneralString',
+    'GraphicString',
+    'BMPString',
+    'UniversalString',
+    'ObjectDescriptor'
+])
+
+UNCONSTRAINED_TYPES = frozenset([
+    'REAL',
+    'ENUMERATED',
+    'BOOLEAN',
+    'NULL',
+    'OBJECT IDENTIFIER',
+    'UTCTime',
+    'GeneralizedTime',
+    'ANY',
+    'ANY DEFINED BY',
+    'OpenType',
+    'EXTERNAL'
+])
+
+# The parser gives permitted alphabets as 'from', while the PER codec
+# reads 'permitted-alphabet'.
+PERMITTED_ALPHABET_KEYS = ('from', 'permitted-alphabet')
+
+CONSTRAINT_KEYS = ('size', 'restricted-to') + PERMITTED_ALPHABET_KEYS
+
+
+def format_range(minimum, maximum):
+    if minimum is None:
+        minimum = 'MIN'
+
+    if maximum is None:
+        maximum = 'MAX'
+
+    return '{}..{}'.format(minimum, maximum)
+
+
+def intersect_ranges(ranges):
+    """Returns the minimum and maximum of the intersection of given
+    ranges, where None is an open end.
+
+    """
+
+    minimum = None
+    maximum = None
+
+    for range_minimum, range_maximum in ranges:
+        if range_minimum is not None:
+            if minimum is None or range_minimum > minimum:
+                minimum = range_minimum
+
+        if range_maximum is not None:
+            if maximum is None or range_maximum < maximum:
+                maximum = range_maximum
+
+    return minimum, maximum
+
+
+def is_in_range(value, minimum, maximum):
+    if minimum is not None and value < minimum:
+        return False
+
+    if maximum is not None and value > maximum:
+        return False
+
+    return True
+
+
+class Type(object):
+
+    def __init__(self, location):
+        self.location = location
+
+    def check(self, data):
+        raise NotImplementedError()
+
+
+class Integer(Type):
+
+    def __init__(self, location, minimum, maximum):
+        super(Integer, self).__init__(location)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def check(self, data):
+        if not is_in_range(data, self.minimum, self.maximum):
+            raise ConstraintsError(
+                '{}: {} does not fulfill {}'.format(
+                    self.location,
+                    data,
+                    format_range(self.minimum, self.maximum)))
+
+    def __repr__(self):
+        return 'Integer({})'.format(self.location)
+
+
+class Size(Type):
+
+    def __init__(self, location, minimum, maximum):
+        super(Size, self).__init__(location)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def check_size(self, size):
+        if not is_in_range(size, self.minimum, self.maximum):
+            raise ConstraintsError(
+                '{}: size {} does not fulfill {}'.format(
+                    self.location,
+                    size,
+                    format_range(self.minimum, self.maximum)))
+
+
+class String(Size):
+
+    def __init__(self, location, minimum, maximum, permitted_alphabet):
+        super(String, self).__init__(location, minimum, maximum)
+        self.permitted_alphabet = permitted_alphabet
+
+    def check(self, data):
+        self.check_size(len(data))
+
+        if self.permitted_alphabet is not None:
+            for character in data:
+                if character not in self.permitted_alphabet:
+                    raise ConstraintsError(
+                        "{}: character '{}' does not fulfill the permitted "
+                        "alphabet".format(self.location, character))
+
+    def __repr__(self):
+        return 'String({})'.format(self.location)
+
+
+class BitString(Size):
+
+    def check(self, data):
+        self.check_size(data[1])
+
+    def __repr__(self):
+        return 'BitString({})'.format(self.location)
+
+
+class ArrayType(Size):
+
+    def __init__(self, location, element_type, minimum, maximum):
+        super(ArrayType, self).__init__(location, minimum, maximum)
+        self.element_type = element_type
+
+    def check(self, data):
+        self.check_size(len(data))
+
+        if self.element_type is not None:
+            check = self.element_type.check
+
+            for value in data:
+                if not isinstance(value, Encoded):
+                    check(value)
+
+    def __repr__(self):
+        return 'ArrayType({}, {})'.format(self.location, self.element_type)
+
+
+class MembersType(Type):
+
+    def __init__(self, location, members):
+        super(MembersType, self).__init__(location)
+        self.members = members
+
+    def check(self, data):
+        for name, member in self.members:
+            if name in data:
+                value = data[name]
+
+                if not isinstance(value, Encoded):
+                    member.check(value)
+
+    def __repr__(self):
+        return 'MembersType({}, [{}])'.format(
+            self.location,
+            ', '.join([repr(member) for _, member in self.members]))
+
+
+class Choice(Type):
+
+    def __init__(self, location, members):
+        super(Choice, self).__init__(location)
+        self.members = dict(members)
+
+    def check(self, data):
+        member = self.members.get(data[0])
+
+        if member is not None and not isinstance(data[1], Encoded):
+            member.check(data[1])
+
+    def __repr__(self):
+        return 'Choice({}, [{}])'.format(
+            self.location,
+            ', '.join([repr(member) for member in self.members.values()]))
+
+
+class Recursive(Type):
+    """A reference to a type being compiled. Its checker is compiled on
+    first use.
+
+    """
+
+    def __init__(self, location, compile_inner):
+        super(Recursive, self).__init__(location)
+        self._compile_inner = compile_inner
+        self._inner = None
+
+    def check(self, data):
+        if self._inner is None:
+            self._inner = self._compile_inner()
+
+        if self._inner is not False:
+            self._inner.check(data)
+
+    def __repr__(self):
+        return 'Recursive({})'.format(self.location)
+
+
+class Compiler(compiler.Compiler):
+    """Compiles the constraints of a type in an already pre-processed
+    specification.
+
+    """
+
+    def process_type(self, type_name, type_descriptor, module_name):
+        return self.compile_type('', type_descriptor, module_name)
+
+    def compile_type(self,
+                     location,
+                     type_descriptor,
+                     module_name,
+                     referencing_descriptors=()):
+        """Returns a checker of given type's constraints, or None if the
+        type and all its members are unconstrained.
+
+        `referencing_descriptors` is a tuple of the type descriptors and
+        module names of constrained references to the type, whose
+        constraints are intersected with the type's own.
+
+        """
+
+        type_name = type_descriptor['type']
+        descriptors = ((type_descriptor, module_name), ) + referencing_descriptors
+
+        if type_name in ['SEQUENCE', 'SET']:
+            members = self.compile_members(location,
+                                           type_descriptor['members'],
+                                           module_name)
+
+            if members:
+                return MembersType(location, members)
+        elif type_name == 'CHOICE':
+            members = self.compile_members(location,
+                                           type_descriptor['members'],
+                                           module_name)
+
+            if members:
+                return Choice(location, members)
+        elif type_name in ['SEQUENCE OF', 'SET OF']:
+            element_type = self.compile_type(location,
+                                             type_descriptor['element'],
+                                             module_name)
+            minimum, maximum = self.get_checked_size_range(descriptors)
+
+            if (element_type is not None
+                or minimum is not None
+                or maximum is not None):
+                return ArrayType(location, element_type, minimum, maximum)
+        elif type_name == 'INTEGER':
+            minimum, maximum = self.get_checked_restricted_to_range(descriptors)
+
+            if minimum is not None or maximum is not None:
+                return Integer(location, minimum, maximum)
+        elif type_name in STRING_TYPES:
+            minimum, maximum = self.get_checked_size_range(descriptors)
+            permitted_alphabet = self.get_checked_permitted_alphabet(descriptors)
+
+            if (minimum is not None
+                or maximum is not None
+                or permitted_alphabet is not None):
+                return String(location, minimum, maximum, permitted_alphabet)
+        elif type_name == 'BIT STRING':
+            minimum, maximum = self.get_checked_size_range(descriptors)
+
+            if minimum is not None or maximum is not None:
+                return BitString(location, minimum, maximum)
+        elif type_name not in UNCONSTRAINED_TYPES:
+            return self.compile_user_type(location,
+                                          type_name,
+                                          type_descriptor,
+                                          module_name,
+                                          referencing_descriptors)
+
+        return None
+
+    def compile_user_type(self,
+                          location,
+                          type_name,
+                          type_descriptor,
+                          module_name,
+                          referencing_descriptors=()):
+        if type_name in self.types_backtrace:
+            return Recursive(location,
+                             lambda: self.compile_recursive_type(location,
+                                                                 type_name,
+                                                                 module_name))
+
+        referenced_descriptor, referenced_module_name = self.lookup_type_descriptor(
+            type_name,
+            module_name)
+
+        # Constraints given where the type is referenced are intersected
+        # with those of the referenced type.
+        for key in CONSTRAINT_KEYS:
+            if key in type_descriptor:
+                referencing_descriptors = (
+                    ((type_descriptor, module_name), ) + referencing_descriptors)
+                break
+
+        self.types_backtrace_push(type_name)
+        compiled = self.compile_type(location,
+                                     referenced_descriptor,
+                                     referenced_module_name,
+                                     referencing_descriptors)
+        self.types_backtrace_pop()
+
+        return compiled
+
+    def compile_recursive_type(self, location, type_name, module_name):
+        compiled = Compiler(self._specification).compile_user_type(
+            location,
+            type_name,
+            {'type': type_name},
+            module_name)
+
+        if compiled is None:
+            return False
+
+        return compiled
+
+    def compile_members(self, location, members, module_name):
+        compiled_members = []
+
+        for member in compiler.flatten(members):
+            if member == EXTENSION_MARKER:
+                continue
+
+            if location:
+                member_location = location + '.' + member['name']
+            else:
+                member_location = member['name']
+
+            compiled_member = self.compile_type(member_location,
+                                                member,
+                                                module_name)
+
+            if compiled_member is not None:
+                compiled_members.append((member['name'], compiled_member))
+
+        return compiled_members
+
+    def get_checked_size_range(self, descriptors):
+        ranges = []
+
+        for type_descriptor, module_name in descriptors:
+            minimum, maximum, has_extension_marker = self.get_size_range(
+                type_descriptor,
+                module_name)
+
+            if not has_extension_marker:
+                ranges.append((minimum, maximum))
+
+        return intersect_ranges(ranges)
+
+    def get_checked_restricted_to_range(self, descriptors):
+        ranges = []
+
+        for type_descriptor, module_name in descriptors:
+            minimum, maximum, has_extension_marker = self.get_restricted_to_range(
+                type_descriptor,
+                module_name)
+
+            if not has_extension_marker:
+                ranges.append((minimum, maximum))
+
+        return intersect_ranges(ranges)
+
+    def get_checked_permitted_alphabet(self, descriptors):
+        permitted_alphabet = None
+
+        for type_descriptor, _ in descriptors:
+            alphabet = self.get_permitted_alphabet(type_descriptor)
+
+            if alphabet is None:
+                continue
+
+            if permitted_alphabet is None:
+                permitted_alphabet = alphabet
+            else:
+                permitted_alphabet &= alphabet
+
+        return permitted_alphabet
+
+    def get_permitted_alphabet(self, type_descriptor):
+        for key in PERMITTED_ALPHABET_KEYS:
+            if key in type_descriptor:
+                break
+        else:
+            return None
+
+        items = type_descriptor[key]
+
+        if EXTENSION_MARKER in items:
+            return None
+
+        permitted_alphabet = set()
+
+        for item in items:
+            if isinstance(item, tuple):
+                for value in range(ord(item[0]), ord(item[1]) + 1):
+                    permitted_alphabet.add(chr(value))
+            else:
+                permitted_alphabet.update(item)
+
+        return frozenset(permitted_alphabet)
+
+    def lookup_value(self, value_name, module_name):
+        # MIN and MAX leave the range open in that direction.
+        if value_name in ['MIN', 'MAX']:
+            return {'value': None}, module_name
+
+        return super(Compiler, self).lookup_value(value_name, module_name)
+
+
+class Constraints(object):
+    """The constraints of a type, compiled on first use.
+
+    """
+
+    def __init__(self, specification, type_name, type_descriptor, module_name):
+        self._specification = specification
+        self._type_name = type_name
+        self._type_descriptor = type_descriptor
+        self._module_name = module_name
+        self._checker = None
+
+    def check(self, data):
+        if self._checker is None:
+            checker = Compiler(self._specification)
+            checker.types_backtrace_push(self._type_name)
+            self._checker = checker.process_type(self._type_name,
+                                                 self._type_descriptor,
+                                                 self._module_name)
+            checker.types_backtrace_pop()
+
+            if self._checker is None:
+                self._checker = False
+
+        if self._checker is not False and not isinstance(data, Encoded):
+            self._checker.check(data)
@@ -4,6 +4,7 @@
 
 from . import DecodeTagError
 from . import DecodeContentsLengthError
+from . import Encoded
 from . import ber
 from .ber import Class
 from .ber import Encoding
@@ -14,6 +15,8 @@ from .ber import encode_signed_integer
 from .ber import decode_signed_integer
 from .ber import encode_tag
 from .ber import decode_tag
+from .ber import insert_tag_and_length
+from .ber import encode_encoded
 from .ber import Boolean
 from .ber import Enumerated
 from .ber import Null
@@ -22,10 +25,14 @@ from .ber import Sequence
 from .ber import Set
 from .ber import Choice
 from .ber import Recursive
+from .ber import OpenType
 
 
 class Type(object):
 
+    # See ber.Type.
+    replaced_tags = ()
+
     def __init__(self, name, type_name, number, flags=0):
         self.name = name
         self.type_name = type_name
@@ -42,6 +49,9 @@ class Type(object):
         if not Class.APPLICATION & flags:
             flags |= Class.CONTEXT_SPECIFIC
 
+        if self.tag is not None:
+            self.replaced_tags += (self.tag, )
+
         self.tag = encode_tag(number, flags)
 
     def decode_tag(self, data, offset):
@@ -153,14 +163,15 @@ class ArrayType(Type):
                                        flags | Encoding.CONSTRUCTED)
 
     def encode(self, data, encoded):
-        encoded_elements = bytearray()
+        offset = len(encoded)
 
         for entry in data:
-            self.element_type.encode(entry, encoded_elements)
+            if isinstance(entry, Encoded):
+                encode_encoded(self.element_type, entry, encoded)
+            else:
+                self.element_type.encode(entry, encoded)
 
-        encoded.extend(self.tag)
-        encoded.extend(encode_length_definite(len(encoded_elements)))
-        encoded.extend(encoded_elements)
+        insert_tag_and_length(encoded, offset, self.tag)
 
     def decode(self, data, offset):
         offset = self.decode_tag(data, offset)
@@ -615,6 +626,8 @@ class Compiler(ber.Compiler):
             compiled = AnyDefinedBy(name,
                                     type_descriptor['value'],
                                     choices)
+        elif type_name == 'OpenType':
+            compiled = OpenType(name)
         elif type_name == 'NULL':
             compiled = Null(name)
         else:
@@ -0,0 +1,568 @@
+"""Random value generator.
+
+The types of an already pre-processed specification are compiled to
+a tree of generators that create random values honoring SIZE and
+value range constraints. Only the root of extensible constraints is
+used, while extension additions of SEQUENCE, SET, CHOICE and
+ENUMERATED types are generated.
+
+"""
+
+import binascii
+import random
+
+from .compiler import EXTENSION_MARKER
+from .compiler import DEFAULT_SIZE_HINT
+from . import constraints_checker
+
+
+# Recursive types are generated at most this many levels deep. Below
+# that, optional members and extension additions are left out, SEQUENCE
+# OF and SET OF are as short as possible, and CHOICEs select a
+# non-recursive alternative if there is one.
+MAXIMUM_DEPTH = 4
+
+# Range of unconstrained, and the open end of semi-constrained,
+# INTEGERs.
+INTEGER_RANGE = 1 << 31
+
+DIGITS = '0123456789'
+LETTERS = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+ALPHABETS = {
+    'IA5String': ''.join([chr(value) for value in range(32, 127)]),
+    'VisibleString': ''.join([chr(value) for value in range(32, 127)]),
+    'NumericString': DIGITS + ' ',
+    'PrintableString': LETTERS + DIGITS + " '()+,-./:=?",
+    'UTF8String': LETTERS + DIGITS + ' ',
+    'TeletexString': LETTERS + DIGITS + ' ',
+    'GeneralString': LETTERS + DIGITS + ' ',
+    'GraphicString': LETTERS + DIGITS + ' ',
+    'BMPString': LETTERS + DIGITS + ' ',
+    'UniversalString': LETTERS + DIGITS + ' ',
+    'ObjectDescriptor': LETTERS + DIGITS + ' '
+}
+
+# An encoded BER NULL, used as value of types whose encoding is not
+# known from the specification.
+ANY_VALUE = b'\x05\x00'
+
+
+def random_bytes(randomizer, size):
+    if size == 0:
+        return b''
+
+    return binascii.unhexlify('{:0{}x}'.format(randomizer.getrandbits(8 * size),
+                                               2 * size))
+
+
+def size_range(minimum, maximum, size_hint):
+    """Returns the smallest and largest size to generate. Sizes are
+    limited to `size_hint` above the minimum.
+
+    """
+
+    if minimum is None:
+        minimum = 0
+
+    if maximum is None or maximum > minimum + size_hint:
+        maximum = minimum + size_hint
+
+    return minimum, maximum
+
+
+class Type(object):
+
+    def __init__(self, name):
+        self.name = name
+
+    def generate(self, randomizer, size_hint, depth):
+        raise NotImplementedError()
+
+
+class Integer(Type):
+
+    def __init__(self, name, minimum, maximum):
+        super(Integer, self).__init__(name)
+
+        if minimum is None:
+            if maximum is None:
+                minimum = -INTEGER_RANGE
+            else:
+                minimum = maximum - INTEGER_RANGE
+
+        if maximum is None:
+            maximum = minimum + INTEGER_RANGE
+
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def generate(self, randomizer, size_hint, depth):
+        return randomizer.randint(self.minimum, self.maximum)
+
+    def __repr__(self):
+        return 'Integer({})'.format(self.name)
+
+
+class Real(Type):
+
+    def generate(self, randomizer, size_hint, depth):
+        return randomizer.uniform(-INTEGER_RANGE, INTEGER_RANGE)
+
+    def __repr__(self):
+        return 'Real({})'.format(self.name)
+
+
+class Boolean(Type):
+
+    def generate(self, randomizer, size_hint, depth):
+        return randomizer.getrandbits(1) == 1
+
+    def __repr__(self):
+        return 'Boolean({})'.format(self.name)
+
+
+class Null(Type):
+
+    def generate(self, randomizer, size_hint, depth):
+        return None
+
+    def __repr__(self):
+        return 'Null({})'.format(self.name)
+
+
+class Enumerated(Type):
+
+    def __init__(self, name, values):
+        super(Enumerated, self).__init__(name)
+        self.values = [
+            value[0]
+            for value in values
+            if value != EXTENSION_MARKER
+        ]
+
+    def generate(self, randomizer, size_hint, depth):
+        return randomizer.choice(self.values)
+
+    def __repr__(self):
+        return 'Enumerated({})'.format(self.name)
+
+
+class ObjectIdentifier(Type):
+
+    def generate(self, randomizer, size_hint, depth):
+        return '1.2.{}.{}'.format(randomizer.randint(0, 65535),
+                                  randomizer.randint(0, 65535))
+
+    def __repr__(self):
+        return 'ObjectIdentifier({})'.format(self.name)
+
+
+class String(Type):
+
+    def __init__(self, name, minimum, maximum, alphabet):
+        super(String, self).__init__(name)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.alphabet = alphabet
+
+    def generate(self, randomizer, size_hint, depth):
+        minimum, maximum = size_range(self.minimum, self.maximum, size_hint)
+        choice = randomizer.choice
+        alphabet = self.alphabet
+
+        return ''.join([choice(alphabet)
+                        for _ in range(randomizer.randint(minimum, maximum))])
+
+    def __repr__(self):
+        return 'String({})'.format(self.name)
+
+
+class OctetString(Type):
+
+    def __init__(self, name, minimum, maximum):
+        super(OctetString, self).__init__(name)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def generate(self, randomizer, size_hint, depth):
+        minimum, maximum = size_range(self.minimum, self.maximum, size_hint)
+
+        return random_bytes(randomizer, randomizer.randint(minimum, maximum))
+
+    def __repr__(self):
+        return 'OctetString({})'.format(self.name)
+
+
+class BitString(Type):
+
+    def __init__(self, name, minimum, maximum):
+        super(BitString, self).__init__(name)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def generate(self, randomizer, size_hint, depth):
+        minimum, maximum = size_range(self.minimum, self.maximum, size_hint)
+        number_of_bits = randomizer.randint(minimum, maximum)
+        number_of_bytes = (number_of_bits + 7) // 8
+        data = bytearray(random_bytes(randomizer, number_of_bytes))
+
+        # Unused bits are zero.
+        if number_of_bits % 8 != 0:
+            data[-1] &= (0xff << (8 - number_of_bits % 8)) & 0xff
+
+        return (bytes(data), number_of_bits)
+
+    def __repr__(self):
+        return 'BitString({})'.format(self.name)
+
+
+class UTCTime(Type):
+
+    def generate(self, randomizer, size_hint, depth):
+        return '{:02d}{:02d}{:02d}{:02d}{:02d}{:02d}Z'.format(
+            randomizer.randint(0, 99),
+            randomizer.randint(1, 12),
+            randomizer.randint(1, 28),
+            randomizer.randint(0, 23),
+            randomizer.randint(0, 59),
+            randomizer.randint(0, 59))
+
+    def __repr__(self):
+        return 'UTCTime({})'.format(self.name)
+
+
+class GeneralizedTime(Type):
+
+    def generate(self, randomizer, size_hint, depth):
+        return '{:04d}{:02d}{:02d}{:02d}{:02d}{:02d}Z'.format(
+            randomizer.randint(1970, 2099),
+            randomizer.randint(1, 12),
+            randomizer.randint(1, 28),
+            randomizer.randint(0, 23),
+            randomizer.randint(0, 59),
+            randomizer.randint(0, 59))
+
+    def __repr__(self):
+        return 'GeneralizedTime({})'.format(self.name)
+
+
+class Any(Type):
+
+    def generate(self, randomizer, size_hint, depth):
+        return ANY_VALUE
+
+    def __repr__(self):
+        return 'Any({})'.format(self.name)
+
+
+class Unsupported(Type):
+
+    def __init__(self, name, type_name):
+        super(Unsupported, self).__init__(name)
+        self.type_name = type_name
+
+    def generate(self, randomizer, size_hint, depth):
+        raise NotImplementedError(
+            "generating values of type '{}' is not supported".format(
+                self.type_name))
+
+    def __repr__(self):
+        return 'Unsupported({})'.format(self.name)
+
+
+class ArrayType(Type):
+
+    def __init__(self, name, element_type, minimum, maximum):
+        super(ArrayType, self).__init__(name)
+        self.element_type = element_type
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def generate(self, randomizer, size_hint, depth):
+        minimum, maximum = size_range(self.minimum, self.maximum, size_hint)
+
+        if depth > MAXIMUM_DEPTH:
+            length = minimum
+        else:
+            length = randomizer.randint(minimum, maximum)
+
+        generate = self.element_type.generate
+
+        return [generate(randomizer, size_hint, depth) for _ in range(length)]
+
+    def __repr__(self):
+        return 'ArrayType({}, {})'.format(self.name, self.element_type)
+
+
+class MembersType(Type):
+    """A SEQUENCE or a SET. Optional members, members with a default
+    value and extension additions are present with a probability of
+    one half.
+
+    """
+
+    def __init__(self, name, root_members, additions):
+        super(MembersType, self).__init__(name)
+        self.root_members = root_members
+        self.additions = additions
+
+    def generate(self, randomizer, size_hint, depth):
+        values = {}
+        self.generate_members(self.root_members,
+                              values,
+                              randomizer,
+                              size_hint,
+                              depth)
+
+        if depth <= MAXIMUM_DEPTH:
+            for addition in self.additions:
+                if randomizer.getrandbits(1):
+                    self.generate_members(addition,
+                                          values,
+                                          randomizer,
+                                          size_hint,
+                                          depth)
+
+        return values
+
+    def generate_members(self, members, values, randomizer, size_hint, depth):
+        for member, optional in members:
+            if optional:
+                if depth > MAXIMUM_DEPTH or not randomizer.getrandbits(1):
+                    continue
+
+            values[member.name] = member.generate(randomizer, size_hint, depth)
+
+    def __repr__(self):
+        return 'MembersType({}, [{}])'.format(
+            self.name,
+            ', '.join([repr(member) for member, _ in self.root_members]))
+
+
+class Choice(Type):
+
+    def __init__(self, name, members):
+        super(Choice, self).__init__(name)
+        self.members = members
+        self.shallow_member = members[0]
+
+        for member in members:
+            if not isinstance(member, Recursive):
+                self.shallow_member = member
+                break
+
+    def generate(self, randomizer, size_hint, depth):
+        if depth > MAXIMUM_DEPTH:
+            member = self.shallow_member
+        else:
+            member = randomizer.choice(self.members)
+
+        return (member.name, member.generate(randomizer, size_hint, depth))
+
+    def __repr__(self):
+        return 'Choice({}, [{}])'.format(
+            self.name,
+            ', '.join([repr(member) for member in self.members]))
+
+
+class Recursive(Type):
+    """A reference to a type being compiled. Its generator is compiled
+    on first use.
+
+    """
+
+    def __init__(self, name, compile_inner):
+        super(Recursive, self).__init__(name)
+        self._compile_inner = compile_inner
+        self._inner = None
+
+    def generate(self, randomizer, size_hint, depth):
+        if self._inner is None:
+            self._inner = self._compile_inner()
+
+        return self._inner.generate(randomizer, size_hint, depth + 1)
+
+    def __repr__(self):
+        return 'Recursive({})'.format(self.name)
+
+
+class Compiler(constraints_checker.Compiler):
+    """Compiles a type in an already pre-processed specification to a
+    generator of random values.
+
+    """
+
+    def process_type(self, type_name, type_descriptor, module_name):
+        return self.compile_type(type_name, type_descriptor, module_name)
+
+    def compile_type(self, name, type_descriptor, module_name):
+        type_name = type_descriptor['type']
+
+        if type_name in ['SEQUENCE', 'SET']:
+            root_members, additions = self.compile_members(
+                type_descriptor['members'],
+                module_name)
+            compiled = MembersType(name, root_members, additions)
+        elif type_name == 'CHOICE':
+            root_members, additions = self.compile_members(
+                type_descriptor['members'],
+                module_name)
+            members = [member for member, _ in root_members]
+
+            for addition in additions:
+                members.extend([member for member, _ in addition])
+
+            compiled = Choice(name, members)
+        elif type_name in ['SEQUENCE OF', 'SET OF']:
+            element_type = self.compile_type('',
+                                             type_descriptor['element'],
+                                             module_name)
+            minimum, maximum, _ = self.get_size_range(type_descriptor,
+                                                      module_name)
+            compiled = ArrayType(name, element_type, minimum, maximum)
+        elif type_name == 'INTEGER':
+            minimum, maximum, _ = self.get_restricted_to_range(type_descriptor,
+                                                               module_name)
+            compiled = Integer(name, minimum, maximum)
+        elif type_name == 'REAL':
+            compiled = Real(name)
+        elif type_name == 'BOOLEAN':
+            compiled = Boolean(name)
+        elif type_name == 'NULL':
+            compiled = Null(name)
+        elif type_name == 'ENUMERATED':
+            compiled = Enumerated(name, type_descriptor['values'])
+        elif type_name == 'OBJECT IDENTIFIER':
+            compiled = ObjectIdentifier(name)
+        elif type_name == 'OCTET STRING':
+            minimum, maximum, _ = self.get_size_range(type_descriptor,
+                                                      module_name)
+            compiled = OctetString(name, minimum, maximum)
+        elif type_name in ALPHABETS:
+            minimum, maximum, _ = self.get_size_range(type_descriptor,
+                                                      module_name)
+            permitted_alphabet = self.get_permitted_alphabet(type_descriptor)
+
+            if permitted_alphabet is None:
+                alphabet = ALPHABETS[type_name]
+            else:
+                alphabet = ''.join(sorted(permitted_alphabet))
+
+            compiled = String(name, minimum, maximum, alphabet)
+        elif type_name == 'BIT STRING':
+            minimum, maximum, _ = self.get_size_range(type_descriptor,
+                                                      module_name)
+            compiled = BitString(name, minimum, maximum)
+        elif type_name == 'UTCTime':
+            compiled = UTCTime(name)
+        elif type_name == 'GeneralizedTime':
+            compiled = GeneralizedTime(name)
+        elif type_name in ['ANY', 'ANY DEFINED BY', 'OpenType']:
+            compiled = Any(name)
+        elif type_name == 'EXTERNAL':
+            compiled = Unsupported(name, type_name)
+        else:
+            compiled = self.compile_user_type(name,
+                                              type_name,
+                                              type_descriptor,
+                                              module_name)
+
+        return compiled
+
+    def compile_user_type(self, name, type_name, type_descriptor, module_name):
+        if type_name in self.types_backtrace:
+            return Recursive(name,
+                             lambda: self.compile_recursive_type(name,
+                                                                 type_name,
+                                                                 module_name))
+
+        referenced_descriptor, referenced_module_name = self.lookup_type_descriptor(
+            type_name,
+            module_name)
+
+        # Constraints given where the type is referenced replace those
+        # of the referenced type.
+        constraints = {
+            key: type_descriptor[key]
+            for key in constraints_checker.CONSTRAINT_KEYS
+            if key in type_descriptor
+        }
+
+        if constraints:
+            referenced_descriptor = dict(referenced_descriptor, **constraints)
+
+        self.types_backtrace_push(type_name)
+        compiled = self.compile_type(name,
+                                     referenced_descriptor,
+                                     referenced_module_name)
+        self.types_backtrace_pop()
+
+        return compiled
+
+    def compile_recursive_type(self, name, type_name, module_name):
+        return Compiler(self._specification).compile_user_type(
+            name,
+            type_name,
+            {'type': type_name},
+            module_name)
+
+    def compile_members(self, members, module_name):
+        """Returns a list of the root members, and a list of extension
+        additions, each a list of one member or the members of an
+        addition group. Members are (generator, optional) tuples.
+
+        """
+
+        root_members = []
+        additions = []
+        in_additions = False
+
+        for member in members:
+            if member == EXTENSION_MARKER:
+                in_additions = not in_additions
+                continue
+
+            if isinstance(member, list):
+                additions.append([self.compile_member(group_member, module_name)
+                                  for group_member in member])
+            elif in_additions:
+                additions.append([self.compile_member(member, module_name)])
+            else:
+                root_members.append(self.compile_member(member, module_name))
+
+        return root_members, additions
+
+    def compile_member(self, member, module_name):
+        optional = (member.get('optional', False) or 'default' in member)
+
+        return (self.compile_type(member['name'], member, module_name), optional)
+
+
+class Generator(object):
+    """The random value generator of a type, compiled on first use.
+
+    """
+
+    def __init__(self, specification, type_name, type_descriptor, module_name):
+        self._specification = specification
+        self._type_name = type_name
+        self._type_descriptor = type_descriptor
+        self._module_name = module_name
+        self._generator = None
+
+    def generate(self, seed=None, size_hint=DEFAULT_SIZE_HINT):
+        if self._generator is None:
+            generator = Compiler(self._specification)
+            generator.types_backtrace_push(self._type_name)
+            self._generator = generator.process_type(self._type_name,
+                                                     self._type_descriptor,
+                                                     self._module_name)
+            generator.types_backtrace_pop()
+
+        if isinstance(seed, random.Random):
+            randomizer = seed
+        else:
+            randomizer = random.Random(seed)
+
+        return self._generator.generate(randomizer, size_hint, 0)
@@ -6,7 +6,7 @@ import binascii
 import logging
 import math
 
-from ..parser import EXTENSION_MARKER
+from .compiler import EXTENSION_MARKER
 from . import EncodeError
 from . import DecodeError
 from . import compiler
@@ -521,7 +521,7 @@ class Compiler(compiler.Compiler):
             compiled = BitString(name)
         elif type_name == 'ANY':
             compiled = Any(name)
-        elif type_name == 'ANY DEFINED BY':
+        elif type_name in ['ANY DEFINED BY', 'OpenType']:
             compiled = Any(name)
         elif type_name == 'NULL':
             compiled = Null(name)
@@ -2,12 +2,13 @@
 
 """
 
+import re
 import json
 import binascii
 import math
 import logging
 
-from ..parser import EXTENSION_MARKER
+from .compiler import EXTENSION_MARKER
 from . import EncodeError
 from . import DecodeError
 from . import compiler
@@ -16,9 +17,99 @@ from .compiler import enum_values_as_dict
 
 LOGGER = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+# The fastest installed JSON library used to load and dump JSON
+# documents. The standard library json module is used as fallback for
+# documents the selected library cannot handle, for example integers
+# outside the 64 bits range.
+if orjson is not None:
+    JSON_BACKEND = 'orjson'
+elif ujson is not None:
+    JSON_BACKEND = 'ujson'
+else:
+    JSON_BACKEND = 'json'
+
+# orjson loads integers outside the 64 bits range as floats. Documents
+# with as many consecutive digits as the smallest such integer are
+# loaded by the json module instead.
+LONG_NUMBER_RE = re.compile(b'[0-9]{19}')
+
+
+def json_loads(data):
+    if JSON_BACKEND != 'json':
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        if not LONG_NUMBER_RE.search(data):
+            try:
+                if JSON_BACKEND == 'orjson':
+                    return orjson.loads(data)
+                else:
+                    return ujson.loads(bytes(data))
+            except ValueError:
+                pass
+
+    if not isinstance(data, str):
+        data = bytes(data).decode('utf-8')
+
+    return json.loads(data)
+
+
+def json_dumps(data, indent, backend=JSON_BACKEND):
+    """Dump given data with given backend, which is only used if its
+    output is identical to the output of the json module.
+
+    """
+
+    if indent is None:
+        if backend == 'orjson':
+            try:
+                encoded = orjson.dumps(data)
+            except TypeError:
+                encoded = None
+
+            # Non-ASCII characters are escaped by the json module, but
+            # not by orjson. Fall back to keep the output identical.
+            if encoded is not None and encoded.isascii():
+                return encoded
+
+        string = json.dumps(data, separators=(',', ':'))
+    else:
+        string = json.dumps(data, indent=indent)
+
+    return string.encode('utf-8')
+
+
+def json_backend(type_):
+    """Returns the backend to dump values of given type with. orjson
+    formats floats differently from the json module, for example
+    ``1e100`` instead of ``1e+100``, so types containing REAL are
+    dumped by the json module.
+
+    """
+
+    if has_real(type_):
+        return 'json'
+    else:
+        return JSON_BACKEND
+
 
 class Type(object):
 
+    # True if both encode() and decode() returns given data as is, in
+    # which case containers skip calling them.
+    identity = False
+
     def __init__(self, name, type_name):
         self.name = name
         self.type_name = type_name
@@ -28,6 +119,8 @@ class Type(object):
 
 class Integer(Type):
 
+    identity = True
+
     def __init__(self, name):
         super(Integer, self).__init__(name, 'INTEGER')
 
@@ -74,6 +167,8 @@ class Real(Type):
 
 class Boolean(Type):
 
+    identity = True
+
     def __init__(self, name):
         super(Boolean, self).__init__(name, 'BOOLEAN')
 
@@ -89,6 +184,8 @@ class Boolean(Type):
 
 class IA5String(Type):
 
+    identity = True
+
     def __init__(self, name):
         super(IA5String, self).__init__(name, 'IA5String')
 
@@ -104,6 +201,8 @@ class IA5String(Type):
 
 class NumericString(Type):
 
+    identity = True
+
     def __init__(self, name):
         super(NumericString, self).__init__(name, 'NumericString')
 
@@ -117,20 +216,61 @@ class NumericString(Type):
         return 'NumericString({})'.format(self.name)
 
 
-class Sequence(Type):
+class MembersType(Type):
 
-    def __init__(self, name, members):
-        super(Sequence, self).__init__(name, 'SEQUENCE')
+    def __init__(self, name, members, type_name):
+        super(MembersType, self).__init__(name, type_name)
         self.members = members
+        self.record_class = None
+        self.members_coders = None
+        self.update_members_coders()
 
-    def encode(self, data):
+    def update_members_coders(self):
+        """Precompute (name, encode, decode, member) per member, where
+        encode and decode are None for identity types.
+
+        """
+
+        self.members_coders = [
+            (member.name,
+             None if member.identity else member.encode,
+             None if member.identity else member.decode,
+             member)
+            for member in self.members
+        ]
+
+    def decode(self, data):
         values = {}
 
-        for member in self.members:
-            name = member.name
+        for name, _, decode, member in self.members_coders:
+            if name in data:
+                if decode is None:
+                    values[name] = data[name]
+                else:
+                    values[name] = decode(data[name])
+            elif member.default is not None and not member.optional:
+                values[name] = member.default
+
+        if self.record_class is not None:
+            values = self.record_class(values)
+
+        return values
+
+
+class Sequence(MembersType):
 
+    def __init__(self, name, members):
+        super(Sequence, self).__init__(name, members, 'SEQUENCE')
+
+    def encode(self, data):
+        values = {}
+
+        for name, encode, _, member in self.members_coders:
             if name in data:
-                value = member.encode(data[name])
+                if encode is None:
+                    values[name] = data[name]
+                else:
+                    values[name] = encode(data[name])
             elif member.optional or member.default is not None:
                 continue
             else:
@@ -139,24 +279,6 @@ class Sequence(Type):
                         name,
                         data))
 
-            values[name] = value
-
-        return values
-
-    def decode(self, data):
-        values = {}
-
-        for member in self.members:
-            name = member.name
-
-            if name in data:
-                value = member.decode(data[name])
-                values[name] = value
-            elif member.optional:
-                pass
-            elif member.default is not None:
-                values[name] = member.default
-
         return values
 
     def __repr__(self):
@@ -165,23 +287,25 @@ class Sequence(Type):
             ', '.join([repr(member) for member in self.members]))
 
 
-class Set(Type):
+class Set(MembersType):
 
     def __init__(self, name, members):
-        super(Set, self).__init__(name, 'SET')
-        self.members = members
+        super(Set, self).__init__(name, members, 'SET')
 
     def encode(self, data):
         values = {}
 
-        for member in self.members:
-            name = member.name
-
+        for name, encode, _, member in self.members_coders:
             if name in data:
-                if member.default is None:
-                    value = member.encode(data[name])
-                elif data[name] != member.default:
-                    value = member.encode(data[name])
+                value = data[name]
+
+                if member.default is not None and value == member.default:
+                    continue
+
+                if encode is not None:
+                    value = encode(value)
+
+                values[name] = value
             elif member.optional or member.default is not None:
                 continue
             else:
@@ -190,24 +314,6 @@ class Set(Type):
                         name,
                         data))
 
-            values[name] = value
-
-        return values
-
-    def decode(self, data):
-        values = {}
-
-        for member in self.members:
-            name = member.name
-
-            if name in data:
-                value = member.decode(data[name])
-                values[name] = value
-            elif member.optional:
-                pass
-            elif member.default is not None:
-                values[name] = member.default
-
         return values
 
     def __repr__(self):
@@ -223,22 +329,20 @@ class SequenceOf(Type):
         self.element_type = element_type
 
     def encode(self, data):
-        values = []
+        if self.element_type.identity:
+            return data
 
-        for entry in data:
-            value = self.element_type.encode(entry)
-            values.append(value)
+        encode = self.element_type.encode
 
-        return values
+        return [encode(entry) for entry in data]
 
     def decode(self, data):
-        values = []
+        if self.element_type.identity:
+            return data
 
-        for element_data in data:
-            value = self.element_type.decode(element_data)
-            values.append(value)
+        decode = self.element_type.decode
 
-        return values
+        return [decode(element_data) for element_data in data]
 
     def __repr__(self):
         return 'SequenceOf({}, {})'.format(self.name,
@@ -252,22 +356,20 @@ class SetOf(Type):
         self.element_type = element_type
 
     def encode(self, data):
-        values = []
+        if self.element_type.identity:
+            return data
 
-        for entry in data:
-            value = self.element_type.encode(entry)
-            values.append(value)
+        encode = self.element_type.encode
 
-        return values
+        return [encode(entry) for entry in data]
 
     def decode(self, data):
-        values = []
+        if self.element_type.identity:
+            return data
 
-        for element_data in data:
-            value = self.element_type.decode(element_data)
-            values.append(value)
+        decode = self.element_type.decode
 
-        return values
+        return [decode(element_data) for element_data in data]
 
     def __repr__(self):
         return 'SetOf({}, {})'.format(self.name,
@@ -324,6 +426,8 @@ class OctetString(Type):
 
 class PrintableString(Type):
 
+    identity = True
+
     def __init__(self, name):
         super(PrintableString, self).__init__(name, 'PrintableString')
 
@@ -339,6 +443,8 @@ class PrintableString(Type):
 
 class UniversalString(Type):
 
+    identity = True
+
     def __init__(self, name):
         super(UniversalString, self).__init__(name, 'UniversalString')
 
@@ -354,6 +460,8 @@ class UniversalString(Type):
 
 class VisibleString(Type):
 
+    identity = True
+
     def __init__(self, name):
         super(VisibleString, self).__init__(name, 'VisibleString')
 
@@ -369,6 +477,8 @@ class VisibleString(Type):
 
 class GeneralString(Type):
 
+    identity = True
+
     def __init__(self, name):
         super(GeneralString, self).__init__(name, 'GeneralString')
 
@@ -384,6 +494,8 @@ class GeneralString(Type):
 
 class UTF8String(Type):
 
+    identity = True
+
     def __init__(self, name):
         super(UTF8String, self).__init__(name, 'UTF8String')
 
@@ -477,26 +589,35 @@ class Choice(Type):
     def __init__(self, name, members):
         super(Choice, self).__init__(name, 'CHOICE')
         self.members = members
+        self.name_to_member = {member.name: member for member in members}
 
     def encode(self, data):
         if not isinstance(data, tuple):
             raise EncodeError("expected tuple, but got '{}'".format(data))
 
-        for member in self.members:
-            if member.name == data[0]:
-                return {member.name: member.encode(data[1])}
+        try:
+            member = self.name_to_member[data[0]]
+        except KeyError:
+            raise EncodeError(
+                "Expected choices are {}, but got '{}'.".format(
+                    [member.name for member in self.members],
+                    data[0]))
 
-        raise EncodeError(
-            "Expected choices are {}, but got '{}'.".format(
-                [member.name for member in self.members],
-                data[0]))
+        return {data[0]: member.encode(data[1])}
 
     def decode(self, data):
-        for member in self.members:
-            if member.name in data:
-                return (member.name, member.decode(data[member.name]))
+        for name in data:
+            try:
+                member = self.name_to_member[name]
+            except KeyError:
+                continue
+
+            return (name, member.decode(data[name]))
 
-        raise DecodeError('')
+        raise DecodeError(
+            "Expected choices are {}, but got {}.".format(
+                [member.name for member in self.members],
+                list(data)))
 
     def __repr__(self):
         return 'Choice({}, [{}])'.format(
@@ -506,6 +627,8 @@ class Choice(Type):
 
 class Null(Type):
 
+    identity = True
+
     def __init__(self, name):
         super(Null, self).__init__(name, 'NULL')
 
@@ -539,11 +662,11 @@ class Enumerated(Type):
     def __init__(self, name, values):
         super(Enumerated, self).__init__(name, 'ENUMERATED')
         self.values = enum_values_as_dict(values)
+        self.names = set(self.values.values())
 
     def encode(self, data):
-        for name in self.values.values():
-            if data == name:
-                return data
+        if data in self.names:
+            return data
 
         raise EncodeError(
             "Enumeration value '{}' not found in {}.".format(
@@ -551,7 +674,7 @@ class Enumerated(Type):
                 [value for value in self.values.values()]))
 
     def decode(self, data):
-        if data in self.values.values():
+        if data in self.names:
             return data
 
         raise DecodeError(
@@ -584,24 +707,29 @@ class Recursive(Type):
         return 'Recursive({})'.format(self.name)
 
 
+def has_real(type_):
+    if isinstance(type_, Real):
+        return True
+    elif isinstance(type_, (MembersType, Choice)):
+        return any([has_real(member) for member in type_.members])
+    elif isinstance(type_, (SequenceOf, SetOf)):
+        return has_real(type_.element_type)
+    else:
+        return False
+
+
 class CompiledType(compiler.CompiledType):
 
     def __init__(self, type_, constraints):
         super(CompiledType, self).__init__(constraints)
         self._type = type_
+        self.json_backend = json_backend(type_)
 
     def encode(self, data, indent=None):
-        dictionary = self._type.encode(data)
-
-        if indent is None:
-            string = json.dumps(dictionary, separators=(',', ':'))
-        else:
-            string = json.dumps(dictionary, indent=indent)
-
-        return string.encode('utf-8')
+        return json_dumps(self._type.encode(data), indent, self.json_backend)
 
     def decode(self, data):
-        return self._type.decode(json.loads(data.decode('utf-8')))
+        return self._type.decode(json_loads(data))
 
     def __repr__(self):
         return repr(self._type)
@@ -687,7 +815,7 @@ class Compiler(compiler.Compiler):
             compiled = BitString(name, minimum, maximum)
         elif type_name == 'ANY':
             compiled = Any(name)
-        elif type_name == 'ANY DEFINED BY':
+        elif type_name in ['ANY DEFINED BY', 'OpenType']:
             compiled = Any(name)
         elif type_name == 'NULL':
             compiled = Null(name)
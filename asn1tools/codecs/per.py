@@ -8,7 +8,7 @@ from operator import itemgetter
 import binascii
 import string
 
-from ..parser import EXTENSION_MARKER
+from .compiler import EXTENSION_MARKER
 from . import EncodeError
 from . import DecodeError
 from . import compiler
@@ -79,10 +79,14 @@ CLASS_PRIO = {
 class OutOfDataError(DecodeError):
 
     def __init__(self, offset):
-        super(OutOfDataError, self).__init__(
-            'out of data at bit offset {} ({}.{} bytes)'.format(
-                offset,
-                *divmod(offset, 8)))
+        super(OutOfDataError, self).__init__(None)
+        self.offset = offset
+
+    @property
+    def message(self):
+        return 'out of data at bit offset {} ({}.{} bytes)'.format(
+            self.offset,
+            *divmod(self.offset, 8))
 
 
 class PermittedAlphabet(object):
@@ -168,6 +172,14 @@ class Encoder(object):
         self.value <<= number_of_bits
         self.value |= value
 
+    def append_binary_string(self, bits):
+        """Append given string of zeros and ones.
+
+        """
+
+        if bits:
+            self.append_non_negative_binary_integer(int(bits, 2), len(bits))
+
     def append_bytes(self, data):
         """Append given data.
 
@@ -341,6 +353,18 @@ class Decoder(object):
 
         return ((self.value >> self.number_of_bits) & mask)
 
+    def read_binary_string(self, number_of_bits):
+        """Read given number of bits as a string of zeros and ones.
+
+        """
+
+        value = self.read_non_negative_binary_integer(number_of_bits)
+
+        if number_of_bits == 0:
+            return ''
+
+        return format(value, '0{}b'.format(number_of_bits))
+
     def read_bytes_aligned(self, number_of_bytes):
         """Read given number of aligned bytes.
 
@@ -431,6 +455,13 @@ class Type(object):
         self.default = None
         self.tag = None
 
+        # Number of bits of all encoded values of the type, if fixed
+        # and not aligned, and None otherwise. Types with a fixed
+        # number of bits also implement encode_fixed() and
+        # decode_fixed(), which convert values to and from their
+        # encoding as a non-negative integer.
+        self.fixed_number_of_bits = None
+
     def set_size_range(self, minimum, maximum, has_extension_marker):
         pass
 
@@ -555,6 +586,7 @@ class Boolean(Type):
 
     def __init__(self, name):
         super(Boolean, self).__init__(name, 'BOOLEAN')
+        self.fixed_number_of_bits = 1
 
     def encode(self, data, encoder):
         encoder.append_bit(bool(data))
@@ -562,6 +594,12 @@ class Boolean(Type):
     def decode(self, decoder):
         return bool(decoder.read_bit())
 
+    def encode_fixed(self, data):
+        return int(bool(data))
+
+    def decode_fixed(self, value):
+        return bool(value)
+
     def __repr__(self):
         return 'Boolean({})'.format(self.name)
 
@@ -586,6 +624,10 @@ class Integer(Type):
                 number_of_bits = ((self.number_of_bits + 7) // 8).bit_length()
                 self.number_of_indefinite_bits = number_of_bits
 
+            # Ranges of up to 255 values are not aligned.
+            if size < 255 and not has_extension_marker:
+                self.fixed_number_of_bits = self.number_of_bits
+
     def encode(self, data, encoder):
         if self.has_extension_marker:
             encoder.append_bit(0)
@@ -638,10 +680,105 @@ class Integer(Type):
 
         return value
 
+    def encode_fixed(self, data):
+        return data - self.minimum
+
+    def decode_fixed(self, value):
+        return value + self.minimum
+
     def __repr__(self):
         return 'Integer({})'.format(self.name)
 
 
+class FixedMembers(object):
+    """Consecutive mandatory root members, all encoded in a fixed number
+    of bits, which are written and read as one integer.
+
+    """
+
+    def __init__(self, class_name, members):
+        self.class_name = class_name
+        self.members = members
+        self.number_of_bits = sum([
+            member.fixed_number_of_bits for member in members
+        ])
+        self.layout = []
+        shift = self.number_of_bits
+
+        for member in members:
+            shift -= member.fixed_number_of_bits
+            mask = ((1 << member.fixed_number_of_bits) - 1)
+            self.layout.append((member, shift, mask))
+
+    def encode(self, data, encoder):
+        value = 0
+
+        for member, shift, _ in self.layout:
+            try:
+                member_data = data[member.name]
+            except KeyError:
+                raise EncodeError(
+                    "{} member '{}' not found in {}.".format(
+                        self.class_name,
+                        member.name,
+                        data))
+
+            value |= (member.encode_fixed(member_data) << shift)
+
+        encoder.append_non_negative_binary_integer(value, self.number_of_bits)
+
+    def decode(self, decoder, values):
+        try:
+            value = decoder.read_non_negative_binary_integer(self.number_of_bits)
+        except OutOfDataError:
+            # Decode one member at a time to find the first member out
+            # of data.
+            for member in self.members:
+                try:
+                    values[member.name] = member.decode(decoder)
+                except DecodeError as e:
+                    e.location.append(member.name)
+                    raise
+
+        for member, shift, mask in self.layout:
+            try:
+                values[member.name] = member.decode_fixed((value >> shift) & mask)
+            except DecodeError as e:
+                e.location.append(member.name)
+                raise
+
+
+def create_root_members_layout(class_name, root_members_masks):
+    """Returns given list of root members and their presence bit masks,
+    with each run of two or more consecutive mandatory members encoded
+    in a fixed number of bits replaced by a FixedMembers object and
+    the mask None.
+
+    """
+
+    layout = []
+    run = []
+
+    def end_run():
+        if len(run) > 1:
+            layout.append((FixedMembers(class_name, run[:]), None))
+        elif run:
+            layout.append((run[0], 0))
+
+        del run[:]
+
+    for member, mask in root_members_masks:
+        if mask == 0 and member.fixed_number_of_bits is not None:
+            run.append(member)
+        else:
+            end_run()
+            layout.append((member, mask))
+
+    end_run()
+
+    return layout
+
+
 class MembersType(Type):
 
     def __init__(self,
@@ -652,13 +789,25 @@ class MembersType(Type):
         super(MembersType, self).__init__(name, type_name)
         self.root_members = root_members
         self.additions = additions
+        self.record_class = None
         self.optionals = [
             member
             for member in root_members
             if member.optional or member.default is not None
         ]
+        self.number_of_optionals = len(self.optionals)
+        self.root_members_masks = self.create_root_members_masks(root_members)
+        self.open_types = [
+            member
+            for member in root_members + (additions or [])
+            if isinstance(member, OpenType) and member.table is not None
+        ]
+        self.update_members_coders()
 
     def encode(self, data, encoder):
+        if self.open_types:
+            data = self.encode_open_types(data)
+
         if self.additions is not None:
             offset = encoder.number_of_bits
             encoder.append_bit(0)
@@ -670,17 +819,68 @@ class MembersType(Type):
         else:
             self.encode_root(data, encoder)
 
-    def encode_root(self, data, encoder):
-        for optional in self.optionals:
-            if optional.optional:
-                encoder.append_bit(optional.name in data)
-            elif optional.name in data:
-                encoder.append_bit(data[optional.name] != optional.default)
+    def create_root_members_masks(self, root_members):
+        """Returns a list of each root member and its bit in the preamble,
+        or zero if the member is mandatory, so that the whole preamble
+        is written and read as a single integer.
+
+        """
+
+        root_members_masks = []
+        mask = (1 << self.number_of_optionals)
+
+        for member in root_members:
+            if member in self.optionals:
+                mask >>= 1
+                root_members_masks.append((member, mask))
             else:
-                encoder.append_bit(0)
+                root_members_masks.append((member, 0))
+
+        return root_members_masks
+
+    def update_members_coders(self):
+        """Writes and reads runs of mandatory members encoded in a fixed
+        number of bits as one integer.
+
+        """
+
+        self.root_members_layout = create_root_members_layout(
+            self.__class__.__name__,
+            self.root_members_masks)
 
-        for member in self.root_members:
-            self.encode_member(member, data, encoder)
+    def encode_root(self, data, encoder):
+        presence_bits = 0
+
+        if self.number_of_optionals > 0:
+            for member, mask in self.root_members_masks:
+                if mask == 0:
+                    continue
+
+                name = member.name
+
+                if name in data:
+                    if member.optional or data[name] != member.default:
+                        presence_bits |= mask
+
+            encoder.append_non_negative_binary_integer(presence_bits,
+                                                       self.number_of_optionals)
+
+        for member, mask in self.root_members_layout:
+            if mask is None:
+                member.encode(data, encoder)
+            elif mask == 0:
+                try:
+                    value = data[member.name]
+                except KeyError:
+                    raise EncodeError(
+                        "{} member '{}' not found in {}.".format(
+                            self.__class__.__name__,
+                            member.name,
+                            data))
+
+                member.encode(value, encoder)
+            elif presence_bits & mask:
+                member.encode(data[member.name], encoder)
 
     def encode_additions(self, data, encoder):
         # Encode extension additions.
@@ -731,7 +931,7 @@ class MembersType(Type):
         self.encode_root(data, encoder)
 
         if ((encoder.value == 0)
-            and (encoder.number_of_bits == len(self.optionals))):
+            and (encoder.number_of_bits == self.number_of_optionals)):
             encoder.number_of_bits = 0
 
     def encode_member(self, member, data, encoder, encode_default=False):
@@ -751,30 +951,63 @@ class MembersType(Type):
                     name,
                     data))
 
+    def encode_open_types(self, data):
+        data = dict(data)
+
+        for member in self.open_types:
+            if member.name in data:
+                data[member.name] = member.encode_value(data[member.name], data)
+
+        return data
+
     def decode(self, decoder):
         if self.additions is not None:
             if decoder.read_bit():
                 decoded = self.decode_root(decoder)
                 decoded.update(self.decode_additions(decoder))
-
-                return decoded
             else:
-                return self.decode_root(decoder)
+                decoded = self.decode_root(decoder)
         else:
-            return self.decode_root(decoder)
+            decoded = self.decode_root(decoder)
+
+        if self.open_types:
+            self.decode_open_types(decoded)
+
+        if self.record_class is not None:
+            decoded = self.record_class(decoded)
+
+        return decoded
+
+    def decode_open_types(self, values):
+        # Open types are decoded once all members are known, as the
+        # member giving the type may follow the open type.
+        for member in self.open_types:
+            if member.name in values:
+                try:
+                    values[member.name] = member.decode_value(
+                        values[member.name],
+                        values)
+                except DecodeError as e:
+                    e.location.append(member.name)
+                    raise
 
     def decode_root(self, decoder):
         values = {}
-        optionals = {
-            optional: decoder.read_bit()
-            for optional in self.optionals
-        }
 
-        for member in self.root_members:
+        if self.number_of_optionals > 0:
+            presence_bits = decoder.read_non_negative_binary_integer(
+                self.number_of_optionals)
+        else:
+            presence_bits = 0
+
+        for member, mask in self.root_members_layout:
+            if mask is None:
+                member.decode(decoder, values)
+                continue
+
             try:
-                if optionals.get(member, True):
-                    value = member.decode(decoder)
-                    values[member.name] = value
+                if mask == 0 or presence_bits & mask:
+                    values[member.name] = member.decode(decoder)
                 elif member.default is not None:
                     values[member.name] = member.default
             except DecodeError as e:
@@ -873,7 +1106,40 @@ class ArrayType(Type):
             size = maximum - minimum
             self.number_of_bits = integer_as_number_of_bits(size)
 
+        self.encode_table, self.decode_table = self.create_fixed_tables()
+
+    def create_fixed_tables(self):
+        """Returns tables of all element values and their encodings as
+        strings of zeros and ones, if the elements are encoded in a
+        fixed number of bits, and at most 8 bits.
+
+        """
+
+        element_type = self.element_type
+        number_of_bits = element_type.fixed_number_of_bits
+        encode_table = {}
+        decode_table = {}
+
+        if number_of_bits and number_of_bits <= 8:
+            value_format = '0{}b'.format(number_of_bits)
+
+            for value in range(1 << number_of_bits):
+                try:
+                    decoded = element_type.decode_fixed(value)
+                except DecodeError:
+                    continue
+
+                bits = format(value, value_format)
+                encode_table[decoded] = bits
+                decode_table[bits] = decoded
+
+        return encode_table, decode_table
+
     def encode(self, data, encoder):
+        self.encode_length(data, encoder)
+        self.encode_elements(data, encoder)
+
+    def encode_length(self, data, encoder):
         if self.has_extension_marker:
             encoder.append_bit(0)
 
@@ -881,13 +1147,61 @@ class ArrayType(Type):
             encoder.align()
             encoder.append_length_determinant(len(data))
         elif self.minimum != self.maximum:
-            encoder.append_non_negative_binary_integer(len(data) - self.minimum,
-                                                       self.number_of_bits)
+            # A length with an upper bound below 64K is a constrained
+            # whole number, which is octet aligned if its range is above
+            # 255 (X.691 11.9.4.1 and 11.5.7).
+            encoder.append_constrained_whole_number(len(data),
+                                                    self.minimum,
+                                                    self.maximum,
+                                                    self.number_of_bits)
+
+    def encode_elements(self, data, encoder):
+        """Encode all elements as one integer if they are encoded in a fixed
+        number of bits, and one at a time otherwise.
+
+        """
+
+        element_type = self.element_type
+        number_of_bits = element_type.fixed_number_of_bits
+
+        if not number_of_bits:
+            for entry in data:
+                element_type.encode(entry, encoder)
+
+            return
+
+        try:
+            bits = ''.join([self.encode_table[entry] for entry in data])
+        except KeyError:
+            bits = self.encode_fixed_elements(data, number_of_bits)
+
+        encoder.append_binary_string(bits)
+
+    def encode_fixed_elements(self, data, number_of_bits):
+        values = [self.element_type.encode_fixed(entry) for entry in data]
+
+        if values:
+            minimum = min(values)
+            maximum = max(values)
+
+            if minimum < 0 or (maximum >> number_of_bits) != 0:
+                element_type = self.element_type
+                value = element_type.decode_fixed(minimum if minimum < 0 else maximum)
+
+                raise EncodeError(
+                    'expected integers in the range {}..{}, but got {}'.format(
+                        element_type.minimum,
+                        element_type.maximum,
+                        value))
 
-        for entry in data:
-            self.element_type.encode(entry, encoder)
+        value_format = '0{}b'.format(number_of_bits)
+
+        return ''.join([format(value, value_format) for value in values])
 
     def decode(self, decoder):
+        return self.decode_elements(self.decode_length(decoder), decoder)
+
+    def decode_length(self, decoder):
         if self.has_extension_marker:
             bit = decoder.read_bit()
 
@@ -897,18 +1211,42 @@ class ArrayType(Type):
         if self.number_of_bits is None:
             decoder.align()
             length = decoder.read_length_determinant()
+        elif self.minimum != self.maximum:
+            length = decoder.read_constrained_whole_number(self.minimum,
+                                                           self.maximum,
+                                                           self.number_of_bits)
         else:
             length = self.minimum
 
-            if self.minimum != self.maximum:
-                length += decoder.read_non_negative_binary_integer(
-                    self.number_of_bits)
+        return length
 
-        decoded = []
+    def decode_elements(self, length, decoder):
+        element_type = self.element_type
+        number_of_bits = element_type.fixed_number_of_bits
 
-        for _ in range(length):
-            decoded_element = self.element_type.decode(decoder)
-            decoded.append(decoded_element)
+        if not number_of_bits:
+            decoded = []
+
+            for _ in range(length):
+                decoded_element = element_type.decode(decoder)
+                decoded.append(decoded_element)
+
+            return decoded
+
+        bits = decoder.read_binary_string(length * number_of_bits)
+        offsets = range(0, len(bits), number_of_bits)
+
+        try:
+            decoded = [
+                self.decode_table[bits[offset:offset + number_of_bits]]
+                for offset in offsets
+            ]
+        except KeyError:
+            decoded = [
+                element_type.decode_fixed(
+                    int(bits[offset:offset + number_of_bits], 2))
+                for offset in offsets
+            ]
 
         return decoded
 
@@ -1264,23 +1602,47 @@ class Choice(Type):
 
     def __init__(self, name, root_members, additions):
         super(Choice, self).__init__(name, 'CHOICE')
+        root_members = list(root_members)
 
         # Root.
-        index_to_member, name_to_index = self.create_maps(root_members)
-        self.root_index_to_member = index_to_member
-        self.root_name_to_index = name_to_index
+        self.root_members = tuple(root_members)
+        self.root_name_to_index = {
+            member.name: index
+            for index, member in enumerate(root_members)
+        }
         self.root_number_of_bits = integer_as_number_of_bits(len(root_members) - 1)
 
+        # The index is only present if there are two or more root
+        # members.
+        if len(root_members) > 1:
+            self.root_index_number_of_bits = self.root_number_of_bits
+        else:
+            self.root_index_number_of_bits = 0
+
         # Optional additions.
         if additions is None:
             index_to_member = None
             name_to_index = None
+            self.root_prefix_number_of_bits = self.root_index_number_of_bits
+            self.member_names = [member.name for member in root_members]
         else:
             index_to_member, name_to_index = self.create_maps(additions)
+            # The extension bit is zero for root members, so it can be
+            # encoded together with the index as a single integer.
+            self.root_prefix_number_of_bits = self.root_index_number_of_bits + 1
+            self.member_names = [
+                member.name for member in root_members + list(additions)
+            ]
 
         self.additions_index_to_member = index_to_member
         self.additions_name_to_index = name_to_index
 
+        # Member name to (index, member) for root members.
+        self.root_name_to_index_and_member = {
+            member.name: (index, member)
+            for index, member in enumerate(root_members)
+        }
+
     def create_maps(self, members):
         index_to_member = {
             index: member
@@ -1293,39 +1655,28 @@ class Choice(Type):
 
         return index_to_member, name_to_index
 
-    def all_members(self):
-        return (list(self.root_index_to_member.values())
-                + list(self.additions_index_to_member.values()))
-
     def encode(self, data, encoder):
         if not isinstance(data, tuple):
             raise EncodeError("expected tuple, but got '{}'".format(data))
 
-        if self.additions_index_to_member is not None:
-            if data[0] in self.root_name_to_index:
-                encoder.append_bit(0)
-                self.encode_root(data, encoder)
-            else:
-                encoder.append_bit(1)
-                self.encode_additions(data, encoder)
-        else:
-            self.encode_root(data, encoder)
-
-    def encode_root(self, data, encoder):
         try:
-            index = self.root_name_to_index[data[0]]
+            index, member = self.root_name_to_index_and_member[data[0]]
         except KeyError:
-            raise EncodeError(
-                "Expected choices are {}, but got '{}'.".format(
-                    [member.name for member in self.all_members()],
-                    data[0]))
-
-        if len(self.root_index_to_member) > 1:
-            encoder.append_non_negative_binary_integer(index,
-                                                       self.root_number_of_bits)
+            if self.additions_index_to_member is None:
+                raise EncodeError(
+                    "Expected choices are {}, but got '{}'.".format(
+                        self.member_names,
+                        data[0]))
+
+            encoder.append_bit(1)
+            self.encode_additions(data, encoder)
+        else:
+            if self.root_prefix_number_of_bits > 0:
+                encoder.append_non_negative_binary_integer(
+                    index,
+                    self.root_prefix_number_of_bits)
 
-        member = self.root_index_to_member[index]
-        member.encode(data[1], encoder)
+            member.encode(data[1], encoder)
 
     def encode_additions(self, data, encoder):
         try:
@@ -1333,7 +1684,7 @@ class Choice(Type):
         except KeyError:
             raise EncodeError(
                 "Expected choices are {}, but got '{}'.".format(
-                    [member.name for member in self.all_members()],
+                    self.member_names,
                     data[0]))
 
         addition_encoder = Encoder()
@@ -1352,19 +1703,20 @@ class Choice(Type):
         if self.additions_index_to_member is not None:
             if decoder.read_bit():
                 return self.decode_additions(decoder)
-            else:
-                return self.decode_root(decoder)
-        else:
-            return self.decode_root(decoder)
 
-    def decode_root(self, decoder):
-        if len(self.root_index_to_member) > 1:
+        if self.root_index_number_of_bits > 0:
             index = decoder.read_non_negative_binary_integer(
-                self.root_number_of_bits)
-        else:
-            index = 0
+                self.root_index_number_of_bits)
 
-        member = self.root_index_to_member[index]
+            try:
+                member = self.root_members[index]
+            except IndexError:
+                raise DecodeError(
+                    'expected choice index in {}, but got {}'.format(
+                        list(range(len(self.root_members))),
+                        index))
+        else:
+            member = self.root_members[0]
 
         return (member.name, member.decode(decoder))
 
@@ -1421,6 +1773,61 @@ class Any(Type):
         return 'Any({})'.format(self.name)
 
 
+class OpenType(Type):
+    """An open type, encoded as a length determinant followed by the
+    complete encoding of its value. The value is given as bytes unless
+    the type is known from a component relation constraint table, see
+    :meth:`encode_value()` and :meth:`decode_value()`.
+
+    """
+
+    def __init__(self, name):
+        super(OpenType, self).__init__(name, 'OpenType')
+        self.type_member = None
+        self.table = None
+
+    def set_table(self, type_member, table):
+        self.type_member = type_member
+        self.table = table
+
+    def encode(self, data, encoder):
+        encoder.align()
+        encoder.append_length_determinant(len(data))
+        encoder.append_bytes(data)
+
+    def encode_value(self, data, values):
+        try:
+            type_ = self.table[values[self.type_member]]
+        except KeyError:
+            return data
+
+        encoder = Encoder()
+        type_.encode(data, encoder)
+
+        # The encoding is at least one octet.
+        if encoder.number_of_bits == 0:
+            return b'\x00'
+
+        return encoder.as_bytearray()
+
+    def decode(self, decoder):
+        decoder.align()
+        length = decoder.read_length_determinant()
+
+        return decoder.read_bits(8 * length)
+
+    def decode_value(self, data, values):
+        try:
+            type_ = self.table[values[self.type_member]]
+        except KeyError:
+            return data
+
+        return type_.decode(Decoder(data))
+
+    def __repr__(self):
+        return 'OpenType({})'.format(self.name)
+
+
 class Enumerated(Type):
 
     def __init__(self, name, values):
@@ -1444,6 +1851,9 @@ class Enumerated(Type):
         self.additions_index_to_name = index_to_name
         self.additions_name_to_index = name_to_index
 
+        if additions is None:
+            self.fixed_number_of_bits = self.root_number_of_bits
+
     def create_maps(self, items):
         index_to_name = {
             index: value[0]
@@ -1494,6 +1904,12 @@ class Enumerated(Type):
     def decode_root(self, decoder):
         index = decoder.read_non_negative_binary_integer(self.root_number_of_bits)
 
+        return self.decode_fixed(index)
+
+    def encode_fixed(self, data):
+        return self.root_name_to_index[data]
+
+    def decode_fixed(self, index):
         try:
             name = self.root_index_to_name[index]
         except KeyError:
@@ -1541,7 +1957,8 @@ class CompiledType(compiler.CompiledType):
         return encoder.as_bytearray()
 
     def decode(self, data):
-        decoder = Decoder(bytearray(data))
+        decoder = Decoder(data)
+
         return self._type.decode(decoder)
 
     def __repr__(self):
@@ -1651,6 +2068,8 @@ class Compiler(compiler.Compiler):
             compiled = Any(name)
         elif type_name == 'ANY DEFINED BY':
             compiled = Any(name)
+        elif type_name == 'OpenType':
+            compiled = OpenType(name)
         elif type_name == 'NULL':
             compiled = Null(name)
         else:
@@ -1701,6 +2120,15 @@ class Compiler(compiler.Compiler):
                                          module_name,
                                          compiled_members)
 
+        self.compile_open_type_tables(
+            members,
+            [
+                member
+                for member in compiled_members + (additions or [])
+                if isinstance(member, OpenType)
+            ],
+            module_name)
+
         if sort_by_tag:
             compiled_members = sorted(compiled_members, key=attrgetter('tag'))
 
@@ -0,0 +1,578 @@
+"""Transcoding of encoded data from one codec to another.
+
+The compiled types of both codecs are walked in lockstep. For PER and
+UPER to BER, each SEQUENCE, SET, SEQUENCE OF, SET OF and CHOICE is
+read from the PER decoder and written to the BER encoding in place,
+so only the values of the other types are created. For BER to JER,
+the value given to the JSON encoder is built while reading the BER
+encoding, with values of other types than SEQUENCE, SET, SEQUENCE OF,
+SET OF and CHOICE converted to JSON values as they are decoded. Its
+dictionaries and lists are still created, but the decoded value is
+not walked again to convert it.
+
+Types that can not be walked in lockstep, for example extension
+additions, open types and recursive types, are decoded to a Python
+value and encoded again, as are all types of other codec pairs. The
+transcoded data is identical to decoding and encoding it.
+
+"""
+
+from . import DecodeError
+from . import EncodeError
+from . import per
+from . import uper
+from . import ber
+from . import jer
+from .compiler import flatten
+from .per import Decoder
+from .ber import insert_tag_and_length
+from .ber import decode_length_definite
+from .ber import DecodeChoiceError
+
+
+PER_MEMBERS_TYPES = (per.MembersType, uper.MembersType)
+
+
+class PerToBerValue(object):
+    """A type decoded to a value, which is then encoded.
+
+    """
+
+    def __init__(self, source, target):
+        self.decode = source.decode
+        self.encode = target.encode
+
+    def transcode(self, decoder, encoded):
+        self.encode(self.decode(decoder), encoded)
+
+
+class PerToBerExplicitTag(object):
+
+    def __init__(self, target, inner):
+        self.tag = target.tag
+        self.inner = inner
+
+    def transcode(self, decoder, encoded):
+        offset = len(encoded)
+        self.inner.transcode(decoder, encoded)
+        insert_tag_and_length(encoded, offset, self.tag)
+
+
+class PerToBerMembers(object):
+
+    def __init__(self, source, target, layout):
+        self.source = source
+        self.target = target
+        self.layout = layout
+
+    def transcode(self, decoder, encoded):
+        source = self.source
+
+        if source.additions is not None:
+            extended = decoder.read_bit()
+        else:
+            extended = False
+
+        offset = len(encoded)
+
+        if source.number_of_optionals > 0:
+            presence_bits = decoder.read_non_negative_binary_integer(
+                source.number_of_optionals)
+        else:
+            presence_bits = 0
+
+        for member, mask, target, node in self.layout:
+            if mask is None:
+                values = {}
+                member.decode(decoder, values)
+
+                for name, fixed_target in target:
+                    fixed_target.encode(values[name], encoded)
+
+                continue
+
+            if mask != 0 and not presence_bits & mask:
+                continue
+
+            try:
+                if node is not None:
+                    node.transcode(decoder, encoded)
+                else:
+                    # Values equal to the default are not encoded by
+                    # BER.
+                    value = member.decode(decoder)
+
+                    if value != target.default or isinstance(target, ber.Null):
+                        target.encode(value, encoded)
+            except DecodeError as e:
+                e.location.append(member.name)
+                raise
+
+        if extended:
+            values = source.decode_additions(decoder)
+
+            if self.target.additions:
+                self.target.encode_additions(values, encoded)
+
+        insert_tag_and_length(encoded, offset, self.target.tag)
+
+
+class PerToBerArray(object):
+
+    def __init__(self, source, target, element):
+        self.source = source
+        self.target = target
+        self.element = element
+
+    def transcode(self, decoder, encoded):
+        offset = len(encoded)
+        length = self.source.decode_length(decoder)
+
+        if self.element is None:
+            encode = self.target.element_type.encode
+
+            for value in self.source.decode_elements(length, decoder):
+                encode(value, encoded)
+        else:
+            transcode = self.element.transcode
+
+            for _ in range(length):
+                transcode(decoder, encoded)
+
+        insert_tag_and_length(encoded, offset, self.target.tag)
+
+
+class PerToBerChoice(object):
+
+    def __init__(self, source, target, members):
+        self.source = source
+        self.target = target
+        self.members = members
+
+    def transcode(self, decoder, encoded):
+        source = self.source
+
+        if source.additions_index_to_member is not None:
+            if decoder.read_bit():
+                self.target.encode(source.decode_additions(decoder), encoded)
+
+                return
+
+        if source.root_index_number_of_bits > 0:
+            index = decoder.read_non_negative_binary_integer(
+                source.root_index_number_of_bits)
+
+            try:
+                node = self.members[index]
+            except IndexError:
+                raise DecodeError(
+                    'expected choice index in {}, but got {}'.format(
+                        list(range(len(self.members))),
+                        index))
+        else:
+            node = self.members[0]
+
+        node.transcode(decoder, encoded)
+
+
+def compile_per_to_ber_members(source, target):
+    if source.open_types or target.open_types:
+        return None
+
+    if ([member.name for member in source.root_members]
+        != [member.name for member in target.root_members]):
+        return None
+
+    targets = {member.name: member for member in target.root_members}
+
+    if any([isinstance(member, ber.AnyDefinedBy) for member in targets.values()]):
+        return None
+
+    layout = []
+
+    for member, mask in source.root_members_layout:
+        if mask is None:
+            fixed_targets = [
+                (fixed_member.name, targets[fixed_member.name])
+                for fixed_member in member.members
+            ]
+            layout.append((member, None, fixed_targets, None))
+        elif targets[member.name].default is not None:
+            layout.append((member, mask, targets[member.name], None))
+        else:
+            layout.append((member,
+                           mask,
+                           targets[member.name],
+                           compile_per_to_ber(member, targets[member.name])))
+
+    return PerToBerMembers(source, target, layout)
+
+
+def compile_per_to_ber_choice(source, target):
+    targets = {member.name: member for member in target.root_members}
+    members = []
+
+    for member in source.root_members:
+        if member.name not in targets:
+            return None
+
+        members.append(compile_per_to_ber(member, targets[member.name]))
+
+    return PerToBerChoice(source, target, members)
+
+
+def compile_per_to_ber(source, target):
+    """Returns a node transcoding given PER or UPER type to given BER
+    type.
+
+    """
+
+    if isinstance(target, ber.ExplicitTag):
+        return PerToBerExplicitTag(target,
+                                   compile_per_to_ber(source, target.inner))
+
+    node = None
+
+    if isinstance(source, PER_MEMBERS_TYPES):
+        if isinstance(target, ber.MembersType):
+            node = compile_per_to_ber_members(source, target)
+    elif isinstance(source, per.ArrayType):
+        if isinstance(target, ber.ArrayType):
+            element = compile_per_to_ber(source.element_type,
+                                         target.element_type)
+
+            if isinstance(element, PerToBerValue):
+                element = None
+
+            node = PerToBerArray(source, target, element)
+    elif isinstance(source, per.Choice):
+        if isinstance(target, ber.Choice):
+            node = compile_per_to_ber_choice(source, target)
+
+    if node is None:
+        node = PerToBerValue(source, target)
+
+    return node
+
+
+class BerToJerValue(object):
+    """A type decoded to a value, which is then encoded.
+
+    """
+
+    def __init__(self, source, target):
+        self.decode = source.decode
+
+        if target.identity:
+            self.encode = None
+        else:
+            self.encode = target.encode
+
+    def transcode(self, data, offset):
+        value, offset = self.decode(data, offset)
+
+        if self.encode is not None:
+            value = self.encode(value)
+
+        return value, offset
+
+
+class BerToJerExplicitTag(object):
+
+    def __init__(self, source, inner):
+        self.source = source
+        self.inner = inner
+
+    def transcode(self, data, offset):
+        offset = self.source.decode_tag(data, offset)
+        _, offset = decode_length_definite(data, offset)
+
+        return self.inner.transcode(data, offset)
+
+
+class BerToJerMembers(object):
+
+    def __init__(self, source, root_members, additions, mandatory):
+        self.source = source
+        self.root_members = root_members
+        self.additions = additions
+        self.mandatory = mandatory
+
+    def transcode(self, data, offset):
+        offset = self.source.decode_tag(data, offset)
+
+        if data[offset] == 0x80:
+            raise NotImplementedError(
+                'decode until an end-of-contents tag is found')
+        else:
+            length, offset = decode_length_definite(data, offset)
+
+        end_offset = offset + length
+        values = {}
+
+        for member in self.root_members:
+            offset = self.transcode_member(member,
+                                           data,
+                                           values,
+                                           offset,
+                                           end_offset)
+
+        if self.additions:
+            try:
+                for addition in self.additions:
+                    addition_values = {}
+
+                    for member in addition:
+                        offset = self.transcode_member(member,
+                                                       data,
+                                                       addition_values,
+                                                       offset,
+                                                       end_offset)
+
+                    values.update(addition_values)
+            except DecodeError:
+                pass
+
+        for name in self.mandatory:
+            if name not in values:
+                raise EncodeError(
+                    "Sequence member '{}' not found in {}.".format(name,
+                                                                   values))
+
+        return values, end_offset
+
+    def transcode_member(self, member, data, values, offset, end_offset):
+        source, node, encode_default = member
+        name = source.name
+        first_octets = self.source.members_first_octets.get(name)
+
+        if first_octets is not None:
+            if offset >= end_offset or data[offset] not in first_octets:
+                if not source.optional:
+                    values[name] = self.default(source, encode_default)
+
+                return offset
+
+        try:
+            if offset < end_offset:
+                value, offset = node.transcode(data, offset)
+            else:
+                raise IndexError
+        except (DecodeError, IndexError) as e:
+            if source.optional:
+                return offset
+
+            if source.default is None:
+                if isinstance(e, IndexError):
+                    e = DecodeError('out of data at offset {}'.format(offset))
+
+                e.location.append(name)
+                raise e
+
+            value = self.default(source, encode_default)
+
+        values[name] = value
+
+        return offset
+
+    def default(self, member, encode_default):
+        if encode_default is None or member.default is None:
+            return member.default
+
+        return encode_default(member.default)
+
+
+class BerToJerArray(object):
+
+    def __init__(self, source, element):
+        self.source = source
+        self.element = element
+
+    def transcode(self, data, offset):
+        offset = self.source.decode_tag(data, offset)
+
+        if data[offset] == 0x80:
+            raise NotImplementedError(
+                'decode until an end-of-contents tag is found')
+        else:
+            length, offset = decode_length_definite(data, offset)
+
+        transcode = self.element.transcode
+        values = []
+        start_offset = offset
+
+        while (offset - start_offset) < length:
+            value, offset = transcode(data, offset)
+            values.append(value)
+
+        return values, offset
+
+
+class BerToJerChoice(object):
+
+    def __init__(self, members):
+        self.members = members
+
+    def transcode(self, data, offset):
+        for name, tag, node in self.members:
+            if tag is None or tag == data[offset:offset + len(tag)]:
+                try:
+                    value, offset = node.transcode(data, offset)
+                except DecodeChoiceError:
+                    pass
+                else:
+                    return {name: value}, offset
+
+        raise DecodeChoiceError()
+
+
+def compile_ber_to_jer_member(source, target):
+    if target.identity:
+        encode_default = None
+    else:
+        encode_default = target.encode
+
+    return (source, compile_ber_to_jer(source, target), encode_default)
+
+
+def compile_ber_to_jer_members(source, target):
+    # The members are added to the JSON object in the order they are
+    # decoded, which must be the order JER encodes them in.
+    if source.open_types or type(target) is not jer.Sequence:
+        return None
+
+    members = source.root_members + flatten(source.additions or [])
+
+    if ([member.name for member in members]
+        != [member.name for member in target.members]):
+        return None
+
+    if any([isinstance(member, ber.AnyDefinedBy) for member in members]):
+        return None
+
+    targets = {member.name: member for member in target.members}
+
+    root_members = [
+        compile_ber_to_jer_member(member, targets[member.name])
+        for member in source.root_members
+    ]
+    additions = []
+
+    for addition in source.additions or []:
+        if not isinstance(addition, list):
+            addition = [addition]
+
+        additions.append([
+            compile_ber_to_jer_member(member, targets[member.name])
+            for member in addition
+        ])
+
+    mandatory = [
+        member.name
+        for member in target.members
+        if not member.optional and member.default is None
+    ]
+
+    return BerToJerMembers(source, root_members, additions, mandatory)
+
+
+def compile_ber_to_jer_choice(source, target):
+    members = []
+
+    for member in source.root_members:
+        if member.name not in target.name_to_member:
+            return None
+
+        if isinstance(member, ber.Choice):
+            tag = None
+        else:
+            tag = member.tag
+
+        members.append((member.name,
+                        tag,
+                        compile_ber_to_jer(member,
+                                           target.name_to_member[member.name])))
+
+    return BerToJerChoice(members)
+
+
+def compile_ber_to_jer(source, target):
+    """Returns a node transcoding given BER type to given JER type.
+
+    """
+
+    node = None
+
+    if isinstance(source, ber.ExplicitTag):
+        node = BerToJerExplicitTag(source,
+                                   compile_ber_to_jer(source.inner, target))
+    elif isinstance(source, ber.MembersType):
+        node = compile_ber_to_jer_members(source, target)
+    elif isinstance(source, ber.ArrayType):
+        if isinstance(target, (jer.SequenceOf, jer.SetOf)):
+            node = BerToJerArray(source,
+                                 compile_ber_to_jer(source.element_type,
+                                                    target.element_type))
+    elif isinstance(source, ber.Choice):
+        if isinstance(target, jer.Choice):
+            node = compile_ber_to_jer_choice(source, target)
+
+    if node is None:
+        node = BerToJerValue(source, target)
+
+    return node
+
+
+class Transcoder(object):
+    """Transcodes data of a type by decoding and encoding it.
+
+    """
+
+    def __init__(self, source, target):
+        self._source = source
+        self._target = target
+
+    def transcode(self, data):
+        return self._target.encode(self._source.decode(data))
+
+
+class PerToBerTranscoder(Transcoder):
+
+    def __init__(self, source, target):
+        super(PerToBerTranscoder, self).__init__(source, target)
+        self._node = compile_per_to_ber(source.type, target.type)
+
+    def transcode(self, data):
+        encoded = bytearray()
+        self._node.transcode(Decoder(data), encoded)
+
+        return encoded
+
+
+class BerToJerTranscoder(Transcoder):
+
+    def __init__(self, source, target):
+        super(BerToJerTranscoder, self).__init__(source, target)
+        self._node = compile_ber_to_jer(source.type, target.type)
+
+    def transcode(self, data):
+        if not isinstance(data, ber.BYTES_TYPES):
+            data = bytearray(data)
+
+        return jer.json_dumps(self._node.transcode(data, 0)[0],
+                              None,
+                              self._target.json_backend)
+
+
+def compile_transcoder(source, target, from_codec, to_codec):
+    """Returns a transcoder of given compiled type `source` of codec
+    `from_codec` to given compiled type `target` of codec `to_codec`.
+
+    """
+
+    if from_codec in ['per', 'uper'] and to_codec == 'ber':
+        return PerToBerTranscoder(source, target)
+    elif from_codec == 'ber' and to_codec == 'jer':
+        return BerToJerTranscoder(source, target)
+    else:
+        return Transcoder(source, target)
@@ -19,6 +19,7 @@ from .per import Any
 from .per import Enumerated
 from .per import Recursive
 from .per import Real
+from .per import create_root_members_layout
 
 
 LOGGER = logging.getLogger(__name__)
@@ -115,6 +116,9 @@ class Integer(Type):
             size = self.maximum - self.minimum
             self.number_of_bits = integer_as_number_of_bits(size)
 
+            if not has_extension_marker:
+                self.fixed_number_of_bits = self.number_of_bits
+
     def encode(self, data, encoder):
         if self.has_extension_marker:
             encoder.append_bit(0)
@@ -141,6 +145,12 @@ class Integer(Type):
 
         return value
 
+    def encode_fixed(self, data):
+        return data - self.minimum
+
+    def decode_fixed(self, value):
+        return value + self.minimum
+
     def __repr__(self):
         return 'Integer({})'.format(self.name)
 
@@ -155,13 +165,25 @@ class MembersType(Type):
         super(MembersType, self).__init__(name, type_name)
         self.root_members = root_members
         self.additions = additions
+        self.record_class = None
         self.optionals = [
             member
             for member in root_members
             if member.optional or member.default is not None
         ]
+        self.number_of_optionals = len(self.optionals)
+        self.root_members_masks = self.create_root_members_masks(root_members)
+        self.open_types = [
+            member
+            for member in root_members + (additions or [])
+            if isinstance(member, OpenType) and member.table is not None
+        ]
+        self.update_members_coders()
 
     def encode(self, data, encoder):
+        if self.open_types:
+            data = self.encode_open_types(data)
+
         if self.additions is not None:
             offset = encoder.number_of_bits
             encoder.append_bit(0)
@@ -173,17 +195,68 @@ class MembersType(Type):
         else:
             self.encode_root(data, encoder)
 
-    def encode_root(self, data, encoder):
-        for optional in self.optionals:
-            if optional.optional:
-                encoder.append_bit(optional.name in data)
-            elif optional.name in data:
-                encoder.append_bit(data[optional.name] != optional.default)
+    def create_root_members_masks(self, root_members):
+        """Returns a list of each root member and its bit in the preamble,
+        or zero if the member is mandatory, so that the whole preamble
+        is written and read as a single integer.
+
+        """
+
+        root_members_masks = []
+        mask = (1 << self.number_of_optionals)
+
+        for member in root_members:
+            if member in self.optionals:
+                mask >>= 1
+                root_members_masks.append((member, mask))
             else:
-                encoder.append_bit(0)
+                root_members_masks.append((member, 0))
+
+        return root_members_masks
+
+    def update_members_coders(self):
+        """Writes and reads runs of mandatory members encoded in a fixed
+        number of bits as one integer.
+
+        """
 
-        for member in self.root_members:
-            self.encode_member(member, data, encoder)
+        self.root_members_layout = create_root_members_layout(
+            self.__class__.__name__,
+            self.root_members_masks)
+
+    def encode_root(self, data, encoder):
+        presence_bits = 0
+
+        if self.number_of_optionals > 0:
+            for member, mask in self.root_members_masks:
+                if mask == 0:
+                    continue
+
+                name = member.name
+
+                if name in data:
+                    if member.optional or data[name] != member.default:
+                        presence_bits |= mask
+
+            encoder.append_non_negative_binary_integer(presence_bits,
+                                                       self.number_of_optionals)
+
+        for member, mask in self.root_members_layout:
+            if mask is None:
+                member.encode(data, encoder)
+            elif mask == 0:
+                try:
+                    value = data[member.name]
+                except KeyError:
+                    raise EncodeError(
+                        "{} member '{}' not found in {}.".format(
+                            self.__class__.__name__,
+                            member.name,
+                            data))
+
+                member.encode(value, encoder)
+            elif presence_bits & mask:
+                member.encode(data[member.name], encoder)
 
     def encode_additions(self, data, encoder):
         # Encode extension additions.
@@ -232,7 +305,7 @@ class MembersType(Type):
         self.encode_root(data, encoder)
 
         if ((encoder.value == 0)
-            and (encoder.number_of_bits == len(self.optionals))):
+            and (encoder.number_of_bits == self.number_of_optionals)):
             encoder.number_of_bits = 0
 
     def encode_member(self, member, data, encoder, encode_default=False):
@@ -252,30 +325,63 @@ class MembersType(Type):
                     name,
                     data))
 
+    def encode_open_types(self, data):
+        data = dict(data)
+
+        for member in self.open_types:
+            if member.name in data:
+                data[member.name] = member.encode_value(data[member.name], data)
+
+        return data
+
     def decode(self, decoder):
         if self.additions is not None:
             if decoder.read_bit():
                 decoded = self.decode_root(decoder)
                 decoded.update(self.decode_additions(decoder))
-
-                return decoded
             else:
-                return self.decode_root(decoder)
+                decoded = self.decode_root(decoder)
         else:
-            return self.decode_root(decoder)
+            decoded = self.decode_root(decoder)
+
+        if self.open_types:
+            self.decode_open_types(decoded)
+
+        if self.record_class is not None:
+            decoded = self.record_class(decoded)
+
+        return decoded
+
+    def decode_open_types(self, values):
+        # Open types are decoded once all members are known, as the
+        # member giving the type may follow the open type.
+        for member in self.open_types:
+            if member.name in values:
+                try:
+                    values[member.name] = member.decode_value(
+                        values[member.name],
+                        values)
+                except DecodeError as e:
+                    e.location.append(member.name)
+                    raise
 
     def decode_root(self, decoder):
         values = {}
-        optionals = {
-            optional: decoder.read_bit()
-            for optional in self.optionals
-        }
 
-        for member in self.root_members:
+        if self.number_of_optionals > 0:
+            presence_bits = decoder.read_non_negative_binary_integer(
+                self.number_of_optionals)
+        else:
+            presence_bits = 0
+
+        for member, mask in self.root_members_layout:
+            if mask is None:
+                member.decode(decoder, values)
+                continue
+
             try:
-                if optionals.get(member, True):
-                    value = member.decode(decoder)
-                    values[member.name] = value
+                if mask == 0 or presence_bits & mask:
+                    values[member.name] = member.decode(decoder)
                 elif member.default is not None:
                     values[member.name] = member.default
             except DecodeError as e:
@@ -352,28 +458,9 @@ class AdditionGroup(Sequence):
     pass
 
 
-class ArrayType(Type):
-
-    def __init__(self,
-                 name,
-                 element_type,
-                 minimum,
-                 maximum,
-                 has_extension_marker,
-                 type_name):
-        super(ArrayType, self).__init__(name, type_name)
-        self.element_type = element_type
-        self.minimum = minimum
-        self.maximum = maximum
-        self.has_extension_marker = has_extension_marker
-
-        if minimum is None or maximum is None:
-            self.number_of_bits = None
-        else:
-            size = maximum - minimum
-            self.number_of_bits = integer_as_number_of_bits(size)
+class ArrayType(per.ArrayType):
 
-    def encode(self, data, encoder):
+    def encode_length(self, data, encoder):
         if self.has_extension_marker:
             encoder.append_bit(0)
 
@@ -384,10 +471,7 @@ class ArrayType(Type):
                 len(data) - self.minimum,
                 self.number_of_bits)
 
-        for entry in data:
-            self.element_type.encode(entry, encoder)
-
-    def decode(self, decoder):
+    def decode_length(self, decoder):
         if self.has_extension_marker:
             bit = decoder.read_bit()
 
@@ -402,18 +486,7 @@ class ArrayType(Type):
             if self.minimum != self.maximum:
                 length += decoder.read_non_negative_binary_integer(self.number_of_bits)
 
-        decoded = []
-
-        for _ in range(length):
-            decoded_element = self.element_type.decode(decoder)
-            decoded.append(decoded_element)
-
-        return decoded
-
-    def __repr__(self):
-        return '{}({}, {})'.format(self.__class__.__name__,
-                                   self.name,
-                                   self.element_type)
+        return length
 
 
 class SequenceOf(ArrayType):
@@ -684,6 +757,18 @@ class ObjectIdentifier(Type):
         return 'ObjectIdentifier({})'.format(self.name)
 
 
+class OpenType(per.OpenType):
+
+    def encode(self, data, encoder):
+        encoder.append_length_determinant(len(data))
+        encoder.append_bytes(data)
+
+    def decode(self, decoder):
+        length = decoder.read_length_determinant()
+
+        return decoder.read_bits(8 * length)
+
+
 class Choice(per.Choice):
 
     def encode_additions(self, data, encoder):
@@ -692,7 +777,7 @@ class Choice(per.Choice):
         except KeyError:
             raise EncodeError(
                 "Expected choices are {}, but got '{}'.".format(
-                    [member.name for member in self.all_members()],
+                    self.member_names,
                     data[0]))
 
         addition_encoder = Encoder()
@@ -815,6 +900,8 @@ class Compiler(per.Compiler):
             compiled = Any(name)
         elif type_name == 'ANY DEFINED BY':
             compiled = Any(name)
+        elif type_name == 'OpenType':
+            compiled = OpenType(name)
         elif type_name == 'NULL':
             compiled = Null(name)
         else:
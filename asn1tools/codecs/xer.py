@@ -6,7 +6,7 @@ import logging
 from xml.etree import ElementTree
 import binascii
 
-from ..parser import EXTENSION_MARKER
+from .compiler import EXTENSION_MARKER
 from . import EncodeError
 from . import DecodeError
 from . import compiler
@@ -140,6 +140,7 @@ class MembersType(Type):
     def __init__(self, name, members, type_name):
         super(MembersType, self).__init__(name, type_name)
         self.members = members
+        self.record_class = None
 
     def encode(self, data):
         element = ElementTree.Element(self.name)
@@ -177,6 +178,9 @@ class MembersType(Type):
             elif member.default is not None:
                 values[name] = member.default
 
+        if self.record_class is not None:
+            values = self.record_class(values)
+
         return values
 
     def __repr__(self):
@@ -678,7 +682,7 @@ class Compiler(compiler.Compiler):
             compiled = BitString(name)
         elif type_name == 'ANY':
             compiled = Any(name)
-        elif type_name == 'ANY DEFINED BY':
+        elif type_name in ['ANY DEFINED BY', 'OpenType']:
             compiled = Any(name)
         elif type_name == 'NULL':
             compiled = Null(name)
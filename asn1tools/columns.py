@@ -0,0 +1,253 @@
+"""Columnar decoding of many messages of the same type.
+
+Each message is decoded in full, and its numeric, boolean and
+enumerated leaves are appended to one array per field. Only the
+arrays are kept, not the decoded messages. The arrays are NumPy
+arrays if NumPy is installed, and ``array.array`` objects otherwise.
+Values that do not fit in the array of their field, for example
+integers of more than 64 bits, make it an object column; a NumPy
+array of objects, or a list.
+
+"""
+
+import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .errors import CompileError
+from .errors import DecodeError
+from .codecs import compiler
+from .codecs.compiler import EXTENSION_MARKER
+
+
+# Leaf kinds, as array type codes and NumPy data types.
+INTEGER = 'q'
+REAL = 'd'
+BOOLEAN = 'B'
+OBJECT = 'O'
+
+DTYPES = {
+    INTEGER: 'int64',
+    REAL: 'float64',
+    BOOLEAN: 'bool',
+    OBJECT: 'object'
+}
+
+LEAF_TYPES = {
+    'INTEGER': INTEGER,
+    'REAL': REAL,
+    'BOOLEAN': BOOLEAN,
+    'ENUMERATED': INTEGER
+}
+
+# Path steps.
+MEMBER = 0
+ALTERNATIVE = 1
+ELEMENT = 2
+
+MISSING = object()
+
+
+class Field(object):
+    """A leaf field given by a tuple of steps from the top level value,
+    each a (kind, key) tuple.
+
+    """
+
+    def __init__(self, path, steps, kind, enumeration):
+        self.path = path
+        self.steps = steps
+        self.kind = kind
+        self.enumeration = enumeration
+        self.values = array.array(kind)
+        self.valid = array.array(BOOLEAN)
+
+    def append(self, decoded):
+        value = decoded
+
+        for kind, key in self.steps:
+            if kind == MEMBER:
+                value = value.get(key, MISSING)
+            elif kind == ALTERNATIVE:
+                value = value[1] if value[0] == key else MISSING
+            elif key < len(value):
+                value = value[key]
+            else:
+                value = MISSING
+
+            if value is MISSING:
+                self.values.append(0)
+                self.valid.append(0)
+
+                return
+
+        if self.enumeration is not None:
+            # Values not in the type are kept as they are.
+            value = self.enumeration.get(value, value)
+
+        try:
+            self.values.append(value)
+        except (OverflowError, TypeError):
+            self.values = self.values.tolist()
+            self.kind = OBJECT
+            self.values.append(value)
+
+        self.valid.append(1)
+
+    def as_arrays(self):
+        if numpy is None:
+            return self.values, self.valid
+
+        if self.kind == OBJECT:
+            values = numpy.array(self.values, dtype=DTYPES[OBJECT])
+        else:
+            values = numpy.frombuffer(self.values, dtype=DTYPES[self.kind])
+
+        return values, numpy.frombuffer(self.valid, dtype='bool')
+
+
+class Compiler(compiler.Compiler):
+    """Resolves dotted field paths of a type in an already pre-processed
+    specification.
+
+    """
+
+    def compile_field(self, path, type_descriptor, module_name):
+        steps = []
+
+        for name in (path.split('.') if path else []):
+            type_descriptor, module_name = self.resolve(type_descriptor,
+                                                        module_name)
+            type_name = type_descriptor['type']
+
+            if type_name in ['SEQUENCE', 'SET', 'CHOICE']:
+                if type_name == 'CHOICE':
+                    steps.append((ALTERNATIVE, name))
+                else:
+                    steps.append((MEMBER, name))
+
+                type_descriptor = self.find_member(path,
+                                                   type_descriptor['members'],
+                                                   name)
+            elif type_name in ['SEQUENCE OF', 'SET OF'] and name.isdigit():
+                steps.append((ELEMENT, int(name)))
+                type_descriptor = type_descriptor['element']
+            else:
+                raise DecodeError("field '{}' not found".format(path))
+
+        type_descriptor, _ = self.resolve(type_descriptor, module_name)
+        type_name = type_descriptor['type']
+
+        if type_name not in LEAF_TYPES:
+            raise DecodeError(
+                "field '{}' of type {} is not numeric, boolean or "
+                "enumerated".format(path, type_name))
+
+        if type_name == 'ENUMERATED':
+            enumeration = {
+                value[0]: value[1]
+                for value in type_descriptor['values']
+                if value != EXTENSION_MARKER
+            }
+        else:
+            enumeration = None
+
+        return Field(path, tuple(steps), LEAF_TYPES[type_name], enumeration)
+
+    def find_member(self, path, members, name):
+        for member in compiler.flatten(members):
+            if member != EXTENSION_MARKER and member['name'] == name:
+                return member
+
+        raise DecodeError("field '{}' not found".format(path))
+
+    def resolve(self, type_descriptor, module_name):
+        """Follow references to other types until a built-in type is found.
+
+        """
+
+        while 'members' not in type_descriptor:
+            type_name = type_descriptor['type']
+
+            if type_name in LEAF_TYPES or type_name in ['SEQUENCE OF', 'SET OF']:
+                break
+
+            try:
+                type_descriptor, module_name = self.lookup_type_descriptor(
+                    type_name,
+                    module_name)
+            except CompileError:
+                break
+
+        return type_descriptor, module_name
+
+    def find_leaf_paths(self, type_descriptor, module_name, path, visited):
+        """Returns the paths of all numeric, boolean and enumerated leaves,
+        not counting those in SEQUENCE OF and SET OF, and in recursive
+        types.
+
+        """
+
+        type_name = type_descriptor['type']
+        type_descriptor, module_name = self.resolve(type_descriptor, module_name)
+
+        if type_descriptor['type'] in LEAF_TYPES:
+            return [path]
+
+        if 'members' not in type_descriptor or type_name in visited:
+            return []
+
+        paths = []
+
+        for member in compiler.flatten(type_descriptor['members']):
+            if member == EXTENSION_MARKER:
+                continue
+
+            if path:
+                member_path = path + '.' + member['name']
+            else:
+                member_path = member['name']
+
+            paths += self.find_leaf_paths(member,
+                                          module_name,
+                                          member_path,
+                                          visited | set([type_name]))
+
+        return paths
+
+
+def decode_columns(decode,
+                   specification,
+                   type_descriptor,
+                   module_name,
+                   messages,
+                   fields):
+    columns_compiler = Compiler(specification)
+
+    if fields is None:
+        fields = columns_compiler.find_leaf_paths(type_descriptor,
+                                                  module_name,
+                                                  '',
+                                                  set())
+
+    fields = [
+        columns_compiler.compile_field(path, type_descriptor, module_name)
+        for path in fields
+    ]
+
+    for message in messages:
+        decoded = decode(message)
+
+        for field in fields:
+            field.append(decoded)
+
+    values = {}
+    valid = {}
+
+    for field in fields:
+        values[field.path], valid[field.path] = field.as_arrays()
+
+    return values, valid
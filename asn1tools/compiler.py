@@ -3,20 +3,27 @@ encode and decode types.
 
 """
 
-from .parser import parse_files
-from .parser import parse_string
+import threading
+from copy import deepcopy
+from importlib import import_module
+
 from .codecs import compiler
-from .codecs import ber
-from .codecs import der
-from .codecs import gser
-from .codecs import jer
-from .codecs import per
-from .codecs import uper
-from .codecs import xer
+from .errors import Error
 from .errors import CompileError
 from .errors import EncodeError
 from .errors import DecodeError
 from .errors import ConstraintsError
+from .cache import DecodeCache
+from .profiler import Profiler
+from .records import set_record_classes
+
+
+DEFAULT_DECODE_CACHE_SIZE = 128
+DEFAULT_DECODE_CACHE_BYTES = 1048576
+
+CODECS = ('ber', 'der', 'gser', 'jer', 'per', 'uper', 'xer')
+
+CONTAINERS = ('dict', 'records')
 
 
 class Specification(object):
@@ -30,11 +37,24 @@ class Specification(object):
 
     """
 
-    def __init__(self, modules, decode_length):
+    def __init__(self,
+                 modules,
+                 decode_length,
+                 decode_cache_size=0,
+                 decode_cache_bytes=DEFAULT_DECODE_CACHE_BYTES):
         self._modules = modules
         self._decode_length = decode_length
         self._types = {}
+        self._decode_cache_bytes = decode_cache_bytes
 
+        if decode_cache_size > 0:
+            self._decode_cache = DecodeCache(decode_cache_size,
+                                             decode_cache_bytes)
+        else:
+            self._decode_cache = None
+
+        self._decode_cache_lock = threading.Lock()
+        self._profiler = None
         duplicated = set()
 
         for module_name in modules:
@@ -82,10 +102,15 @@ class Specification(object):
 
         return self._modules
 
-    def encode(self, name, data, **kwargs):
+    def encode(self, name, data, check_constraints=False, **kwargs):
         """Encode given dictionary `data` as given type `name` and return the
         encoded data as a bytes object.
 
+        If `check_constraints` is ``True``, `data` is checked against
+        the type's constraints before it is encoded, see
+        :meth:`.check_constraints`. The check is a separate pass over
+        the constrained parts of `data`, not part of the encoding.
+
         See `Types`_ for a mapping table from ASN.1 types to Python
         types.
 
@@ -98,11 +123,76 @@ class Specification(object):
             raise EncodeError(
                 "type '{}' not found in types dictionary".format(name))
 
-        return self._types[name].encode(data, **kwargs)
+        type_ = self._types[name]
+
+        if check_constraints:
+            type_.check_constraints(data)
+
+        return type_.encode(data, **kwargs)
+
+    def encode_into(self, name, data, buffer, check_constraints=False):
+        """Encode given dictionary `data` as given type `name` and append
+        the encoded data to given bytearray `buffer`. Returns the
+        number of appended bytes. The types encode directly into
+        `buffer`, so a buffer reused across calls saves allocating and
+        copying the encoded data. `buffer` is left as it was if the
+        encoding fails. Only supported by the BER and DER codecs.
+
+        See :meth:`.encode` for `check_constraints`.
+
+        >>> buffer = bytearray()
+        >>> foo.encode_into('Question', {'id': 1, 'question': 'Is 1+1=3?'}, buffer)
+        16
+        >>> buffer
+        bytearray(b'0\\x0e\\x02\\x01\\x01\\x16\\x09Is 1+1=3?')
+
+        """
+
+        if name not in self._types:
+            raise EncodeError(
+                "type '{}' not found in types dictionary".format(name))
+
+        type_ = self._types[name]
+
+        if check_constraints:
+            type_.check_constraints(data)
+
+        return type_.encode_into(data, buffer)
+
+    def pre_encode(self, name, data):
+        """Encode given dictionary `data` as given type `name` and return
+        the encoded data as an :class:`~asn1tools.Encoded` object. It
+        can be given instead of a value of the same type when
+        encoding other values, which is faster than encoding the
+        same value over and over again. Only supported by the BER
+        and DER codecs.
+
+        >>> question = foo.pre_encode('Question', {'id': 1, 'question': 'Is 1+1=3?'})
+        >>> question
+        Encoded(b'0\\x0e\\x02\\x01\\x01\\x16\\x09Is 1+1=3?')
+        >>> foo.encode('Question', question)
+        b'0\\x0e\\x02\\x01\\x01\\x16\\x09Is 1+1=3?'
+
+        """
+
+        if name not in self._types:
+            raise EncodeError(
+                "type '{}' not found in types dictionary".format(name))
+
+        return self._types[name].pre_encode(data)
+
+    def decode(self, name, data, cache=None):
+        """Decode given bytes-like object `data` as given type `name` and
+        return the decoded data as a dictionary. The binary codecs
+        accept bytes, bytearray and memoryview objects. PER and UPER
+        decode them without copying, as do BER and DER for bytes and
+        bytearray objects.
 
-    def decode(self, name, data):
-        """Decode given bytes object `data` as given type `name` and return
-        the decoded data as a dictionary.
+        The decode cache is used if `cache` is ``True``, or if `cache`
+        is ``None`` and the specification was compiled with a non-zero
+        `decode_cache_size`. A cache of default size is created if
+        needed. Pass ``False`` to bypass the cache. The cache is
+        always bypassed while profiling, so every call is recorded.
 
         >>> foo.decode('Question', b'0\\x0e\\x02\\x01\\x01\\x16\\x09Is 1+1=3?')
         {'id': 1, 'question': 'Is 1+1=3?'}
@@ -113,7 +203,132 @@ class Specification(object):
             raise DecodeError(
                 "type '{}' not found in types dictionary".format(name))
 
-        return self._types[name].decode(data)
+        type_ = self._types[name]
+
+        if self._profiler is not None:
+            cache = False
+        elif cache is None:
+            cache = (self._decode_cache is not None)
+
+        if cache:
+            decode_cache = self._decode_cache
+
+            if decode_cache is None:
+                decode_cache = self._create_decode_cache()
+
+            return decode_cache.decode(name, data, type_.decode)
+        else:
+            return type_.decode(data)
+
+    def _create_decode_cache(self):
+        with self._decode_cache_lock:
+            if self._decode_cache is None:
+                self._decode_cache = DecodeCache(DEFAULT_DECODE_CACHE_SIZE,
+                                                 self._decode_cache_bytes)
+
+        return self._decode_cache
+
+    def decode_columns(self, name, messages, fields=None):
+        """Decode given iterable of bytes-like objects `messages` as given
+        type `name`, and return the values of given fields `fields`
+        as columns, one element per message, instead of the decoded
+        messages. Each message is decoded in full, but only the
+        columns are kept.
+
+        Fields are dotted paths of member names, CHOICE alternative
+        names and SEQUENCE OF and SET OF indexes, for example
+        ``'cam.generationDeltaTime'``, of INTEGER, REAL, BOOLEAN and
+        ENUMERATED types. ENUMERATED values are given as their
+        numbers. If `fields` is ``None``, all such fields outside
+        SEQUENCE OF and SET OF types are returned.
+
+        Returns a tuple of two dictionaries of field paths to arrays;
+        values and validity masks. A field is not valid in a message,
+        and its value is zero, if an OPTIONAL member or another CHOICE
+        alternative is present instead of it. The arrays are NumPy
+        arrays if NumPy is installed, otherwise ``array.array``
+        objects. Fields with values not fitting in such an array, for
+        example integers of more than 64 bits, are given as NumPy
+        arrays of objects, or lists.
+
+        Raises DecodeError if a field is not found, or is not of one
+        of the types above.
+
+        >>> values, valid = foo.decode_columns('Question', messages, ['id'])
+        >>> values['id']
+        array([1, 2, 5])
+
+        """
+
+        if name not in self._types:
+            raise DecodeError(
+                "type '{}' not found in types dictionary".format(name))
+
+        return self._types[name].decode_columns(messages, fields)
+
+    def decode_cache_info(self):
+        """Returns decode cache statistics as a named tuple with the fields
+        `hits`, `misses`, `size`, `maximum_size`, `number_of_bytes`
+        and `maximum_number_of_bytes`, or None if the decode cache is
+        not used.
+
+        >>> foo = asn1tools.compile_files('foo.asn', decode_cache_size=128)
+        >>> encoded = b'0\\x0e\\x02\\x01\\x01\\x16\\x09Is 1+1=3?'
+        >>> foo.decode('Question', encoded)
+        {'id': 1, 'question': 'Is 1+1=3?'}
+        >>> foo.decode('Question', encoded)
+        {'id': 1, 'question': 'Is 1+1=3?'}
+        >>> info = foo.decode_cache_info()
+        >>> info.hits, info.misses, info.size
+        (1, 1, 1)
+
+        """
+
+        if self._decode_cache is None:
+            return None
+
+        return self._decode_cache.info()
+
+    def decode_cache_clear(self):
+        """Remove all entries from the decode cache and reset its
+        statistics.
+
+        """
+
+        if self._decode_cache is not None:
+            self._decode_cache.clear()
+
+    def enable_profiling(self):
+        """Start recording call counts, cumulative time and encoded size
+        per type and member path, and return the
+        :class:`~asn1tools.profiler.Profiler` object that holds the
+        statistics. Profiling adds overhead to encoding and decoding
+        until disabled with :meth:`.disable_profiling`. The decode
+        cache is not used while profiling.
+
+        >>> profiler = foo.enable_profiling()
+        >>> foo.decode('Question', b'0\\x0e\\x02\\x01\\x01\\x16\\x09Is 1+1=3?')
+        {'id': 1, 'question': 'Is 1+1=3?'}
+        >>> profiler.as_dict()['Question.id']['decode']['size']
+        3
+
+        """
+
+        if self._profiler is None:
+            self._profiler = Profiler(self._types)
+            self._profiler.enable()
+
+        return self._profiler
+
+    def disable_profiling(self):
+        """Stop profiling, restoring the original encode and decode
+        methods.
+
+        """
+
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler = None
 
     def decode_length(self, data):
         """Decode the length of given data `data`. Returns None if not enough
@@ -131,7 +346,10 @@ class Specification(object):
         return self._decode_length(data)
 
     def check_constraints(self, name, data):
-        """Check if `data` fulfills given type `name`'s constraints.
+        """Check if `data` fulfills given type `name`'s SIZE, value range
+        and permitted alphabet (FROM) constraints. Extensible
+        constraints are not checked, as values outside their root are
+        valid.
 
         Raises ConstraintsError if the constraints are not fulfilled,
         or if given type does not exist.
@@ -146,6 +364,188 @@ class Specification(object):
 
         return self._types[name].check_constraints(data)
 
+    def generate(self, name, seed=None, size_hint=compiler.DEFAULT_SIZE_HINT):
+        """Generate a random value of given type `name`, fulfilling its SIZE
+        and value range constraints. Give an integer `seed` to
+        generate the same value every time, or a
+        :class:`random.Random` object to draw random numbers from,
+        which is faster when generating many values. `size_hint`
+        limits the number of elements, characters, octets and bits
+        above the minimum of the SIZE constraint.
+
+        Optional members and extension additions are present with a
+        probability of one half. ANY and open types are given a BER
+        encoded NULL, whatever the codec.
+
+        >>> foo.generate('Question', seed=1)
+        {'id': -1570393611, 'question': '@'}
+
+        """
+
+        if name not in self._types:
+            raise Error("type '{}' not found in types dictionary".format(name))
+
+        return self._types[name].generate(seed, size_hint)
+
+
+class SpecificationBundle(object):
+    """A :class:`~asn1tools.compiler.Specification` object per codec,
+    compiled from the same specification dictionary.
+
+    Instances of this class are created by the factory functions
+    :func:`~asn1tools.compile_files()`,
+    :func:`~asn1tools.compile_string()` and
+    :func:`~asn1tools.compile_dict()` if given `codecs`.
+
+    The specification dictionary is copied and pre-processed once, and
+    the :class:`~asn1tools.compiler.Specification` object of each
+    codec is compiled from the copy on first use.
+
+    >>> foo = asn1tools.compile_files('foo.asn', codecs=['ber', 'uper'])
+    >>> foo['uper'].encode('Question', {'id': 1, 'question': 'Is 1+1=3?'})
+    b'\x01\x01\t\x93\xcd\x03\x15l^\xb3~'
+
+    """
+
+    def __init__(self,
+                 specification,
+                 codecs,
+                 decode_cache_size,
+                 decode_cache_bytes,
+                 container):
+        self._specification = specification
+        self._codecs = tuple(codecs)
+        self._decode_cache_size = decode_cache_size
+        self._decode_cache_bytes = decode_cache_bytes
+        self._container = container
+        self._specifications = {}
+        self._transcoders = {}
+        self._lock = threading.Lock()
+
+    @property
+    def codecs(self):
+        """A tuple of the codecs in the bundle.
+
+        """
+
+        return self._codecs
+
+    def __contains__(self, codec):
+        return codec in self._codecs
+
+    def __iter__(self):
+        return iter(self._codecs)
+
+    def __len__(self):
+        return len(self._codecs)
+
+    def keys(self):
+        """A list of the codecs in the bundle.
+
+        """
+
+        return list(self._codecs)
+
+    def get(self, codec, default=None):
+        """Returns the :class:`~asn1tools.compiler.Specification` object of
+        given codec, or `default` if not in the bundle.
+
+        """
+
+        if codec not in self._codecs:
+            return default
+
+        return self[codec]
+
+    def __getitem__(self, codec):
+        try:
+            return self._specifications[codec]
+        except KeyError:
+            pass
+
+        if codec not in self._codecs:
+            raise KeyError(codec)
+
+        # Codecs are compiled one at a time, as they share the
+        # specification dictionary.
+        with self._lock:
+            if codec not in self._specifications:
+                codec_module = import_codec(codec)
+                modules = _compile_modules(self._specification,
+                                           codec_module,
+                                           None,
+                                           self._container,
+                                           pre_processed=True)
+                self._specifications[codec] = Specification(
+                    modules,
+                    codec_module.decode_length,
+                    self._decode_cache_size,
+                    self._decode_cache_bytes)
+
+        return self._specifications[codec]
+
+    def transcode(self, name, data, from_codec, to_codec):
+        """Transcode given bytes-like object `data` of given type `name`
+        from codec `from_codec` to codec `to_codec`, and return the
+        encoded data. See :func:`~asn1tools.transcode()`.
+
+        >>> foo.transcode('Question',
+        ...               b'0\\x0e\\x02\\x01\\x01\\x16\\x09Is 1+1=3?',
+        ...               'ber',
+        ...               'uper')
+        bytearray(b'\\x01\\x01\\t\\x93\\xcd\\x03\\x15l^\\xb3~')
+
+        """
+
+        key = (name, from_codec, to_codec)
+
+        try:
+            transcoder = self._transcoders[key]
+        except KeyError:
+            source = self[from_codec]
+            target = self[to_codec]
+
+            if name not in source.types or name not in target.types:
+                raise DecodeError(
+                    "type '{}' not found in types dictionary".format(name))
+
+            transcoder = import_codec('transcoder').compile_transcoder(
+                source.types[name],
+                target.types[name],
+                from_codec,
+                to_codec)
+            self._transcoders[key] = transcoder
+
+        return transcoder.transcode(data)
+
+
+def transcode(bundle, name, data, from_codec, to_codec):
+    """Transcode given bytes-like object `data` of given type `name`
+    from codec `from_codec` to codec `to_codec` of given
+    :class:`~asn1tools.compiler.SpecificationBundle` object `bundle`,
+    and return the encoded data.
+
+    The encoded data is identical to decoding `data` with the first
+    codec and encoding the decoded value with the second codec. PER
+    and UPER to BER write the output while reading the input, without
+    creating the decoded SEQUENCE, SET, SEQUENCE OF, SET OF and CHOICE
+    values. BER to JER builds the value given to the JSON encoder
+    while reading the input, instead of converting the decoded
+    value. Other codecs are decoded and encoded. JER, XER and GSER
+    are encoded without indentation.
+
+    >>> foo = asn1tools.compile_files('foo.asn', codecs=['uper', 'ber'])
+    >>> asn1tools.transcode(foo,
+    ...                     'Question',
+    ...                     b'\\x01\\x01\\t\\x93\\xcd\\x03\\x15l^\\xb3~',
+    ...                     'uper',
+    ...                     'ber')
+    bytearray(b'0\\x0e\\x02\\x01\\x01\\x16\\tIs 1+1=3?')
+
+    """
+
+    return bundle.transcode(name, data, from_codec, to_codec)
+
 
 def _compile_any_defined_by_type(type_, choices):
     type_['choices'] = {}
@@ -177,47 +577,184 @@ def _compile_any_defined_by_choices(specification,
                 break
 
 
-def compile_dict(specification, codec='ber', any_defined_by_choices=None):
+def import_codec(name):
+    """Returns the codec module `name`, importing it on first use. Only
+    the codecs actually used are imported, which keeps ``import
+    asn1tools`` fast.
+
+    """
+
+    return import_module('.codecs.' + name, __package__)
+
+
+def parse_string(string):
+    """Parse given ASN.1 specification string and return a dictionary of
+    its contents.
+
+    >>> with open('foo.asn') as fin:
+    ...     foo = asn1tools.parse_string(fin.read())
+
+    """
+
+    # The parser, and thereby pyparsing, is imported on first use.
+    from . import parser
+
+    return parser.parse_string(string)
+
+
+def parse_files(filenames, encoding='utf-8', jobs=1, cache_dir=None):
+    """Parse given ASN.1 specification file(s) and return a dictionary of
+    its/their contents.
+
+    Each module is parsed separately. Give `jobs` to parse modules in
+    that many processes, or ``None`` for one process per processor.
+
+    Give `cache_dir` to save each parsed module in that directory,
+    keyed by its contents. Only modules not found in the cache are
+    parsed, so after editing one module only that module is parsed
+    again.
+
+    >>> foo = asn1tools.parse_files('foo.asn')
+    >>> rrc = asn1tools.parse_files('rrc.asn', jobs=4, cache_dir='.asn1cache')
+
+    """
+
+    from . import parser
+
+    if cache_dir is None:
+        cache = None
+    else:
+        cache = parser.DirectoryCache(cache_dir)
+
+    return parser.parse_files(filenames, encoding, jobs, cache)
+
+
+def _check_options(codec, container):
+    if codec not in CODECS:
+        raise CompileError("unsupported codec '{}'".format(codec))
+
+    if container not in CONTAINERS:
+        raise CompileError("unsupported container '{}'".format(container))
+
+
+def compile_dict(specification,
+                 codec='ber',
+                 any_defined_by_choices=None,
+                 decode_cache_size=0,
+                 decode_cache_bytes=DEFAULT_DECODE_CACHE_BYTES,
+                 container='dict',
+                 codecs=None):
     """Compile given ASN.1 specification dictionary and return a
     :class:`~asn1tools.compiler.Specification` object that can be used
     to encode and decode data structures with given codec
     `codec`. `codec` may be one of ``'ber'``, ``'der'``, ``'gser'``,
     ``'jer'``, ``'per'``, ``'uper'`` and ``'xer'``.
 
+    Give `decode_cache_size` to cache up to that many decoded values,
+    keyed by type name and encoded data, with at most
+    `decode_cache_bytes` bytes of encoded and decoded data in total.
+    The size of decoded data is estimated with
+    :func:`sys.getsizeof()`. The byte limit is disabled if ``None``.
+
+    SEQUENCE and SET values are decoded as dictionaries if
+    `container` is ``'dict'``, and as instances of record classes
+    with ``__slots__``, created per type, if ``'records'``. Records
+    take less memory and have a :meth:`to_dict()` method. They can
+    be given to the encoders just like dictionaries.
+
+    The specification dictionary is modified when compiled. Give a
+    list of codecs `codecs` instead of `codec` to compile a copy of it
+    once for all of them. A
+    :class:`~asn1tools.compiler.SpecificationBundle` object is then
+    returned, and `specification` is not modified.
+
     >>> foo = asn1tools.compile_dict(asn1tools.parse_files('foo.asn'))
 
     """
 
-    codecs = {
-        'ber': ber,
-        'der': der,
-        'gser': gser,
-        'jer': jer,
-        'per': per,
-        'uper': uper,
-        'xer': xer
-    }
+    if codecs is not None:
+        for codec in codecs:
+            _check_options(codec, container)
+
+        specification = deepcopy(specification)
+
+        if any_defined_by_choices:
+            _compile_any_defined_by_choices(specification,
+                                            any_defined_by_choices)
+
+        return SpecificationBundle(compiler.pre_process(specification),
+                                   codecs,
+                                   decode_cache_size,
+                                   decode_cache_bytes,
+                                   container)
+
+    _check_options(codec, container)
+    codec = import_codec(codec)
+    modules = _compile_modules(specification,
+                               codec,
+                               any_defined_by_choices,
+                               container)
+
+    return Specification(modules,
+                         codec.decode_length,
+                         decode_cache_size,
+                         decode_cache_bytes)
+
+
+def _compile_modules(specification,
+                     codec,
+                     any_defined_by_choices,
+                     container,
+                     compiled=None,
+                     pre_processed=False):
+    """Returns a dictionary of modules of compiled types. Modules in
+    given dictionary of modules of compiled types `compiled`, as
+    returned by a previous call, are not compiled again. Give
+    `pre_processed` as True if the specification is already
+    pre-processed.
 
-    try:
-        codec = codecs[codec]
-    except KeyError:
-        raise CompileError("unsupported codec '{}'".format(codec))
+    """
 
     if any_defined_by_choices:
         _compile_any_defined_by_choices(specification,
                                         any_defined_by_choices)
 
-    return Specification(codec.compile_dict(specification),
-                         codec.decode_length)
+    if compiled is None:
+        compiled = {}
+
+    modules = codec.Compiler(specification).process(compiled, pre_processed)
+    modules = {
+        module_name: types
+        for module_name, types in modules.items()
+        if module_name not in compiled
+    }
+
+    if container == 'records':
+        for types in modules.values():
+            set_record_classes(types)
+
+    modules.update(compiled)
+
+    return modules
 
 
-def compile_string(string, codec='ber', any_defined_by_choices=None):
+def compile_string(string,
+                   codec='ber',
+                   any_defined_by_choices=None,
+                   decode_cache_size=0,
+                   decode_cache_bytes=DEFAULT_DECODE_CACHE_BYTES,
+                   container='dict',
+                   codecs=None):
     """Compile given ASN.1 specification string and return a
     :class:`~asn1tools.compiler.Specification` object that can be used
     to encode and decode data structures with given codec
     `codec`. `codec` may be one of ``'ber'``, ``'der'``, ``'gser'``,
     ``'jer'``, ``'per'``, ``'uper'`` and ``'xer'``.
 
+    See :func:`~asn1tools.compile_dict()` for a description of
+    `decode_cache_size`, `decode_cache_bytes`, `container` and
+    `codecs`.
+
     >>> with open('foo.asn') as fin:
     ...     foo = asn1tools.compile_string(fin.read())
 
@@ -225,23 +762,62 @@ def compile_string(string, codec='ber', any_defined_by_choices=None):
 
     return compile_dict(parse_string(string),
                         codec,
-                        any_defined_by_choices)
-
-
-def compile_files(filenames, codec='ber', any_defined_by_choices=None):
+                        any_defined_by_choices,
+                        decode_cache_size,
+                        decode_cache_bytes,
+                        container,
+                        codecs)
+
+
+def compile_files(filenames,
+                  codec='ber',
+                  any_defined_by_choices=None,
+                  decode_cache_size=0,
+                  decode_cache_bytes=DEFAULT_DECODE_CACHE_BYTES,
+                  container='dict',
+                  codecs=None,
+                  watch=False):
     """Compile given ASN.1 specification file(s) and return a
     :class:`~asn1tools.compiler.Specification` object that can be used
     to encode and decode data structures with given codec
     `codec`. `codec` may be one of ``'ber'``, ``'der'``, ``'gser'``,
     ``'jer'``, ``'per'``, ``'uper'`` and ``'xer'``.
 
+    See :func:`~asn1tools.compile_dict()` for a description of
+    `decode_cache_size`, `decode_cache_bytes`, `container` and
+    `codecs`.
+
+    If `watch` is ``True``, a started
+    :class:`~asn1tools.watcher.SpecificationWatcher` object is
+    returned instead, that compiles the file(s) again when modified.
+
     >>> foo = asn1tools.compile_files('foo.asn')
 
     """
 
+    if watch:
+        if codecs is not None:
+            raise CompileError("codecs can not be watched")
+
+        from .watcher import SpecificationWatcher
+
+        watcher = SpecificationWatcher(filenames,
+                                       codec,
+                                       any_defined_by_choices,
+                                       decode_cache_size,
+                                       decode_cache_bytes,
+                                       container)
+        watcher.start()
+
+        return watcher
+
     return compile_dict(parse_files(filenames),
                         codec,
-                        any_defined_by_choices)
+                        any_defined_by_choices,
+                        decode_cache_size,
+                        decode_cache_bytes,
+                        container,
+                        codecs)
 
 
 def pre_process_dict(specification):
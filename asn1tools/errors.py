@@ -9,6 +9,12 @@ class Error(Exception):
     """
 
 
+class ParseError(Error):
+    """General ASN.1 parse error.
+
+    """
+
+
 class CompileError(Error):
     """General ASN.1 compile error.
 
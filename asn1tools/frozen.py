@@ -0,0 +1,234 @@
+"""Compiled specifications as importable Python modules, generated
+ahead of time by the ``generate-python`` subcommand.
+
+A generated module contains the pre-processed specification as a
+dictionary literal, which Python caches in its ``.pyc`` file, so the
+module is imported without parsing the ASN.1 source or importing the
+parser. Each type is compiled on first use.
+
+"""
+
+import threading
+
+from .compiler import DEFAULT_DECODE_CACHE_BYTES
+from .compiler import Specification
+from .compiler import import_codec
+from .compiler import parse_files
+from .compiler import compile_dict
+from .compiler import _check_options
+from .errors import CompileError
+from .records import set_record_classes
+
+
+SOURCE_FMT = '''\
+"""The ASN.1 specification {filenames} compiled for the {codec} codec.
+
+This file was generated by asn1tools {version}. Do not edit.
+
+>>> from {module_name} import specification
+>>> specification.encode(...)
+
+"""
+
+from asn1tools.frozen import load
+
+
+SPECIFICATION = {specification}
+
+specification = load(SPECIFICATION,
+                     '{codec}',
+                     '{version}',
+                     decode_cache_size={decode_cache_size},
+                     decode_cache_bytes={decode_cache_bytes},
+                     container='{container}')
+'''
+
+
+class LazyCompiledType(object):
+    """A compiled type, compiled on first use of any of its attributes.
+
+    """
+
+    def __init__(self, compiler, module_name, type_name):
+        self._compiler = compiler
+        self._module_name = module_name
+        self._type_name = type_name
+        self._compiled = None
+        self._compiling = None
+
+    @property
+    def compiled(self):
+        if self._compiled is None:
+            with self._compiler.lock:
+                self.compile()
+
+        return self._compiled
+
+    def compile(self):
+        """Compile the type, unless already compiled, and return it. A type
+        being compiled is returned as it is, as recursive types refer
+        to themselves. Must be called with the compiler's lock held.
+
+        """
+
+        if self._compiled is not None:
+            return self._compiled
+
+        if self._compiling is None:
+            self._compiling = self._compiler.process_named_type(
+                self._module_name,
+                self._type_name)
+            self._compiler.resolve_recursive_types()
+            self._compiler.set_record_classes(self._type_name, self._compiling)
+            self._compiled = self._compiling
+
+        return self._compiling
+
+    def __getattr__(self, name):
+        return getattr(self.compiled, name)
+
+    def __repr__(self):
+        return repr(self.compiled)
+
+
+class LazyCompiler(object):
+    """Compiles the types of given pre-processed specification with given
+    codec compiler on first use. Types are compiled one at a time, as
+    the codec compiler is not thread safe.
+
+    """
+
+    def __init__(self, compiler, container):
+        self._compiler = compiler
+        self._container = container
+        self._record_classes = {}
+        self.lock = threading.RLock()
+        self.modules = {}
+
+        for module_name, type_name in compiler.iter_type_names():
+            if module_name not in self.modules:
+                self.modules[module_name] = {}
+
+            self.modules[module_name][type_name] = LazyCompiledType(self,
+                                                                    module_name,
+                                                                    type_name)
+
+    def process_named_type(self, module_name, type_name):
+        return self._compiler.process_named_type(module_name, type_name)
+
+    def resolve_recursive_types(self):
+        # Compiling the inner type may find more recursive types.
+        recursive_types = self._compiler.recurvise_types
+
+        while recursive_types:
+            recursive_type = recursive_types.pop()
+            inner_type = self.modules[recursive_type.module_name][
+                recursive_type.type_name].compile().type
+            recursive_type.set_inner_type(inner_type)
+
+    def set_record_classes(self, type_name, compiled):
+        if self._container == 'records':
+            set_record_classes({type_name: compiled}, self._record_classes)
+
+
+def format_specification(specification):
+    """Returns given specification dictionary as Python source, with one
+    type, value, object class or object set per line.
+
+    """
+
+    lines = ['{']
+
+    for module_name, module in specification.items():
+        lines.append('    {!r}: {{'.format(module_name))
+
+        for key, value in module.items():
+            if isinstance(value, dict) and value:
+                lines.append('        {!r}: {{'.format(key))
+
+                for name, item in value.items():
+                    lines.append('            {!r}: {!r},'.format(name, item))
+
+                lines.append('        },')
+            else:
+                lines.append('        {!r}: {!r},'.format(key, value))
+
+        lines.append('    },')
+
+    lines.append('}')
+
+    return '\n'.join(lines)
+
+
+def generate_python_source(filenames,
+                           codec='ber',
+                           module_name='generated',
+                           decode_cache_size=0,
+                           decode_cache_bytes=DEFAULT_DECODE_CACHE_BYTES,
+                           container='dict'):
+    """Returns the source code of a Python module of given ASN.1
+    specification file(s) compiled for given codec. The module's
+    ``specification`` attribute is a
+    :class:`~asn1tools.compiler.Specification` object, as returned by
+    :func:`~asn1tools.compile_files()` with given `decode_cache_size`,
+    `decode_cache_bytes` and `container`.
+
+    The specification is compiled once here to report any errors.
+
+    >>> source = asn1tools.generate_python_source('foo.asn', 'uper', 'foo_uper')
+    >>> with open('foo_uper.py', 'w') as fout:
+    ...     fout.write(source)
+
+    """
+
+    if isinstance(filenames, str):
+        filenames = [filenames]
+
+    # Compiling pre-processes the specification in place.
+    specification = parse_files(filenames)
+    compile_dict(specification, codec, container=container)
+
+    # Imported here as the package imports this module before
+    # defining its version.
+    from . import __version__
+
+    return SOURCE_FMT.format(filenames=', '.join(filenames),
+                             codec=codec,
+                             version=__version__,
+                             module_name=module_name,
+                             specification=format_specification(specification),
+                             decode_cache_size=decode_cache_size,
+                             decode_cache_bytes=decode_cache_bytes,
+                             container=container)
+
+
+def load(specification,
+         codec,
+         version,
+         decode_cache_size=0,
+         decode_cache_bytes=DEFAULT_DECODE_CACHE_BYTES,
+         container='dict'):
+    """Returns a :class:`~asn1tools.compiler.Specification` object of
+    given pre-processed specification dictionary, generated by
+    :func:`~asn1tools.generate_python_source()` with asn1tools version
+    `version`, compiled for given codec on first use of each type. See
+    :func:`~asn1tools.compile_dict()` for a description of
+    `decode_cache_size`, `decode_cache_bytes` and `container`.
+
+    """
+
+    from . import __version__
+
+    if version != __version__:
+        raise CompileError(
+            "the module was generated by asn1tools {}, but asn1tools {} is "
+            "installed, please generate it again".format(version, __version__))
+
+    _check_options(codec, container)
+    codec = import_codec(codec)
+    compiler = LazyCompiler(codec.Compiler(specification), container)
+
+    return Specification(compiler.modules,
+                         codec.decode_length,
+                         decode_cache_size,
+                         decode_cache_bytes)
@@ -2,7 +2,10 @@
 
 """
 
+import hashlib
 import logging
+import os
+import pickle
 import re
 import sys
 
@@ -30,15 +33,17 @@ from pyparsing import ParseResults
 from pyparsing import lineno
 
 from .errors import Error
+from .errors import ParseError
+from .codecs.compiler import EXTENSION_MARKER
 
 
 LOGGER = logging.getLogger(__name__)
 
-EXTENSION_MARKER = None
-
-
-class ParseError(Error):
-    pass
+# The start of a module definition, "Name { oid } DEFINITIONS", at the
+# beginning of a line.
+RE_MODULE_DEFINITION = re.compile(
+    r'^[ \t]*[A-Za-z][\w-]*\s*(\{[^{}]*\})?\s*DEFINITIONS\b',
+    re.MULTILINE)
 
 
 class InternalParserError(Error):
@@ -134,6 +139,25 @@ def convert_size(tokens):
             return tokens[0]['size']
 
 
+def convert_permitted_alphabets(tokens):
+    """Returns the permitted alphabet of the FROM constraints in given
+    constraint tokens, or None if there are none.
+
+    """
+
+    values = []
+
+    for constraint_tokens in tokens:
+        if isinstance(constraint_tokens, ParseResults):
+            constraint_tokens = constraint_tokens.asList()
+
+        for item in constraint_tokens:
+            if isinstance(item, dict) and 'from' in item:
+                values.extend(item['from'])
+
+    return values or None
+
+
 def convert_table(tokens):
     tokens = tokens[0]
 
@@ -271,7 +295,9 @@ def convert_permitted_alphabet(_s, _l, tokens):
     values = []
 
     for token in tokens[1:]:
-        if isinstance(token[0], list):
+        if token == '...':
+            values.append(EXTENSION_MARKER)
+        elif isinstance(token[0], list):
             for char in token[0][0]:
                 values.append((char, char))
         else:
@@ -388,11 +414,39 @@ def convert_choice_type(_s, _l, tokens):
     }
 
 
+def convert_actual_parameter(tokens):
+    while isinstance(tokens, list) and len(tokens) == 1:
+        tokens = tokens[0]
+
+    if isinstance(tokens, list):
+        if isinstance(tokens[0], dict):
+            tokens = tokens[0]
+    else:
+        tokens = convert_number(tokens)
+
+    return tokens
+
+
 def convert_defined_type(_s, _l, tokens):
-    return {
+    tokens = tokens.asList()
+
+    if len(tokens) == 3 and tokens[1] == '.':
+        return {
+            'type': tokens[0] + '.' + tokens[2]
+        }
+
+    converted_type = {
         'type': tokens[0]
     }
 
+    if len(tokens) == 2:
+        converted_type['actual-parameters'] = [
+            convert_actual_parameter(parameter_tokens)
+            for parameter_tokens in tokens[1]
+        ]
+
+    return converted_type
+
 
 def convert_integer_type(_s, _l, _tokens):
     return {'type': 'INTEGER'}
@@ -500,6 +554,12 @@ def convert_type(tokens):
         if size:
             converted_type['size'] = size
 
+    if converted_type['type'] in types[2:]:
+        permitted_alphabet = convert_permitted_alphabets(constraint)
+
+        if permitted_alphabet:
+            converted_type['from'] = permitted_alphabet
+
     if '&' in converted_type['type']:
         converted_type['table'] = convert_table(tokens.asList()[1:])
 
@@ -552,23 +612,52 @@ def convert_value(tokens, type_=None):
     return value
 
 
+def convert_object(tokens):
+    """Convert given information object tokens, either a dictionary of
+    field names and settings (default syntax) or a list of words
+    (defined syntax), to be matched by the compiler against the WITH
+    SYNTAX of the object class.
+
+    """
+
+    if all(isinstance(item_tokens[0], str) and item_tokens[0].startswith('&')
+           for item_tokens in tokens):
+        converted_object = {}
+
+        for item_tokens in tokens:
+            name = item_tokens[0]
+            value = item_tokens[1][0]
+
+            if isinstance(value, Tokens):
+                value = value[0]
+
+            converted_object[name] = convert_number(value)
+    else:
+        converted_object = []
+
+        for item_tokens in tokens:
+            if isinstance(item_tokens, list):
+                item_tokens = item_tokens[0]
+
+            converted_object.append(convert_number(item_tokens))
+
+    return converted_object
+
+
 def convert_parameterized_object_set_assignment(_s, _l, tokens):
     members = []
 
     try:
         for member_tokens in tokens[4].asList():
-            if len(member_tokens[0]) == 1:
+            # Skip the extension marker and its separating comma.
+            if not isinstance(member_tokens, list):
+                continue
+
+            if len(member_tokens[0]) == 1 and isinstance(member_tokens[0][0],
+                                                         str):
                 member = member_tokens[0][0]
             else:
-                member = {}
-
-                for item_tokens in member_tokens[0]:
-                    name = item_tokens[0]
-                    value = item_tokens[1][0]
-
-                    if isinstance(value, Tokens):
-                        value = value[0]
-                    member[name] = convert_number(value)
+                member = convert_object(member_tokens[0])
 
             members.append(member)
     except IndexError:
@@ -586,10 +675,14 @@ def convert_parameterized_object_set_assignment(_s, _l, tokens):
 
 def convert_parameterized_object_assignment(_s, _l, tokens):
     type_ = tokens[1]
+    value = tokens[2]
+
+    if isinstance(value, ParseResults):
+        value = convert_object(value.asList())
 
     converted_type = {
         'type': type_,
-        'value': None
+        'value': value
     }
 
     return ('parameterized-object-assignment',
@@ -597,6 +690,28 @@ def convert_parameterized_object_assignment(_s, _l, tokens):
             converted_type)
 
 
+def is_object_class_reference(name):
+    return re.match(r'^[A-Z][A-Z0-9-]*$', name) is not None
+
+
+def convert_syntax_list(tokens):
+    syntax = []
+    stack = []
+
+    for token in tokens:
+        if token == '[':
+            stack.append(syntax)
+            syntax = []
+        elif token == ']':
+            optional_group = syntax
+            syntax = stack.pop()
+            syntax.append(optional_group)
+        elif token not in ['{', '}']:
+            syntax.append(token)
+
+    return syntax
+
+
 def convert_parameterized_object_class_assignment(_s, _l, tokens):
     members = []
 
@@ -606,6 +721,8 @@ def convert_parameterized_object_class_assignment(_s, _l, tokens):
 
             if isinstance(converted_member, Tokens):
                 converted_member = converted_member[0]
+            elif isinstance(converted_member, dict):
+                converted_member = convert_type(member[1])
         else:
             converted_member = {'type': 'OpenType'}
 
@@ -617,6 +734,12 @@ def convert_parameterized_object_class_assignment(_s, _l, tokens):
         'members': members
     }
 
+    tokens = tokens.asList()
+
+    if 'WITH SYNTAX' in tokens:
+        index = tokens.index('WITH SYNTAX')
+        converted_type['with-syntax'] = convert_syntax_list(tokens[index + 1:])
+
     return ('parameterized-object-class-assignment',
             tokens[0],
             converted_type)
@@ -624,16 +747,21 @@ def convert_parameterized_object_class_assignment(_s, _l, tokens):
 
 def convert_parameterized_type_assignment(_s, _l, tokens):
     tokens = tokens.asList()
-    converted_type = convert_type(tokens[3])
+    converted_type = convert_type(tokens[4])
 
     try:
-        tag = convert_tag(tokens[2])
+        tag = convert_tag(tokens[3])
     except ValueError:
         tag = None
 
     if tag:
         converted_type['tag'] = tag
 
+    if tokens[1]:
+        converted_type['parameters'] = [
+            parameter_tokens[-1] for parameter_tokens in tokens[1]
+        ]
+
     return ('parameterized-type-assignment',
             tokens[0],
             converted_type)
@@ -647,9 +775,16 @@ def convert_parameterized_value_assignment(_s, _l, tokens):
     elif isinstance(type_, dict):
         type_ = type_['type']
 
+    if is_object_class_reference(type_) and isinstance(tokens[2][0],
+                                                       ParseResults):
+        # An information object in defined syntax.
+        value = convert_object(tokens[2].asList())
+    else:
+        value = convert_value(tokens[2], type_)
+
     converted_type = {
         'type': type_,
-        'value': convert_value(tokens[2], type_)
+        'value': value
     }
 
     return ('parameterized-value-assignment',
@@ -919,6 +1054,9 @@ def create_grammar():
     parameter_list = Suppress(Optional(left_brace
                                        + delimitedList(parameter)
                                        + right_brace))
+    type_parameter_list = Group(Optional(Suppress(left_brace)
+                                         + delimitedList(Group(parameter))
+                                         + Suppress(right_brace)))
 
     # X.683: 9. Referencing parameterized definitions
     actual_parameter = Group(type_
@@ -1515,7 +1653,7 @@ def create_grammar():
     value_reference <<= Regex(r'[a-z][a-zA-Z0-9-]*')
     value_set <<= NoMatch().setName('"valueSet" not implemented')
     parameterized_type_assignment = (type_reference
-                                     + parameter_list
+                                     + type_parameter_list
                                      - assign
                                      - tag
                                      - type_)
@@ -1661,19 +1799,35 @@ def ignore_comments(string):
                   string)
 
 
-def parse_string(string):
-    """Parse given ASN.1 specification string and return a dictionary of
-    its contents.
+def split_modules(string):
+    """Split given specification string, with comments removed, at the
+    start of each module definition. Returns a list of parts, each a
+    tuple of the number of lines before it and its string.
 
-    >>> with open('foo.asn') as fin:
-    ...     foo = asn1tools.parse_string(fin.read())
+    """
+
+    parts = []
+    begin = 0
+    number_of_lines = 0
+    ends = [mo.start() for mo in RE_MODULE_DEFINITION.finditer(string)][1:]
+
+    for end in ends + [len(string)]:
+        part = string[begin:end]
+        parts.append((number_of_lines, part))
+        number_of_lines += part.count('\n')
+        begin = end
+
+    return parts
+
+
+def parse_specification(string):
+    """Parse given ASN.1 specification string, with comments removed.
 
     """
 
     grammar = create_grammar()
 
     try:
-        string = ignore_comments(string)
         tokens = grammar.parseString(string).asList()
     except (ParseException, ParseSyntaxException) as e:
         raise ParseError("Invalid ASN.1 syntax at line {}, column {}: '{}': {}.".format(
@@ -1685,10 +1839,133 @@ def parse_string(string):
     return tokens[0]
 
 
-def parse_files(filenames, encoding='utf-8'):
+def parse_part(part):
+    """Parse given part of a specification, a tuple of the name of its
+    file and a part returned by split_modules(). The part is padded
+    with newlines to report the line numbers of the file in parse
+    errors, which are prefixed by the filename.
+
+    """
+
+    filename, number_of_lines, string = part
+
+    try:
+        return parse_specification('\n' * number_of_lines + string)
+    except ParseError as e:
+        raise ParseError('{}: {}'.format(filename, e))
+
+
+def parse_parts(parts, jobs):
+    if jobs == 1 or len(parts) < 2:
+        return [parse_part(part) for part in parts]
+
+    # Only imported if needed as it is not part of Python 2.
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Start with the largest parts to finish as soon as possible.
+    order = sorted(range(len(parts)), key=lambda i: -len(parts[i][2]))
+    parsed = [None] * len(parts)
+
+    with ProcessPoolExecutor(jobs) as executor:
+        for i, specification in zip(order,
+                                    executor.map(parse_part,
+                                                 [parts[i] for i in order])):
+            parsed[i] = specification
+
+    return parsed
+
+
+def part_cache_key(part):
+    # Imported here as the package imports this module before defining
+    # its version.
+    from . import __version__
+
+    string = '{}\n{}'.format(__version__, part[2])
+
+    return hashlib.sha1(string.encode('utf-8')).hexdigest()
+
+
+class DirectoryCache(object):
+    """Parsed modules saved as pickle files in given directory.
+
+    """
+
+    def __init__(self, path):
+        self._path = path
+
+    def load(self, key):
+        try:
+            with open(os.path.join(self._path, key + '.pickle'), 'rb') as fin:
+                return pickle.load(fin)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def save(self, key, specification):
+        if not os.path.isdir(self._path):
+            os.makedirs(self._path)
+
+        path = os.path.join(self._path, key + '.pickle')
+        temporary_path = '{}.{}'.format(path, os.getpid())
+
+        with open(temporary_path, 'wb') as fout:
+            pickle.dump(specification, fout, pickle.HIGHEST_PROTOCOL)
+
+        try:
+            os.rename(temporary_path, path)
+        except OSError:
+            # Already saved by another process.
+            os.remove(temporary_path)
+
+
+class MemoryCache(object):
+    """Parsed modules kept in memory. They are pickled to return a new
+    copy from each load, as compiling modifies them.
+
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def load(self, key):
+        try:
+            return pickle.loads(self._entries[key])
+        except KeyError:
+            return None
+
+    def save(self, key, specification):
+        self._entries[key] = pickle.dumps(specification,
+                                          pickle.HIGHEST_PROTOCOL)
+
+
+def parse_string(string):
+    """Parse given ASN.1 specification string and return a dictionary of
+    its contents.
+
+    >>> with open('foo.asn') as fin:
+    ...     foo = asn1tools.parse_string(fin.read())
+
+    """
+
+    return parse_specification(ignore_comments(string))
+
+
+def read_file(filename, encoding):
+    if sys.version_info[0] < 3:
+        with open(filename, 'r') as fin:
+            return fin.read()
+    else:
+        with open(filename, 'r', encoding=encoding, errors='replace') as fin:
+            return fin.read()
+
+
+def parse_files(filenames, encoding='utf-8', jobs=1, cache=None):
     """Parse given ASN.1 specification file(s) and return a dictionary of
     its/their contents.
 
+    See :func:`asn1tools.parse_files()` for a description of
+    `jobs`. Modules are loaded from and saved in `cache`, a
+    DirectoryCache or MemoryCache object, if not None.
+
     >>> foo = asn1tools.parse_files('foo.asn')
 
     """
@@ -1696,16 +1973,35 @@ def parse_files(filenames, encoding='utf-8'):
     if isinstance(filenames, str):
         filenames = [filenames]
 
-    string = ''
+    parts = []
 
     for filename in filenames:
-        if sys.version_info[0] < 3:
-            with open(filename, 'r') as fin:
-                string += fin.read()
-                string += '\n'
-        else:
-            with open(filename, 'r', encoding=encoding, errors='replace') as fin:
-                string += fin.read()
-                string += '\n'
+        parts += [
+            (filename, ) + part
+            for part in split_modules(ignore_comments(read_file(filename,
+                                                                encoding)))
+        ]
 
-    return parse_string(string)
+    # Empty files are only an error if all files are empty.
+    parts = [part for part in parts if part[2].strip()] or parts
+
+    if cache is None:
+        parsed = parse_parts(parts, jobs)
+    else:
+        keys = [part_cache_key(part) for part in parts]
+        parsed = [cache.load(key) for key in keys]
+        missing = [i for i, specification in enumerate(parsed)
+                   if specification is None]
+
+        for i, specification in zip(missing,
+                                    parse_parts([parts[i] for i in missing],
+                                                jobs)):
+            cache.save(keys[i], specification)
+            parsed[i] = specification
+
+    specification = {}
+
+    for modules in parsed:
+        specification.update(modules)
+
+    return specification
@@ -0,0 +1,324 @@
+"""Per type profiling of encoding and decoding.
+
+The profiler replaces the encode() and decode() methods of each
+compiled type object with instrumented versions, stored as instance
+attributes that shadow the methods of the class. Disabling the
+profiler deletes them again, so there is no overhead when profiling
+is disabled.
+
+"""
+
+import json
+import time
+
+
+try:
+    perf_counter = time.perf_counter
+except AttributeError:
+    perf_counter = time.time
+
+
+# Codecs whose types encode to an Encoder and decode from a Decoder
+# (bits), and codecs whose types encode to a bytearray and decode
+# from an offset (bytes).
+BIT_CODECS = frozenset(['per', 'uper'])
+BYTE_CODECS = frozenset(['ber', 'der'])
+
+
+class Statistics(object):
+
+    __slots__ = ('calls', 'time', 'size')
+
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.0
+        self.size = 0
+
+    def add(self, time_, size):
+        self.calls += 1
+        self.time += time_
+        self.size += size
+
+    def as_dict(self):
+        return {
+            'calls': self.calls,
+            'time': self.time,
+            'size': self.size
+        }
+
+
+class TypeStatistics(object):
+
+    def __init__(self, type_name, size_unit):
+        self.type_name = type_name
+        self.size_unit = size_unit
+        self.encode = Statistics()
+        self.decode = Statistics()
+
+    def as_dict(self):
+        return {
+            'type': self.type_name,
+            'size-unit': self.size_unit,
+            'encode': self.encode.as_dict(),
+            'decode': self.decode.as_dict()
+        }
+
+
+def is_type(value):
+    return (hasattr(value, 'type_name')
+            and hasattr(value, 'name')
+            and hasattr(value, 'encode'))
+
+
+def iter_types(value):
+    """Yields all type objects in given attribute value, which may be
+    a type object or a container of type objects.
+
+    """
+
+    if is_type(value):
+        yield value
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            for type_ in iter_types(item):
+                yield type_
+    elif isinstance(value, dict):
+        for item in value.values():
+            for type_ in iter_types(item):
+                yield type_
+
+
+def codec_of(type_):
+    return type(type_).__module__.rsplit('.', 1)[-1]
+
+
+def instrument_bits(type_, statistics):
+    encode = type_.encode
+    decode = getattr(type_, 'decode', None)
+
+    def instrumented_encode(data, encoder):
+        number_of_bits = encoder.number_of_bits
+        start = perf_counter()
+
+        try:
+            return encode(data, encoder)
+        finally:
+            statistics.encode.add(perf_counter() - start,
+                                  encoder.number_of_bits - number_of_bits)
+
+    def instrumented_decode(decoder):
+        number_of_bits = decoder.number_of_bits
+        start = perf_counter()
+
+        try:
+            return decode(decoder)
+        finally:
+            statistics.decode.add(perf_counter() - start,
+                                  number_of_bits - decoder.number_of_bits)
+
+    return instrumented_encode, instrumented_decode
+
+
+def instrument_bytes(type_, statistics):
+    encode = type_.encode
+    decode = getattr(type_, 'decode', None)
+
+    def instrumented_encode(data, encoded):
+        offset = len(encoded)
+        start = perf_counter()
+
+        try:
+            return encode(data, encoded)
+        finally:
+            statistics.encode.add(perf_counter() - start,
+                                  len(encoded) - offset)
+
+    def instrumented_decode(data, offset):
+        start = perf_counter()
+        end_offset = offset
+
+        try:
+            decoded = decode(data, offset)
+            end_offset = decoded[1]
+
+            return decoded
+        finally:
+            statistics.decode.add(perf_counter() - start,
+                                  end_offset - offset)
+
+    return instrumented_encode, instrumented_decode
+
+
+def instrument(type_, statistics):
+    """Returns instrumented versions of the encode and decode methods of
+    given type object. The size is not recorded for the text codecs.
+
+    """
+
+    codec = codec_of(type_)
+
+    if codec in BIT_CODECS:
+        return instrument_bits(type_, statistics)
+    elif codec in BYTE_CODECS:
+        return instrument_bytes(type_, statistics)
+
+    encode = type_.encode
+    decode = getattr(type_, 'decode', None)
+
+    def instrumented_encode(*args):
+        start = perf_counter()
+
+        try:
+            return encode(*args)
+        finally:
+            statistics.encode.add(perf_counter() - start, 0)
+
+    def instrumented_decode(*args):
+        start = perf_counter()
+
+        try:
+            return decode(*args)
+        finally:
+            statistics.decode.add(perf_counter() - start, 0)
+
+    return instrumented_encode, instrumented_decode
+
+
+def size_unit_of(type_):
+    codec = codec_of(type_)
+
+    if codec in BIT_CODECS:
+        return 'bits'
+    elif codec in BYTE_CODECS:
+        return 'bytes'
+    else:
+        return None
+
+
+class Profiler(object):
+    """Records call counts, cumulative time and encoded size per type
+    and member path, for example ``'Question.id'``. Elements of SEQUENCE
+    OF and SET OF have the path of their container followed by
+    ``'[]'``.
+
+    Time is cumulative, that is, the time of a type includes the time
+    of its members.
+
+    """
+
+    def __init__(self, types):
+        self._types = types
+        self._statistics = {}
+        self._instrumented = []
+        self._bound = []
+        self._fixed = []
+
+    def enable(self):
+        self._statistics = {}
+        visited = set()
+
+        for name, compiled in self._types.items():
+            self._instrument(compiled.type, name, visited)
+
+        # Some types bind methods of their members when created.
+        for type_ in self._bound:
+            type_.update_members_coders()
+
+    def disable(self):
+        for type_ in self._instrumented:
+            for attribute in ['encode', 'decode', 'identity']:
+                if attribute in vars(type_):
+                    delattr(type_, attribute)
+
+        for type_, number_of_bits in self._fixed:
+            type_.fixed_number_of_bits = number_of_bits
+
+        for type_ in self._bound:
+            type_.update_members_coders()
+
+        self._instrumented = []
+        self._bound = []
+        self._fixed = []
+
+    def _instrument(self, type_, path, visited):
+        if id(type_) in visited:
+            return
+
+        visited.add(id(type_))
+
+        if path not in self._statistics:
+            statistics = TypeStatistics(type_.type_name, size_unit_of(type_))
+            self._statistics[path] = statistics
+            encode, decode = instrument(type_, statistics)
+            type_.encode = encode
+
+            if hasattr(type_, 'decode'):
+                type_.decode = decode
+
+            # Identity types are skipped by their containers.
+            if getattr(type_, 'identity', False):
+                type_.identity = False
+
+            # Fixed size types are written and read in bulk by their
+            # containers.
+            number_of_bits = getattr(type_, 'fixed_number_of_bits', None)
+
+            if number_of_bits is not None:
+                self._fixed.append((type_, number_of_bits))
+                type_.fixed_number_of_bits = None
+
+            self._instrumented.append(type_)
+
+        if hasattr(type_, 'update_members_coders'):
+            self._bound.append(type_)
+
+        for value in list(vars(type_).values()):
+            for child in iter_types(value):
+                # Tags and other wrappers have the same name as the
+                # type they wrap, and share its path.
+                if child.name == type_.name:
+                    child_path = path
+                elif child.name:
+                    child_path = path + '.' + child.name
+                else:
+                    child_path = path + '[]'
+
+                self._instrument(child, child_path, visited)
+
+    def clear(self):
+        for statistics in self._statistics.values():
+            statistics.encode = Statistics()
+            statistics.decode = Statistics()
+
+    def as_dict(self):
+        """Returns the statistics as a dictionary of type and member paths
+        to dictionaries of type name, size unit and encode and decode
+        statistics.
+
+        """
+
+        return {
+            path: statistics.as_dict()
+            for path, statistics in self._statistics.items()
+            if statistics.encode.calls > 0 or statistics.decode.calls > 0
+        }
+
+    def as_json(self, indent=None):
+        return json.dumps(self.as_dict(), indent=indent, sort_keys=True)
+
+    def top(self, number_of_types, key='time'):
+        """Returns a list of (path, statistics) tuples of the
+        `number_of_types` paths with the highest total encode and
+        decode `key`, where `key` is ``'calls'``, ``'time'`` or
+        ``'size'``.
+
+        """
+
+        def total(item):
+            statistics = item[1]
+
+            return statistics['encode'][key] + statistics['decode'][key]
+
+        return sorted(self.as_dict().items(),
+                      key=total,
+                      reverse=True)[:number_of_types]
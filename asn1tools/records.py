@@ -0,0 +1,233 @@
+"""Record classes for decoded SEQUENCE and SET values.
+
+A record class with ``__slots__`` is created per compiled SEQUENCE and
+SET type, and set as the type's ``record_class``, which the decoders
+use to create the decoded value. Records take a fraction of the
+memory of dictionaries, and can be encoded as they are, since they
+support the read only dictionary methods used by the encoders.
+
+"""
+
+import keyword
+
+from .errors import CompileError
+from .codecs.compiler import flatten
+from .profiler import iter_types
+
+
+class Record(object):
+    """Base class of all record classes. Members are read and written as
+    attributes, with dashes replaced by underscores and an underscore
+    appended to Python keywords and names of attributes of this
+    class, for example ``keys_``, or by their ASN.1 names with the
+    dictionary methods. Absent optional members are unset attributes.
+
+    """
+
+    __slots__ = ()
+
+    # Tuple of (member name, attribute name) tuples, in member order.
+    _fields = ()
+
+    # Member name to attribute name dictionary.
+    _attributes = {}
+
+    def __init__(self, values=None):
+        if values is None:
+            return
+
+        attributes = self._attributes
+
+        for name, value in values.items():
+            setattr(self, attributes[name], value)
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, self._attributes[name])
+        except AttributeError:
+            raise KeyError(name)
+
+    def __contains__(self, name):
+        attribute = self._attributes.get(name)
+
+        return attribute is not None and hasattr(self, attribute)
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return [name for name, attribute in self._fields if hasattr(self, attribute)]
+
+    def values(self):
+        return [self[name] for name in self.keys()]
+
+    def items(self):
+        return [(name, self[name]) for name in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return dict(self.items()) == dict(other.items())
+
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+
+        if equal is NotImplemented:
+            return equal
+
+        return not equal
+
+    __hash__ = None
+
+    def copy(self):
+        return type(self)(self)
+
+    def to_dict(self):
+        """Returns the record as a dictionary, with all records in its
+        members converted to dictionaries as well.
+
+        """
+
+        return {name: to_dict(value) for name, value in self.items()}
+
+    def __repr__(self):
+        return '{}({})'.format(
+            type(self).__name__,
+            ', '.join(['{}={!r}'.format(attribute, getattr(self, attribute))
+                       for _, attribute in self._fields
+                       if hasattr(self, attribute)]))
+
+
+def to_dict(value):
+    """Returns given decoded value with all records converted to
+    dictionaries.
+
+    """
+
+    if isinstance(value, Record):
+        return value.to_dict()
+    elif isinstance(value, list):
+        return [to_dict(item) for item in value]
+    elif isinstance(value, tuple):
+        return tuple([to_dict(item) for item in value])
+    else:
+        return value
+
+
+def attribute_name(name):
+    name = name.replace('-', '_')
+
+    if keyword.iskeyword(name):
+        name += '_'
+
+    return name
+
+
+def member_attribute_name(name):
+    name = attribute_name(name)
+
+    # Members must not replace the methods of the record.
+    if hasattr(Record, name):
+        name += '_'
+
+    return name
+
+
+def create_record_class(name, member_names):
+    fields = tuple([
+        (member_name, member_attribute_name(member_name))
+        for member_name in member_names
+    ])
+    names = {}
+
+    for member_name, attribute in fields:
+        if attribute in names:
+            raise CompileError(
+                "Members '{}' and '{}' of type '{}' have the same record "
+                "attribute name '{}'.".format(names[attribute],
+                                              member_name,
+                                              name,
+                                              attribute))
+
+        names[attribute] = member_name
+
+    namespace = {
+        '__slots__': tuple([attribute for _, attribute in fields]),
+        '_fields': fields,
+        '_attributes': dict(fields)
+    }
+
+    return type(attribute_name(name), (Record, ), namespace)
+
+
+def is_addition_group(type_):
+    # PER and UPER extension addition groups are decoded as a SEQUENCE
+    # whose members are added to the SEQUENCE or SET containing it.
+    return type(type_).__name__ == 'AdditionGroup'
+
+
+def get_member_names(type_):
+    if hasattr(type_, 'members'):
+        members = type_.members
+    else:
+        members = type_.root_members + flatten(type_.additions or [])
+
+    names = []
+
+    for member in members:
+        if is_addition_group(member):
+            names.extend(get_member_names(member))
+        else:
+            names.append(member.name)
+
+    return names
+
+
+def set_record_classes(types, record_classes=None):
+    """Create a record class for each SEQUENCE and SET type found in given
+    dictionary of compiled types, and their members. Types with the
+    same name and members share the record class, also with types
+    of previous calls given the same dictionary `record_classes`.
+
+    """
+
+    if record_classes is None:
+        record_classes = {}
+
+    visited = set()
+
+    def set_record_class(type_, name):
+        if id(type_) in visited:
+            return
+
+        visited.add(id(type_))
+
+        # Elements of SEQUENCE OF and SET OF are named after their
+        # container.
+        if type_.name:
+            name = type_.name
+
+        if hasattr(type_, 'record_class') and not is_addition_group(type_):
+            key = (name, tuple(get_member_names(type_)))
+
+            if key not in record_classes:
+                record_classes[key] = create_record_class(*key)
+
+            type_.record_class = record_classes[key]
+
+        for value in list(vars(type_).values()):
+            for child in iter_types(value):
+                set_record_class(child, name)
+
+    for name, compiled in types.items():
+        set_record_class(compiled.type, name)
@@ -0,0 +1,252 @@
+"""Reload of ASN.1 specification files when they are modified.
+
+"""
+
+import os
+import pickle
+import logging
+import threading
+
+from .compiler import Specification
+from .compiler import compile_dict
+from .compiler import import_codec
+from .compiler import _compile_modules
+from .compiler import DEFAULT_DECODE_CACHE_BYTES
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+def affected_modules(modules, changed):
+    """Returns the names of given changed modules and all modules
+    importing from them, directly or indirectly.
+
+    """
+
+    affected = set(changed)
+
+    while True:
+        importing = set([
+            module_name
+            for module_name, module in modules.items()
+            if module_name not in affected and affected & set(module['imports'])
+        ])
+
+        if not importing:
+            return affected
+
+        affected |= importing
+
+
+class SpecificationWatcher(object):
+    """Compiles given ASN.1 specification file(s) `filenames` and
+    compiles them again when modified, checked every `interval`
+    seconds by a background thread once :meth:`.start` is called. See
+    :func:`~asn1tools.compile_dict()` for a description of the other
+    arguments.
+
+    The watcher has the same attributes and methods as the
+    :class:`~asn1tools.compiler.Specification` object of the latest
+    compilation, which is replaced in one step when reloaded. Calls
+    already in progress complete with the previous object, and are
+    never blocked.
+
+    Only modified modules are parsed again. Modified modules and
+    modules importing from them, directly or indirectly, are compiled
+    again, and their types removed from the decode cache. The
+    compiled types of other modules are reused. If compiling fails,
+    the error is logged and the previous specification is kept until
+    the files are modified again.
+
+    >>> foo = asn1tools.SpecificationWatcher('foo.asn', 'uper')
+    >>> foo.start()
+    >>> foo.decode('Question', b'\\x01\\x01\\x09\\x93\\xcd\\x03\\x15\\x6c\\x5e\\xb3\\x7e')
+    {'id': 1, 'question': 'Is 1+1=3?'}
+    >>> foo.stop()
+
+    """
+
+    def __init__(self,
+                 filenames,
+                 codec='ber',
+                 any_defined_by_choices=None,
+                 decode_cache_size=0,
+                 decode_cache_bytes=DEFAULT_DECODE_CACHE_BYTES,
+                 container='dict',
+                 interval=1.0):
+        if isinstance(filenames, str):
+            filenames = [filenames]
+
+        self._filenames = filenames
+        self._codec = codec
+        self._any_defined_by_choices = any_defined_by_choices
+        self._decode_cache_size = decode_cache_size
+        self._decode_cache_bytes = decode_cache_bytes
+        self._container = container
+        self._interval = interval
+        self._parse_cache = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._stamps = self._read_stamps()
+        self._parsed, self._specification = self._compile()
+
+    @property
+    def specification(self):
+        """The :class:`~asn1tools.compiler.Specification` object of the latest
+        compilation.
+
+        """
+
+        return self._specification
+
+    def __getattr__(self, name):
+        if name == '_specification':
+            raise AttributeError(name)
+
+        return getattr(self._specification, name)
+
+    def _read_stamps(self):
+        stamps = []
+
+        for filename in self._filenames:
+            try:
+                stat = os.stat(filename)
+                stamps.append((stat.st_mtime, stat.st_size))
+            except OSError:
+                stamps.append(None)
+
+        return stamps
+
+    def _parse(self):
+        # The parser, and thereby pyparsing, is imported on first use.
+        from . import parser
+
+        if self._parse_cache is None:
+            self._parse_cache = parser.MemoryCache()
+
+        return parser.parse_files(self._filenames, cache=self._parse_cache)
+
+    def _compile(self):
+        specification = self._parse()
+
+        # Compiling modifies the dictionary, which is compared to the
+        # next parsed dictionary to find modified modules.
+        parsed = pickle.loads(pickle.dumps(specification,
+                                           pickle.HIGHEST_PROTOCOL))
+        compiled = compile_dict(specification,
+                                self._codec,
+                                self._any_defined_by_choices,
+                                self._decode_cache_size,
+                                self._decode_cache_bytes,
+                                self._container)
+
+        return parsed, compiled
+
+    def _recompile(self, specification, affected):
+        """Returns given parsed specification compiled, reusing the compiled
+        types of not affected modules.
+
+        """
+
+        codec = import_codec(self._codec)
+        modules = _compile_modules(
+            specification,
+            codec,
+            self._any_defined_by_choices,
+            self._container,
+            {
+                module_name: types
+                for module_name, types in self._specification.modules.items()
+                if module_name not in affected and module_name in specification
+            })
+
+        return Specification(modules,
+                             codec.decode_length,
+                             self._decode_cache_size,
+                             self._decode_cache_bytes)
+
+    def reload(self):
+        """Compile the specification again if any of its files were modified
+        since the last check. Returns ``True`` if the specification
+        was replaced, otherwise ``False``.
+
+        """
+
+        with self._lock:
+            stamps = self._read_stamps()
+
+            if stamps == self._stamps:
+                return False
+
+            self._stamps = stamps
+
+            try:
+                specification = self._parse()
+                parsed = pickle.loads(pickle.dumps(specification,
+                                                   pickle.HIGHEST_PROTOCOL))
+                changed = set([
+                    module_name
+                    for module_name in set(parsed) | set(self._parsed)
+                    if parsed.get(module_name) != self._parsed.get(module_name)
+                ])
+
+                if not changed:
+                    return False
+
+                affected = (affected_modules(parsed, changed)
+                            | affected_modules(self._parsed, changed))
+                compiled = self._recompile(specification, affected)
+            except Exception as e:
+                LOGGER.warning("Failed to reload '%s': %s",
+                               "', '".join(self._filenames),
+                               e)
+
+                return False
+
+            self._keep_decode_cache(compiled, affected)
+            self._parsed = parsed
+            self._specification = compiled
+
+            return True
+
+    def _keep_decode_cache(self, specification, affected):
+        decode_cache = self._specification._decode_cache
+
+        if decode_cache is None:
+            return
+
+        names = set()
+
+        for modules in [self._specification.modules, specification.modules]:
+            for module_name in affected:
+                names.update(modules.get(module_name, {}))
+
+        # A copy, as calls in progress may still add entries to the
+        # previous cache.
+        specification._decode_cache = decode_cache.copy(names)
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            self.reload()
+
+    def start(self):
+        """Start checking for modified files in a background thread.
+
+        """
+
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread started by :meth:`.start`.
+
+        """
+
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
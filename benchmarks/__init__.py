@@ -0,0 +1,13 @@
+"""Benchmarks of parsing, compiling, encoding and decoding of the
+ASN.1 specifications in tests/files and benchmarks/files, with all
+codecs, and of generating random values and transcoding between
+codecs.
+
+Run the benchmarks and save the results as JSON, and later compare
+two results to find regressions:
+
+$ python -m benchmarks run -o before.json
+$ python -m benchmarks run -o after.json
+$ python -m benchmarks compare before.json after.json
+
+"""
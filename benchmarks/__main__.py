@@ -0,0 +1,109 @@
+from __future__ import print_function
+
+import sys
+import json
+import fnmatch
+import argparse
+
+from .specifications import find_all_specifications
+from .suite import CODECS
+from .suite import run
+from .compare import compare
+from .compare import print_changes
+
+
+def _do_run(args):
+    specifications = find_all_specifications()
+
+    if args.specification:
+        specifications = type(specifications)(
+            (name, filenames)
+            for name, filenames in specifications.items()
+            if any([fnmatch.fnmatch(name, pattern)
+                    for pattern in args.specification]))
+
+    results = run(specifications,
+                  args.codec or CODECS,
+                  args.iterations,
+                  args.repeat,
+                  not args.no_memory)
+
+    with open(args.output, 'w') as fout:
+        json.dump(results, fout, indent=4, sort_keys=True)
+
+    print('Results written to {}.'.format(args.output))
+
+
+def _do_compare(args):
+    with open(args.before, 'r') as fin:
+        before = json.load(fin)
+
+    with open(args.after, 'r') as fin:
+        after = json.load(fin)
+
+    changes, regressions = compare(before, after, args.threshold)
+    print_changes(changes, regressions)
+
+    if regressions:
+        sys.exit(1)
+
+
+def _main():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='asn1tools benchmarks.')
+
+    subparsers = parser.add_subparsers(title='subcommands',
+                                       dest='subcommand')
+    subparsers.required = True
+
+    subparser = subparsers.add_parser(
+        'run',
+        description=('Benchmark parsing, compiling, encoding, decoding, '
+                     'generating and transcoding of the specifications in '
+                     'tests/files and benchmarks/files.'))
+    subparser.add_argument('-s', '--specification',
+                           action='append',
+                           help=('Benchmark specifications matching given glob '
+                                 'pattern, for example 3gpp/*. May be given '
+                                 'more than once (default: all).'))
+    subparser.add_argument('-c', '--codec',
+                           action='append',
+                           choices=CODECS,
+                           help='Codec to benchmark. May be given more than '
+                           'once (default: all).')
+    subparser.add_argument('-n', '--iterations',
+                           type=int,
+                           default=1000,
+                           help=('Number of times to encode and decode each '
+                                 'sample (default: 1000).'))
+    subparser.add_argument('-r', '--repeat',
+                           type=int,
+                           default=3,
+                           help=('Number of times to repeat each measurement, '
+                                 'keeping the shortest time (default: 3).'))
+    subparser.add_argument('--no-memory',
+                           action='store_true',
+                           help='Do not measure peak memory usage.')
+    subparser.add_argument('-o', '--output',
+                           default='benchmarks.json',
+                           help='Output file (default: benchmarks.json).')
+    subparser.set_defaults(func=_do_run)
+
+    subparser = subparsers.add_parser(
+        'compare',
+        description=('Compare two results and exit with a non-zero status if '
+                     'any metric regressed more than the threshold.'))
+    subparser.add_argument('-t', '--threshold',
+                           type=float,
+                           default=10.0,
+                           help='Regression threshold in percent (default: 10).')
+    subparser.add_argument('before', help='Results before.')
+    subparser.add_argument('after', help='Results after.')
+    subparser.set_defaults(func=_do_compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+_main()
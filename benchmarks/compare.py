@@ -0,0 +1,88 @@
+"""Compare two benchmark results.
+
+"""
+
+from __future__ import print_function
+
+
+# Metrics where higher is better. Lower is better for all others.
+HIGHER_IS_BETTER = ['messages-per-second', 'bytes-per-second']
+
+
+def flatten(results, prefix=''):
+    """Returns a dictionary of metric paths, for example
+    ``'3gpp/rrc_8_6_0/codecs/uper/compile/seconds'``, to values.
+
+    """
+
+    flattened = {}
+
+    for key, value in results.items():
+        path = prefix + key
+
+        if isinstance(value, dict):
+            flattened.update(flatten(value, path + '/'))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flattened[path] = value
+
+    return flattened
+
+
+def change(metric, before, after):
+    """Returns the change of given metric in percent, where a positive
+    change is an improvement.
+
+    """
+
+    if before == 0 or after == 0:
+        return 0.0
+
+    if metric in HIGHER_IS_BETTER:
+        return 100.0 * (after - before) / before
+    else:
+        return 100.0 * (before - after) / after
+
+
+def compare(before, after, threshold):
+    """Compare given benchmark results and return a list of (path,
+    before, after, change) tuples, sorted by change, and a list of
+    paths of regressions worse than `threshold` percent.
+
+    """
+
+    before = flatten(before['specifications'])
+    after = flatten(after['specifications'])
+    changes = []
+    regressions = []
+
+    for path in sorted(set(before) & set(after)):
+        metric = path.rsplit('/', 1)[-1]
+        percent = change(metric, before[path], after[path])
+        changes.append((path, before[path], after[path], percent))
+
+        if percent < -threshold:
+            regressions.append(path)
+
+    changes.sort(key=lambda item: item[3])
+
+    return changes, regressions
+
+
+def print_changes(changes, regressions):
+    print('{:80s} {:>14s} {:>14s} {:>9s}'.format('METRIC',
+                                                 'BEFORE',
+                                                 'AFTER',
+                                                 'CHANGE'))
+
+    for path, before, after, percent in changes:
+        print('{:80s} {:14.6g} {:14.6g} {:+8.1f}%'.format(path,
+                                                          before,
+                                                          after,
+                                                          percent))
+
+    print()
+
+    if regressions:
+        print('{} regression(s).'.format(len(regressions)))
+    else:
+        print('No regressions.')
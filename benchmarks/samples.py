@@ -0,0 +1,349 @@
+"""Decoded samples per specification, used to benchmark encoding and
+decoding. The keys are specification names, as found by
+:func:`benchmarks.specifications.find_specifications()`.
+Specifications without samples below are given samples generated
+with a fixed seed.
+
+"""
+
+import random
+
+
+QUESTION = {
+    'id': 1,
+    'question': 'Is 1+1=3?'
+}
+
+PERSONNEL_RECORD = {
+    'name': {
+        'givenName': 'John',
+        'initial': 'P',
+        'familyName': 'Smith'
+    },
+    'title': 'Director',
+    'number': 51,
+    'dateOfHire': '19710917',
+    'nameOfSpouse': {
+        'givenName': 'Mary',
+        'initial': 'T',
+        'familyName': 'Smith'
+    },
+    'children': [
+        {
+            'name': {
+                'givenName': 'Ralph',
+                'initial': 'T',
+                'familyName': 'Smith'
+            },
+            'dateOfBirth': '19571111'
+        },
+        {
+            'name': {
+                'givenName': 'Susan',
+                'initial': 'B',
+                'familyName': 'Jones'
+            },
+            'dateOfBirth': '19590717'
+        }
+    ]
+}
+
+SNMP_MESSAGE = {
+    'version': 0,
+    'community': b'public',
+    'data': (
+        'set-request',
+        {
+            'request-id': 60,
+            'error-status': 0,
+            'error-index': 0,
+            'variable-bindings': [
+                {
+                    'name': '1.3.6.1.4.1.253.8.51.10.2.1.7.10.14130101',
+                    'value': ('simple', ('string', b'172.31.19.73'))
+                },
+                {
+                    'name': '1.3.6.1.4.1.253.8.51.10.2.1.5.10.14130400',
+                    'value': ('simple', ('number', 2))
+                },
+                {
+                    'name': '1.3.6.1.4.1.253.8.51.10.2.1.7.10.14130102',
+                    'value': ('simple', ('string', b'255.255.255.0'))
+                },
+                {
+                    'name': '1.3.6.1.4.1.253.8.51.10.2.1.7.10.14130104',
+                    'value': ('simple', ('string', b'172.31.19.2'))
+                }
+            ]
+        }
+    )
+}
+
+SYSTEM_INFORMATION_BLOCK_TYPE_2 = {
+    'ac-BarringInfo': {
+        'ac-BarringForEmergency': True,
+        'ac-BarringForMO-Data': {
+            'ac-BarringFactor': 'p95',
+            'ac-BarringTime': 's128',
+            'ac-BarringForSpecialAC': (b'\xf0', 5)
+        }
+    },
+    'radioResourceConfigCommon': {
+        'rach-ConfigCommon': {
+            'preambleInfo': {
+                'numberOfRA-Preambles': 'n24',
+                'preamblesGroupAConfig': {
+                    'sizeOfRA-PreamblesGroupA': 'n28',
+                    'messageSizeGroupA': 'b144',
+                    'messagePowerOffsetGroupB': 'minusinfinity'
+                }
+            },
+            'powerRampingParameters': {
+                'powerRampingStep': 'dB0',
+                'preambleInitialReceivedTargetPower': 'dBm-102'
+            },
+            'ra-SupervisionInfo': {
+                'preambleTransMax': 'n8',
+                'ra-ResponseWindowSize': 'sf6',
+                'mac-ContentionResolutionTimer': 'sf48'
+            },
+            'maxHARQ-Msg3Tx': 8
+        },
+        'bcch-Config': {
+            'modificationPeriodCoeff': 'n2'
+        },
+        'pcch-Config': {
+            'defaultPagingCycle': 'rf256',
+            'nB': 'twoT'
+        },
+        'prach-Config': {
+            'rootSequenceIndex': 836,
+            'prach-ConfigInfo': {
+                'prach-ConfigIndex': 33,
+                'highSpeedFlag': False,
+                'zeroCorrelationZoneConfig': 10,
+                'prach-FreqOffset': 64
+            }
+        },
+        'pdsch-ConfigCommon': {
+            'referenceSignalPower': -60,
+            'p-b': 2
+        },
+        'pusch-ConfigCommon': {
+            'pusch-ConfigBasic': {
+                'n-SB': 1,
+                'hoppingMode': 'interSubFrame',
+                'pusch-HoppingOffset': 10,
+                'enable64QAM': False
+            },
+            'ul-ReferenceSignalsPUSCH': {
+                'groupHoppingEnabled': True,
+                'groupAssignmentPUSCH': 22,
+                'sequenceHoppingEnabled': False,
+                'cyclicShift': 5
+            }
+        },
+        'pucch-ConfigCommon': {
+            'deltaPUCCH-Shift': 'ds1',
+            'nRB-CQI': 98,
+            'nCS-AN': 4,
+            'n1PUCCH-AN': 2047
+        },
+        'soundingRS-UL-ConfigCommon': (
+            'setup',
+            {
+                'srs-BandwidthConfig': 'bw0',
+                'srs-SubframeConfig': 'sc4',
+                'ackNackSRS-SimultaneousTransmission': True
+            }),
+        'uplinkPowerControlCommon': {
+            'p0-NominalPUSCH': -126,
+            'alpha': 'al0',
+            'p0-NominalPUCCH': -127,
+            'deltaFList-PUCCH': {
+                'deltaF-PUCCH-Format1': 'deltaF-2',
+                'deltaF-PUCCH-Format1b': 'deltaF1',
+                'deltaF-PUCCH-Format2': 'deltaF0',
+                'deltaF-PUCCH-Format2a': 'deltaF-2',
+                'deltaF-PUCCH-Format2b': 'deltaF0'
+            },
+            'deltaPreambleMsg3': -1
+        },
+        'ul-CyclicPrefixLength': 'len1'
+    },
+    'ue-TimersAndConstants': {
+        't300': 'ms100',
+        't301': 'ms200',
+        't310': 'ms50',
+        'n310': 'n2',
+        't311': 'ms30000',
+        'n311': 'n2'
+    },
+    'freqInfo': {
+        'additionalSpectrumEmission': 3
+    },
+    'timeAlignmentTimerCommon': 'sf500'
+}
+
+BCCH_DL_SCH_MESSAGE = {
+    'message': (
+        'c1',
+        (
+            'systemInformation',
+            {
+                'criticalExtensions': (
+                    'systemInformation-r8',
+                    {
+                        'sib-TypeAndInfo': [
+                            ('sib2', SYSTEM_INFORMATION_BLOCK_TYPE_2),
+                            ('sib4', {}),
+                            ('sib6', {'t-ReselectionUTRA': 3}),
+                            ('sib7', {'t-ReselectionGERAN': 3}),
+                            ('sib9', {'hnb-Name': b'4'}),
+                            (
+                                'sib3',
+                                {
+                                    'cellReselectionInfoCommon': {
+                                        'q-Hyst': 'dB0',
+                                        'speedStateReselectionPars': {
+                                            'mobilityStateParameters': {
+                                                't-Evaluation': 's180',
+                                                't-HystNormal': 's180',
+                                                'n-CellChangeMedium': 1,
+                                                'n-CellChangeHigh': 16
+                                            },
+                                            'q-HystSF': {
+                                                'sf-Medium': 'dB-6',
+                                                'sf-High': 'dB-4'
+                                            }
+                                        }
+                                    },
+                                    'cellReselectionServingFreqInfo': {
+                                        'threshServingLow': 7,
+                                        'cellReselectionPriority': 3
+                                    },
+                                    'intraFreqCellReselectionInfo': {
+                                        'q-RxLevMin': -33,
+                                        's-IntraSearch': 0,
+                                        'presenceAntennaPort1': False,
+                                        'neighCellConfig': (b'\x80', 2),
+                                        't-ReselectionEUTRA': 4
+                                    }
+                                }
+                            )
+                        ]
+                    }
+                )
+            }
+        )
+    )
+}
+
+# SEQUENCE OF with fixed size elements, encoded and decoded in bulk by
+# the PER codecs.
+_randomizer = random.Random(0)
+
+INTEGERS = [_randomizer.randint(-10, 100) for _ in range(1024)]
+
+BOOLEANS = [_randomizer.choice([True, False]) for _ in range(1024)]
+
+ENUMERATEDS = [_randomizer.choice('abcde') for _ in range(1024)]
+
+SAMPLES = {
+    'foo': [
+        ('Question', QUESTION)
+    ],
+    'x691_a1': [
+        ('PersonnelRecord', PERSONNEL_RECORD)
+    ],
+    'ietf/rfc1157': [
+        ('Message', SNMP_MESSAGE)
+    ],
+    '3gpp/rrc_8_6_0': [
+        ('BCCH-DL-SCH-Message', BCCH_DL_SCH_MESSAGE)
+    ],
+    'sequence_of': [
+        ('Integers', INTEGERS),
+        ('Booleans', BOOLEANS),
+        ('Enumerateds', ENUMERATEDS)
+    ]
+}
+
+# The maximum number of types per specification to generate samples
+# of.
+NUMBER_OF_GENERATED_SAMPLES = 3
+
+# The number of values to generate of a type before skipping it, as
+# not all generated values can be encoded.
+NUMBER_OF_GENERATE_ATTEMPTS = 10
+
+
+def add_referenced_types(value, referenced):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == 'type':
+                referenced.add(item)
+            else:
+                add_referenced_types(item, referenced)
+    elif isinstance(value, list):
+        for item in value:
+            add_referenced_types(item, referenced)
+
+
+def find_message_types(parsed):
+    """Returns the names of all types in given parsed specification
+    that are not referenced by any other type, in alphabetical
+    order. Those are usually the messages of the specification.
+
+    """
+
+    types = set()
+    referenced = set()
+
+    for module in parsed.values():
+        for type_name, type_descriptor in module['types'].items():
+            types.add(type_name)
+            add_referenced_types(type_descriptor, referenced)
+
+    return sorted(types - referenced)
+
+
+def generate_samples(spec, parsed, number=NUMBER_OF_GENERATED_SAMPLES):
+    """Returns up to `number` samples of the message types of given
+    parsed specification, generated with a fixed seed. Types whose
+    values cannot be generated or encoded by given compiled
+    specification are skipped.
+
+    """
+
+    randomizer = random.Random(0)
+    samples = []
+
+    for type_name in find_message_types(parsed):
+        if len(samples) == number:
+            break
+
+        for _ in range(NUMBER_OF_GENERATE_ATTEMPTS):
+            try:
+                decoded = spec.generate(type_name, randomizer)
+                spec.encode(type_name, decoded)
+            except Exception:
+                continue
+
+            samples.append((type_name, decoded))
+            break
+
+    return samples
+
+
+def get_samples(name, spec, parsed):
+    """Returns the samples of given specification `name`, generated
+    with given compiled specification `spec` if not listed in
+    :data:`SAMPLES`.
+
+    """
+
+    if name in SAMPLES:
+        return SAMPLES[name]
+
+    return generate_samples(spec, parsed)
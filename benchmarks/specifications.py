@@ -0,0 +1,109 @@
+"""Find the specifications to benchmark.
+
+"""
+
+import os
+import re
+from collections import OrderedDict
+
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+TESTS_FILES_DIR = os.path.join(SCRIPT_DIR, '..', 'tests', 'files')
+BENCHMARKS_FILES_DIR = os.path.join(SCRIPT_DIR, 'files')
+
+RE_COMMENT = re.compile(r'--.*?(--|$)', re.MULTILINE)
+RE_MODULE = re.compile(r'^\s*([A-Za-z][\w-]*)\s*(?:\{[^}]*\})?\s*DEFINITIONS\b',
+                       re.MULTILINE)
+RE_IMPORTS = re.compile(r'\bIMPORTS\b(.*?);', re.DOTALL)
+RE_FROM = re.compile(r'\bFROM\s+([A-Za-z][\w-]*)')
+
+
+def read_modules(filename):
+    """Returns a tuple of the names of the modules defined in, and the
+    modules imported by, given specification file.
+
+    """
+
+    with open(filename, 'r') as fin:
+        string = RE_COMMENT.sub('', fin.read())
+
+    defined = RE_MODULE.findall(string)
+    imported = []
+
+    for imports in RE_IMPORTS.findall(string):
+        imported += RE_FROM.findall(imports)
+
+    return defined, imported
+
+
+def find_asn_files(directory):
+    filenames = []
+
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+
+        for filename in sorted(files):
+            if filename.endswith('.asn'):
+                filenames.append(os.path.join(root, filename))
+
+    return filenames
+
+
+def find_specifications(directory=TESTS_FILES_DIR, parse_results_only=True):
+    """Returns an ordered dictionary of specification names to lists of
+    files to parse. A specification is an .asn file, with a matching
+    .py file of expected parse results if `parse_results_only` is
+    True, and its name is the path relative to `directory` without
+    extension, for example ``'3gpp/rrc_8_6_0'``. Files defining
+    modules imported by the specification are added to its list of
+    files.
+
+    """
+
+    filenames = find_asn_files(directory)
+    modules = {}
+    module_files = {}
+
+    for filename in filenames:
+        modules[filename] = read_modules(filename)
+
+        for module_name in modules[filename][0]:
+            module_files.setdefault(module_name, filename)
+
+    specifications = OrderedDict()
+
+    for filename in filenames:
+        if parse_results_only and not os.path.exists(filename[:-4] + '.py'):
+            continue
+
+        name = os.path.relpath(filename, directory)[:-4].replace(os.sep, '/')
+        files = [filename]
+        defined = set(modules[filename][0])
+        index = 0
+
+        while index < len(files):
+            for module_name in modules[files[index]][1]:
+                if module_name in defined or module_name not in module_files:
+                    continue
+
+                module_filename = module_files[module_name]
+                files.append(module_filename)
+                defined.update(modules[module_filename][0])
+
+            index += 1
+
+        specifications[name] = files
+
+    return specifications
+
+
+def find_all_specifications():
+    """Returns the specifications in tests/files, followed by those only
+    used by the benchmarks, in benchmarks/files.
+
+    """
+
+    specifications = find_specifications()
+    specifications.update(find_specifications(BENCHMARKS_FILES_DIR, False))
+
+    return specifications
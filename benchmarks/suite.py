@@ -0,0 +1,335 @@
+"""Run the benchmarks.
+
+"""
+
+from __future__ import print_function
+
+import sys
+import gc
+import timeit
+import random
+import platform
+from copy import deepcopy
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+import asn1tools
+
+from .samples import SAMPLES
+from .samples import get_samples
+
+
+CODECS = ['ber', 'der', 'gser', 'jer', 'per', 'uper', 'xer']
+
+# Codecs without a decoder.
+ENCODE_ONLY_CODECS = ['gser']
+
+# Codec pairs to transcode between, if both codecs are benchmarked.
+TRANSCODINGS = [('per', 'ber'), ('uper', 'ber'), ('ber', 'jer')]
+
+
+def measure_peak_memory(function):
+    """Returns the peak memory usage in bytes while calling `function`,
+    or None if tracemalloc is not available.
+
+    """
+
+    if tracemalloc is None:
+        return None
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        function()
+
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_retained_memory(function):
+    """Returns the memory in bytes still allocated after calling
+    `function`, while its return value is kept, or None if
+    tracemalloc is not available.
+
+    """
+
+    if tracemalloc is None:
+        return None
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        # Keep the value until the memory is measured.
+        value = function()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    del value
+
+    return retained
+
+
+def measure(function, repeat, memory):
+    """Returns the shortest time in seconds of `repeat` calls to
+    `function`, and the peak memory usage if `memory` is True.
+
+    """
+
+    result = {
+        'seconds': min(timeit.repeat(function, number=1, repeat=repeat))
+    }
+
+    if memory:
+        result['peak-memory'] = measure_peak_memory(function)
+
+    return result
+
+
+def measure_throughput(function, iterations, repeat, number_of_bytes=None):
+    seconds = min(timeit.repeat(function, number=iterations, repeat=repeat))
+
+    if seconds == 0:
+        seconds = sys.float_info.epsilon
+
+    result = {
+        'messages-per-second': iterations / seconds
+    }
+
+    if number_of_bytes is not None:
+        result['bytes-per-second'] = iterations * number_of_bytes / seconds
+
+    return result
+
+
+def measure_decode(spec, type_name, encoded, iterations, repeat, memory):
+    result = measure_throughput(lambda: spec.decode(type_name, encoded),
+                                iterations,
+                                repeat,
+                                len(encoded))
+
+    if memory:
+        result['decoded-memory'] = measure_retained_memory(
+            lambda: spec.decode(type_name, encoded))
+
+    return result
+
+
+def benchmark_codec(parsed, codec, samples, iterations, repeat, memory):
+    """Benchmark compiling given parsed specification, and encoding and
+    decoding given samples, with given codec. Encoding is also
+    measured with constraints checked, and decoding also to records.
+    The decoded memory is that of one decoded sample.
+
+    """
+
+    result = {}
+
+    try:
+        result['compile'] = measure(
+            lambda: asn1tools.compile_dict(deepcopy(parsed), codec),
+            repeat,
+            memory)
+        spec = asn1tools.compile_dict(deepcopy(parsed), codec)
+        records_spec = asn1tools.compile_dict(deepcopy(parsed),
+                                              codec,
+                                              container='records')
+    except Exception as e:
+        result['error'] = str(e)
+
+        return result
+
+    result['encode'] = {}
+    result['encode-check-constraints'] = {}
+    result['decode'] = {}
+    result['decode-records'] = {}
+
+    for type_name, decoded in samples:
+        try:
+            encoded = spec.encode(type_name, decoded)
+            result['encode'][type_name] = measure_throughput(
+                lambda: spec.encode(type_name, decoded),
+                iterations,
+                repeat,
+                len(encoded))
+            result['encode-check-constraints'][type_name] = measure_throughput(
+                lambda: spec.encode(type_name, decoded, check_constraints=True),
+                iterations,
+                repeat,
+                len(encoded))
+
+            if codec not in ENCODE_ONLY_CODECS:
+                result['decode'][type_name] = measure_decode(spec,
+                                                             type_name,
+                                                             encoded,
+                                                             iterations,
+                                                             repeat,
+                                                             memory)
+                result['decode-records'][type_name] = measure_decode(
+                    records_spec,
+                    type_name,
+                    encoded,
+                    iterations,
+                    repeat,
+                    memory)
+        except Exception as e:
+            result['encode'][type_name] = {'error': str(e)}
+
+    return result
+
+
+def benchmark_generate(spec, samples, iterations, repeat):
+    """Benchmark generating random values of the types of given
+    samples.
+
+    """
+
+    result = {}
+    randomizer = random.Random(0)
+
+    for type_name, _ in samples:
+        try:
+            result[type_name] = measure_throughput(
+                lambda: spec.generate(type_name, randomizer),
+                iterations,
+                repeat)
+        except Exception as e:
+            result[type_name] = {'error': str(e)}
+
+    return result
+
+
+def benchmark_transcode(parsed, codecs, samples, iterations, repeat):
+    """Benchmark transcoding given samples between the codec pairs in
+    :data:`TRANSCODINGS` where both codecs are in `codecs`.
+
+    """
+
+    result = {}
+
+    for from_codec, to_codec in TRANSCODINGS:
+        if from_codec not in codecs or to_codec not in codecs:
+            continue
+
+        name = '{}-to-{}'.format(from_codec, to_codec)
+
+        try:
+            bundle = asn1tools.compile_dict(deepcopy(parsed),
+                                            codecs=[from_codec, to_codec])
+        except Exception as e:
+            result[name] = {'error': str(e)}
+
+            continue
+
+        result[name] = {}
+
+        for type_name, decoded in samples:
+            try:
+                encoded = bundle[from_codec].encode(type_name, decoded)
+                result[name][type_name] = measure_throughput(
+                    lambda: asn1tools.transcode(bundle,
+                                                type_name,
+                                                encoded,
+                                                from_codec,
+                                                to_codec),
+                    iterations,
+                    repeat,
+                    len(encoded))
+            except Exception as e:
+                result[name][type_name] = {'error': str(e)}
+
+    return result
+
+
+def benchmark_specification(name,
+                            filenames,
+                            codecs,
+                            iterations,
+                            repeat,
+                            memory):
+    """Benchmark parsing given specification, and compiling, encoding,
+    decoding, generating and transcoding its samples.
+
+    """
+
+    result = {}
+
+    try:
+        result['parse'] = measure(lambda: asn1tools.parse_files(filenames),
+                                  repeat,
+                                  memory)
+        parsed = asn1tools.parse_files(filenames)
+    except Exception as e:
+        result['error'] = str(e)
+
+        return result
+
+    try:
+        spec = asn1tools.compile_dict(deepcopy(parsed))
+    except Exception:
+        samples = SAMPLES.get(name, [])
+    else:
+        samples = get_samples(name, spec, parsed)
+        result['generate'] = benchmark_generate(spec,
+                                                samples,
+                                                iterations,
+                                                repeat)
+
+    result['codecs'] = {
+        codec: benchmark_codec(parsed,
+                               codec,
+                               samples,
+                               iterations,
+                               repeat,
+                               memory)
+        for codec in codecs
+    }
+    result['transcode'] = benchmark_transcode(parsed,
+                                              codecs,
+                                              samples,
+                                              iterations,
+                                              repeat)
+
+    return result
+
+
+def run(specifications,
+        codecs,
+        iterations,
+        repeat=3,
+        memory=True,
+        verbose=True):
+    """Benchmark given specifications, a dictionary of names to lists of
+    files, with given codecs and return the results as a dictionary
+    that can be saved as JSON. All timings are the shortest of
+    `repeat` runs.
+
+    """
+
+    results = {
+        'asn1tools-version': asn1tools.__version__,
+        'python-version': platform.python_version(),
+        'iterations': iterations,
+        'repeat': repeat,
+        'specifications': {}
+    }
+
+    for name, filenames in specifications.items():
+        if verbose:
+            print('Benchmarking {}...'.format(name))
+
+        results['specifications'][name] = benchmark_specification(
+            name,
+            filenames,
+            codecs,
+            iterations,
+            repeat,
+            memory)
+
+    return results
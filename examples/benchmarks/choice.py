@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+"""A performance example of CHOICE heavy PER and UPER decoding.
+
+The decoded message is a BCCH-DL-SCH-Message with 32 small system
+information blocks, each a CHOICE in a SEQUENCE OF, nested in the
+c1, systemInformation and criticalExtensions CHOICEs.
+
+Example execution:
+
+$ ./choice.py
+Starting encoding and decoding of a CHOICE heavy message 10000 times. This may take a few seconds.
+
+CODEC      ENCODE     DECODE
+uper       0.714413   0.710574
+per        0.737327   0.896273
+$
+
+"""
+
+from __future__ import print_function
+
+import os
+import timeit
+import asn1tools
+
+SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+RRC_8_6_0_ASN_PATH = os.path.join(SCRIPT_DIR,
+                                  '..',
+                                  '..',
+                                  'tests',
+                                  'files',
+                                  '3gpp',
+                                  'rrc_8_6_0.asn')
+
+SIB_TYPE_AND_INFO = [
+    ('sib4', {}),
+    ('sib6', {'t-ReselectionUTRA': 3}),
+    ('sib7', {'t-ReselectionGERAN': 3}),
+    ('sib9', {'hnb-Name': b'4'})
+]
+
+DECODED_MESSAGE = {
+    'message': (
+        'c1',
+        (
+            'systemInformation',
+            {
+                'criticalExtensions': (
+                    'systemInformation-r8',
+                    {
+                        'sib-TypeAndInfo': 8 * SIB_TYPE_AND_INFO
+                    }
+                )
+            }
+        )
+    )
+}
+
+ITERATIONS = 10000
+
+
+def encode_decode(codec):
+    rrc_8_6_0 = asn1tools.compile_files(RRC_8_6_0_ASN_PATH, codec)
+    encoded = rrc_8_6_0.encode('BCCH-DL-SCH-Message', DECODED_MESSAGE)
+
+    def encode():
+        rrc_8_6_0.encode('BCCH-DL-SCH-Message', DECODED_MESSAGE)
+
+    def decode():
+        rrc_8_6_0.decode('BCCH-DL-SCH-Message', encoded)
+
+    encode_time = timeit.timeit(encode, number=ITERATIONS)
+    decode_time = timeit.timeit(decode, number=ITERATIONS)
+
+    return encode_time, decode_time
+
+
+print('Starting encoding and decoding of a CHOICE heavy message {} times. '
+      'This may take a few seconds.'.format(ITERATIONS))
+print()
+print('CODEC      ENCODE     DECODE')
+
+for codec in ['uper', 'per']:
+    encode_time, decode_time = encode_decode(codec)
+    print('{:10s} {:f}   {:f}'.format(codec, encode_time, decode_time))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""Measures the time it takes to import asn1tools, and asn1tools
+followed by its first compilation, using ``python -X importtime``
+(Python 3.7 or later).
+
+The parser (and pyparsing), the codecs and prompt_toolkit are
+imported on first use, so a plain import should only take a fraction
+of the time of an import followed by a compilation.
+
+Example execution:
+
+$ ./import_time.py
+Importing asn1tools 10 times. This may take a few seconds.
+
+STATEMENT                                  MILLISECONDS
+import asn1tools                           40.542
+import asn1tools; compile_string(uper)     110.926
+$
+
+"""
+
+from __future__ import print_function
+
+import sys
+import re
+import subprocess
+
+
+ITERATIONS = 10
+
+STATEMENTS = [
+    'import asn1tools',
+    'import asn1tools; compile_string(uper)'
+]
+
+CODE = {
+    'import asn1tools': 'import asn1tools',
+    'import asn1tools; compile_string(uper)': (
+        'import asn1tools; '
+        'asn1tools.compile_string("A DEFINITIONS ::= BEGIN B ::= INTEGER END", '
+        '"uper")')
+}
+
+RE_IMPORT_TIME = re.compile(r'import time:\s*\d+ \|\s*(\d+) \| (\S+)')
+
+
+def import_time(code):
+    """Returns the cumulative import time in microseconds of all top
+    level modules imported when executing given code.
+
+    """
+
+    output = subprocess.check_output([sys.executable,
+                                      '-X', 'importtime',
+                                      '-c', code],
+                                     stderr=subprocess.STDOUT)
+    total = 0
+
+    for line in output.decode('ascii', 'replace').splitlines():
+        mo = RE_IMPORT_TIME.match(line)
+
+        if mo:
+            total += int(mo.group(1))
+
+    return total
+
+
+def measure(statement):
+    code = CODE[statement]
+
+    return min([import_time(code) for _ in range(ITERATIONS)]) / 1000.0
+
+
+print('Importing asn1tools {} times. This may take a few '
+      'seconds.'.format(ITERATIONS))
+print()
+print('STATEMENT                                  MILLISECONDS')
+
+for statement in STATEMENTS:
+    print('{:42s} {:.3f}'.format(statement, measure(statement)))
@@ -24,10 +24,13 @@ EXPECTED = {'AllTypes': {'extensibility-implied': False,
                         'GeneralizedTime1': {'type': 'GeneralizedTime'},
                         'Generalstring': {'type': 'GeneralString'},
                         'Ia5string': {'type': 'IA5String'},
-                        'Ia5string2': {'type': 'IA5String'},
+                        'Ia5string2': {'from': [('a', 'f'), ('0', '9')],
+                                       'type': 'IA5String'},
                         'Ia5string3': {'restricted-to': ['foo', 'bar', 'fie', '...'],
                                        'type': 'IA5String'},
-                        'Ia5string4': {'size': [1], 'type': 'IA5String'},
+                        'Ia5string4': {'from': [('0', '2')],
+                                       'size': [1],
+                                       'type': 'IA5String'},
                         'Integer': {'type': 'INTEGER'},
                         'Integer2': {'restricted-to': [(1, 99)],
                                      'type': 'INTEGER'},
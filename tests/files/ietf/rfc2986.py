@@ -5,11 +5,11 @@ EXPECTED = {'PKCS-10': {'extensibility-implied': False,
                                                'authenticationFramework']},
              'object-classes': {},
              'object-sets': {'CRIAttributes': {'class': 'ATTRIBUTE',
-                                               'members': ['.']},
+                                               'members': []},
                              'PKInfoAlgorithms': {'class': 'ALGORITHM',
-                                                  'members': ['.']},
+                                                  'members': []},
                              'SignatureAlgorithms': {'class': 'ALGORITHM',
-                                                     'members': ['.']}},
+                                                     'members': []}},
              'tags': 'IMPLICIT',
              'types': {'AlgorithmIdentifier': {'members': [{'name': 'algorithm',
                                                             'table': 'IOSet',
@@ -19,6 +19,7 @@ EXPECTED = {'PKCS-10': {'extensibility-implied': False,
                                                             'table': ['IOSet',
                                                                       ['algorithm']],
                                                             'type': 'ALGORITHM.&Type'}],
+                                               'parameters': ['IOSet'],
                                                'type': 'SEQUENCE'},
                        'Attribute': {'members': [{'name': 'type',
                                                   'table': 'IOSet',
@@ -29,12 +30,16 @@ EXPECTED = {'PKCS-10': {'extensibility-implied': False,
                                                   'name': 'values',
                                                   'size': [(1, 'MAX')],
                                                   'type': 'SET OF'}],
+                                     'parameters': ['IOSet'],
                                      'type': 'SEQUENCE'},
-                       'Attributes': {'element': {'type': 'Attribute'},
+                       'Attributes': {'element': {'actual-parameters': ['IOSet'],
+                                                  'type': 'Attribute'},
+                                      'parameters': ['IOSet'],
                                       'type': 'SET OF'},
                        'CertificationRequest': {'members': [{'name': 'certificationRequestInfo',
                                                              'type': 'CertificationRequestInfo'},
-                                                            {'name': 'signatureAlgorithm',
+                                                            {'actual-parameters': ['SignatureAlgorithms'],
+                                                             'name': 'signatureAlgorithm',
                                                              'type': 'AlgorithmIdentifier'},
                                                             {'name': 'signature',
                                                              'type': 'BIT '
@@ -46,16 +51,20 @@ EXPECTED = {'PKCS-10': {'extensibility-implied': False,
                                                                  'type': 'INTEGER'},
                                                                 {'name': 'subject',
                                                                  'type': 'Name'},
-                                                                {'name': 'subjectPKInfo',
+                                                                {'actual-parameters': ['PKInfoAlgorithms'],
+                                                                 'name': 'subjectPKInfo',
                                                                  'type': 'SubjectPublicKeyInfo'},
-                                                                {'name': 'attributes',
+                                                                {'actual-parameters': ['CRIAttributes'],
+                                                                 'name': 'attributes',
                                                                  'tag': {'number': 0},
                                                                  'type': 'Attributes'}],
                                                     'type': 'SEQUENCE'},
-                       'SubjectPublicKeyInfo': {'members': [{'name': 'algorithm',
+                       'SubjectPublicKeyInfo': {'members': [{'actual-parameters': ['IOSet'],
+                                                             'name': 'algorithm',
                                                              'type': 'AlgorithmIdentifier'},
                                                             {'name': 'subjectPublicKey',
                                                              'type': 'BIT '
                                                                      'STRING'}],
+                                                'parameters': ['IOSet'],
                                                 'type': 'SEQUENCE'}},
              'values': {}}}
\ No newline at end of file
@@ -1,6 +1,7 @@
 EXPECTED = {'InformationObject': {'extensibility-implied': False,
                        'imports': {},
                        'object-classes': {'ERROR-CLASS': {'members': [{'name': '&category',
+                                                                       'size': [1],
                                                                        'type': 'PrintableString'},
                                                                       {'name': '&code',
                                                                        'type': 'INTEGER'},
@@ -95,4 +96,5 @@ EXPECTED = {'InformationObject': {'extensibility-implied': False,
                                                                          'type': 'INTEGER'}],
                                                             'type': 'SEQUENCE'}},
                        'values': {'innerItem0': {'type': 'INNER-ITEM',
-                                                 'value': None}}}}
\ No newline at end of file
+                                                 'value': {'&Value': {'type': 'INTEGER'},
+                                                           '&type': 0}}}}}
\ No newline at end of file
@@ -518,7 +518,13 @@ EXPECTED = {'X680': {'extensibility-implied': False,
                                                             'september'],
                                           'type': 'Months-E-4'},
                     'ThumbPrint': {'type': 'NULL'},
-                    'TouchToneString-E-4': {'type': 'IA5String'},
+                    'TouchToneString-E-4': {'from': [('0', '0'), ('1', '1'),
+                                                     ('2', '2'), ('3', '3'),
+                                                     ('4', '4'), ('5', '5'),
+                                                     ('6', '6'), ('7', '7'),
+                                                     ('8', '8'), ('9', '9'),
+                                                     ('*', '*'), ('#', '#')],
+                                            'type': 'IA5String'},
                     'TypeA': {'type': 'INTEGER'},
                     'TypeB': {'type': 'BIT STRING'},
                     'TypeC': {'type': 'REAL'},
@@ -0,0 +1,144 @@
+import os
+import unittest
+import asn1tools
+
+from benchmarks.specifications import find_specifications
+from benchmarks.specifications import find_all_specifications
+from benchmarks.samples import SAMPLES
+from benchmarks.samples import find_message_types
+from benchmarks.samples import generate_samples
+from benchmarks.samples import get_samples
+from benchmarks.compare import flatten
+from benchmarks.compare import compare
+from benchmarks.suite import run
+
+
+class Asn1ToolsBenchmarksTest(unittest.TestCase):
+
+    maxDiff = None
+
+    def test_find_specifications(self):
+        specifications = find_specifications()
+
+        self.assertEqual([os.path.basename(filename)
+                          for filename in specifications['foo']],
+                         ['foo.asn'])
+        self.assertIn('3gpp/rrc_8_6_0', specifications)
+        self.assertIn('ietf/rfc5280', specifications)
+        self.assertNotIn('sequence_of', specifications)
+        self.assertNotIn('complex', specifications)
+
+        # Files defining imported modules are added.
+        self.assertEqual([os.path.basename(filename)
+                          for filename in specifications['ietf/rfc1157']],
+                         ['rfc1157.asn', 'rfc1155.asn'])
+
+        specifications = find_all_specifications()
+
+        self.assertIn('foo', specifications)
+        self.assertIn('sequence_of', specifications)
+
+    def test_samples(self):
+        specifications = find_all_specifications()
+
+        for name, samples in SAMPLES.items():
+            spec = asn1tools.compile_files(specifications[name])
+
+            for type_name, decoded in samples:
+                encoded = spec.encode(type_name, decoded)
+                self.assertEqual(spec.decode(type_name, encoded), decoded)
+
+    def test_generate_samples(self):
+        filenames = find_specifications()['x691_a4']
+        parsed = asn1tools.parse_files(filenames)
+        spec = asn1tools.compile_dict(parsed)
+
+        self.assertEqual(find_message_types(parsed), ['Ax'])
+
+        samples = generate_samples(spec, parsed)
+
+        self.assertEqual([type_name for type_name, _ in samples], ['Ax'])
+        self.assertEqual(samples, generate_samples(spec, parsed))
+        self.assertEqual(get_samples('x691_a4', spec, parsed), samples)
+        self.assertEqual(get_samples('foo', spec, parsed), SAMPLES['foo'])
+
+    def test_compare(self):
+        before = {
+            'specifications': {
+                'foo': {
+                    'parse': {'seconds': 1.0},
+                    'codecs': {
+                        'ber': {
+                            'encode': {
+                                'Question': {'messages-per-second': 100.0}
+                            }
+                        }
+                    }
+                }
+            }
+        }
+        after = {
+            'specifications': {
+                'foo': {
+                    'parse': {'seconds': 2.0},
+                    'codecs': {
+                        'ber': {
+                            'encode': {
+                                'Question': {'messages-per-second': 105.0}
+                            }
+                        }
+                    }
+                }
+            }
+        }
+
+        self.assertEqual(
+            flatten(before['specifications']),
+            {
+                'foo/parse/seconds': 1.0,
+                'foo/codecs/ber/encode/Question/messages-per-second': 100.0
+            })
+
+        changes, regressions = compare(before, after, 10.0)
+
+        self.assertEqual(
+            changes,
+            [
+                ('foo/parse/seconds', 1.0, 2.0, -50.0),
+                ('foo/codecs/ber/encode/Question/messages-per-second',
+                 100.0,
+                 105.0,
+                 5.0)
+            ])
+        self.assertEqual(regressions, ['foo/parse/seconds'])
+
+    def test_run(self):
+        specifications = find_specifications()
+        specifications = {'foo': specifications['foo']}
+        results = run(specifications,
+                      ['ber', 'gser', 'uper'],
+                      1,
+                      repeat=1,
+                      memory=False,
+                      verbose=False)
+        result = results['specifications']['foo']
+
+        self.assertEqual(sorted(result),
+                         ['codecs', 'generate', 'parse', 'transcode'])
+        self.assertEqual(sorted(result['codecs']), ['ber', 'gser', 'uper'])
+        self.assertEqual(sorted(result['codecs']['ber']),
+                         ['compile',
+                          'decode',
+                          'decode-records',
+                          'encode',
+                          'encode-check-constraints'])
+        self.assertEqual(sorted(result['codecs']['ber']['decode']['Question']),
+                         ['bytes-per-second', 'messages-per-second'])
+        self.assertEqual(result['codecs']['gser']['decode'], {})
+        self.assertEqual(list(result['generate']), ['Question'])
+        self.assertEqual(list(result['transcode']), ['uper-to-ber'])
+        self.assertEqual(list(result['transcode']['uper-to-ber']), ['Question'])
+
+
+if __name__ == '__main__':
+    unittest.main()
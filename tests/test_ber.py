@@ -82,6 +82,63 @@ class Asn1ToolsBerTest(Asn1ToolsBaseTest):
         for encoded in datas:
             self.assertIsNone(foo.decode_length(encoded))
 
+    def test_encode_into(self):
+        foo = asn1tools.compile_files('tests/files/foo.asn')
+        question = {'id': 1, 'question': 'Is 1+1=3?'}
+        answer = {'id': 1, 'answer': False}
+
+        # Messages are appended to the buffer.
+        buffer = bytearray(b'\x00\x00')
+        self.assertEqual(foo.encode_into('Question', question, buffer), 16)
+        self.assertEqual(foo.encode_into('Answer', answer, buffer), 8)
+        self.assertEqual(
+            buffer,
+            b'\x00\x00' + foo.encode('Question', question) + foo.encode('Answer', answer))
+
+        # Already encoded values.
+        buffer = bytearray()
+        self.assertEqual(
+            foo.encode_into('Question', foo.pre_encode('Question', question), buffer),
+            16)
+        self.assertEqual(buffer, foo.encode('Question', question))
+
+        # The buffer is left as it was on failure.
+        buffer = bytearray(b'\x01')
+
+        with self.assertRaises(asn1tools.EncodeError):
+            foo.encode_into('Question', {'id': 1}, buffer)
+
+        self.assertEqual(buffer, b'\x01')
+
+        bar = asn1tools.compile_string(
+            "Bar DEFINITIONS ::= BEGIN A ::= INTEGER (0..3) END")
+
+        with self.assertRaises(asn1tools.ConstraintsError):
+            bar.encode_into('A', 5, buffer, check_constraints=True)
+
+        self.assertEqual(bar.encode_into('A', 5, buffer), 3)
+        self.assertEqual(buffer, b'\x01\x02\x01\x05')
+
+        # Only BER and DER.
+        foo = asn1tools.compile_files('tests/files/foo.asn', 'uper')
+
+        with self.assertRaises(NotImplementedError) as cm:
+            foo.encode_into('Question', question, buffer)
+
+        self.assertEqual(
+            str(cm.exception),
+            'encoding into a buffer is only supported by the BER and DER codecs')
+
+    def test_decode_without_copy(self):
+        foo = asn1tools.compile_files('tests/files/foo.asn')
+        encoded = b'0\x0e\x02\x01\x01\x16\x09Is 1+1=3?'
+        buffer = b'\x00\x00' + encoded + b'\x00\x00'
+
+        # Decode bytes, bytearray and memoryview objects.
+        for data in [encoded, bytearray(encoded), memoryview(buffer)[2:18]]:
+            self.assertEqual(foo.decode('Question', data),
+                             {'id': 1, 'question': 'Is 1+1=3?'})
+
     def test_complex(self):
         cmplx = asn1tools.compile_files('tests/files/complex.asn')
 
@@ -1078,6 +1135,36 @@ class Asn1ToolsBerTest(Asn1ToolsBaseTest):
 
         self.assert_encode_decode(rfc5280, 'Certificate', decoded, encoded)
 
+        # Encode with already encoded members and elements.
+        tbs_certificate = dict(decoded['tbsCertificate'])
+        tbs_certificate['signature'] = rfc5280.pre_encode(
+            'AlgorithmIdentifier',
+            tbs_certificate['signature'])
+        tbs_certificate['issuer'] = (
+            'rdnSequence',
+            [
+                rfc5280.pre_encode('RelativeDistinguishedName', name)
+                for name in tbs_certificate['issuer'][1]
+            ])
+        certificate = dict(decoded)
+        certificate['tbsCertificate'] = tbs_certificate
+        certificate['signatureAlgorithm'] = asn1tools.Encoded(
+            b'\x30\x0d\x06\x09\x2a\x86\x48\x86\xf7\x0d\x01\x01\x05\x05\x00')
+        self.assertEqual(rfc5280.encode('Certificate', certificate), encoded)
+        self.assertEqual(
+            rfc5280.encode('Certificate',
+                           rfc5280.pre_encode('Certificate', decoded)),
+            encoded)
+
+        # Wrong tag.
+        certificate['signatureAlgorithm'] = asn1tools.Encoded(b'\x31\x00')
+
+        with self.assertRaises(asn1tools.EncodeError) as cm:
+            rfc5280.encode('Certificate', certificate)
+
+        self.assertEqual(str(cm.exception),
+                         "expected encoded data with tag '30', but got '31'")
+
     def test_rfc5280_modified(self):
         any_defined_by_choices = {
             ('PKIX1Explicit88', 'AlgorithmIdentifier', 'parameters'): {
@@ -2100,6 +2187,68 @@ class Asn1ToolsBerTest(Asn1ToolsBaseTest):
 
         self.assertEqual(str(cm.exception), "fum: bad AnyDefinedBy choice 1.3.1000.8")
 
+    def test_information_object(self):
+        information_object = asn1tools.compile_files(
+            'tests/files/information_object.asn')
+
+        # Message 1.
+        decoded = {
+            'id': 0,
+            'value': True,
+            'comment': 'item 0',
+            'extra': 2
+        }
+
+        encoded = (
+            b'\x30\x13\x80\x01\x00\xa1\x03\x01\x01\xff\x82\x06\x69\x74\x65\x6d'
+            b'\x20\x30\x83\x01\x02'
+        )
+
+        self.assert_encode_decode(information_object,
+                                  'ItemWithConstraints',
+                                  decoded,
+                                  encoded)
+
+        # Message 2, the open type 'myValue' precedes 'myType'.
+        decoded = {
+            'id': 1,
+            'value': {
+                'myValue': 7,
+                'myType': 0
+            },
+            'comment': 'item 1',
+            'extra': 5
+        }
+
+        encoded = (
+            b'\x30\x1a\x80\x01\x01\xa1\x0a\x30\x08\xa0\x03\x02\x01\x07\x81\x01'
+            b'\x00\x82\x06\x69\x74\x65\x6d\x20\x31\x83\x01\x05'
+        )
+
+        self.assert_encode_decode(information_object,
+                                  'ItemWithConstraints',
+                                  decoded,
+                                  encoded)
+
+        # Message 3, an unknown id gives the open type as its
+        # encoding.
+        decoded = {
+            'id': 2,
+            'value': b'\x01\x01\xff',
+            'comment': 'item 2',
+            'extra': 5
+        }
+
+        encoded = (
+            b'\x30\x13\x80\x01\x02\xa1\x03\x01\x01\xff\x82\x06\x69\x74\x65\x6d'
+            b'\x20\x32\x83\x01\x05'
+        )
+
+        self.assert_encode_decode(information_object,
+                                  'ItemWithConstraints',
+                                  decoded,
+                                  encoded)
+
     def test_decode_bad_length(self):
         foo = asn1tools.compile_files('tests/files/foo.asn')
 
@@ -2507,6 +2656,113 @@ class Asn1ToolsBerTest(Asn1ToolsBaseTest):
                        b'\x30\x0b\xa0\x06\x80\x01\xff\x81\x01\xff\x81\x01\x64'),
             {'a': {'a': True}, 'b': 100})
 
+    def test_sparse_optional(self):
+        foo = asn1tools.compile_string(
+            "Foo DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "A ::= SEQUENCE { "
+            "  a CHOICE { "
+            "    b INTEGER, "
+            "    c BOOLEAN "
+            "  } OPTIONAL, "
+            "  d INTEGER DEFAULT 5, "
+            "  e BOOLEAN OPTIONAL, "
+            "  f INTEGER OPTIONAL, "
+            "  g INTEGER "
+            "} "
+            "END")
+
+        datas = [
+            ('A', {'d': 5, 'g': 1}, b'\x30\x03\x84\x01\x01'),
+            ('A',
+             {'a': ('c', True), 'd': 5, 'g': 1},
+             b'\x30\x08\xa0\x03\x81\x01\xff\x84\x01\x01'),
+            ('A',
+             {'d': 4, 'f': 3, 'g': 1},
+             b'\x30\x09\x81\x01\x04\x83\x01\x03\x84\x01\x01')
+        ]
+
+        for type_name, decoded, encoded in datas:
+            self.assert_encode_decode(foo, type_name, decoded, encoded)
+
+        # Missing mandatory member after absent optional members.
+        with self.assertRaises(asn1tools.DecodeError) as cm:
+            foo.decode('A', b'\x30\x03\x85\x01\xff')
+
+        self.assertEqual(
+            str(cm.exception),
+            "g: expected INTEGER with tag '84' at offset 2, but got '85'")
+
+
+    def test_encoded_implicit_tags(self):
+        foo = asn1tools.compile_string(
+            "Foo DEFINITIONS IMPLICIT TAGS ::= "
+            "BEGIN "
+            "SignerInfo ::= SEQUENCE { "
+            "  version INTEGER, "
+            "  signedAttrs [0] IMPLICIT SignedAttributes OPTIONAL, "
+            "  signature [1] OCTET STRING, "
+            "  name [2] Name "
+            "} "
+            "SignedAttributes ::= SET SIZE (1..MAX) OF Attribute "
+            "Attribute ::= SEQUENCE { "
+            "  attrType OBJECT IDENTIFIER, "
+            "  attrValues SET OF INTEGER "
+            "} "
+            "Name ::= [APPLICATION 3] IMPLICIT SEQUENCE { "
+            "  x INTEGER "
+            "} "
+            "END")
+
+        decoded = {
+            'version': 1,
+            'signedAttrs': [{'attrType': '1.2.3', 'attrValues': [5]}],
+            'signature': b'\x01\x02',
+            'name': {'x': 3}
+        }
+        encoded = (
+            b'\x30\x19\x02\x01\x01\xa0\x0b\x30\x09\x06\x02\x2a\x03\x31'
+            b'\x03\x02\x01\x05\x81\x02\x01\x02\xa2\x03\x02\x01\x03'
+        )
+        self.assert_encode_decode(foo, 'SignerInfo', decoded, encoded)
+
+        # The tags of already encoded values of the implicitly tagged
+        # types, or of the types they reference, are replaced by the
+        # implicit tags.
+        signed_attrs = foo.pre_encode('SignedAttributes', decoded['signedAttrs'])
+        name = foo.pre_encode('Name', decoded['name'])
+        self.assertEqual(signed_attrs[:1], b'\x31')
+        self.assertEqual(name[:1], b'\x63')
+        datas = [
+            {
+                'version': 1,
+                'signedAttrs': signed_attrs,
+                'signature': asn1tools.Encoded(b'\x04\x02\x01\x02'),
+                'name': name
+            },
+            {
+                'version': 1,
+                'signedAttrs': asn1tools.Encoded(encoded[5:18]),
+                'signature': asn1tools.Encoded(b'\x81\x02\x01\x02'),
+                'name': asn1tools.Encoded(b'\x30\x03\x02\x01\x03')
+            }
+        ]
+
+        for data in datas:
+            self.assertEqual(foo.encode('SignerInfo', data), encoded)
+
+        # Wrong tag.
+        with self.assertRaises(asn1tools.EncodeError) as cm:
+            foo.encode('SignerInfo',
+                       {
+                           'version': 1,
+                           'signature': b'',
+                           'name': asn1tools.Encoded(b'\x31\x03\x02\x01\x03')
+                       })
+
+        self.assertEqual(str(cm.exception),
+                         "expected encoded data with tag 'a2', but got '31'")
+
 
 if __name__ == '__main__':
     unittest.main()
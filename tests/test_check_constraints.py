@@ -26,8 +26,7 @@ class Asn1ToolsCheckConstraintsTest(Asn1ToolsBaseTest):
                 "END",
                 codec)
 
-            with self.assertRaises(NotImplementedError):
-                foo.check_constraints('A', 0)
+            foo.check_constraints('A', 0)
 
     def test_integer(self):
         foo = asn1tools.compile_string(
@@ -44,6 +43,8 @@ class Asn1ToolsCheckConstraintsTest(Asn1ToolsBaseTest):
             "  c INTEGER (400..400) "
             "} "
             "G ::= B (6..7) "
+            "H ::= B (0..200) "
+            "I ::= H (MIN..50) "
             "END")
 
         # Ok.
@@ -57,13 +58,16 @@ class Asn1ToolsCheckConstraintsTest(Asn1ToolsBaseTest):
             ('C',    -10),
             ('C',     10),
             ('D',     99),
+            ('D',    100),
             ('E',   1000),
-            ('F',   {'a': 4, 'b': 40, 'c': 400})
+            ('F',   {'a': 4, 'b': 40, 'c': 400}),
+            ('H',     99),
+            ('I',      5),
+            ('I',     50)
         ]
 
         for type_name, decoded in datas:
-            with self.assertRaises(NotImplementedError):
-                foo.check_constraints(type_name, decoded)
+            foo.check_constraints(type_name, decoded)
 
         # Not ok.
         datas = [
@@ -71,19 +75,181 @@ class Asn1ToolsCheckConstraintsTest(Asn1ToolsBaseTest):
             ('B',    100, ': 100 does not fulfill 5..99'),
             ('C',    -11, ': -11 does not fulfill -10..10'),
             ('C',     11, ': 11 does not fulfill -10..10'),
-            ('D',    100, ': 100 does not fulfill 5..99'),
             ('E',      0, ': 0 does not fulfill 1000..1000'),
             ('F',
              {'a': 4, 'b': 41, 'c': 400},
-             'b: 41 does not fulfill 40..40')
+             'b: 41 does not fulfill 40..40'),
+            ('G',      5, ': 5 does not fulfill 6..7'),
+            ('H',    150, ': 150 does not fulfill 5..99'),
+            ('H',      0, ': 0 does not fulfill 5..99'),
+            ('I',     51, ': 51 does not fulfill 5..50')
         ]
 
         for type_name, decoded, message in datas:
-            with self.assertRaises(NotImplementedError):
-                with self.assertRaises(asn1tools.ConstraintsError) as cm:
-                    foo.check_constraints(type_name, decoded)
+            with self.assertRaises(asn1tools.ConstraintsError) as cm:
+                foo.check_constraints(type_name, decoded)
+
+            self.assertEqual(str(cm.exception), message)
+
+    def test_size(self):
+        foo = asn1tools.compile_string(
+            "Foo DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "A ::= OCTET STRING (SIZE (2..3)) "
+            "B ::= BIT STRING (SIZE (8)) "
+            "C ::= SEQUENCE (SIZE (1..2)) OF IA5String (SIZE (1)) "
+            "D ::= SEQUENCE { "
+            "  a CHOICE { "
+            "    b E, "
+            "    c BOOLEAN "
+            "  } OPTIONAL "
+            "} "
+            "E ::= SEQUENCE { "
+            "  d INTEGER (0..MAX), "
+            "  e E OPTIONAL "
+            "} "
+            "END")
+
+        # Ok.
+        datas = [
+            ('A', b'12'),
+            ('A', b'123'),
+            ('B', (b'\x01', 8)),
+            ('C', ['1', '2']),
+            ('D', {}),
+            ('D', {'a': ('c', True)}),
+            ('D', {'a': ('b', {'d': 0, 'e': {'d': 1000}})})
+        ]
+
+        for type_name, decoded in datas:
+            foo.check_constraints(type_name, decoded)
+
+        # Not ok.
+        datas = [
+            ('A', b'1', ': size 1 does not fulfill 2..3'),
+            ('A', b'1234', ': size 4 does not fulfill 2..3'),
+            ('B', (b'\x01', 7), ': size 7 does not fulfill 8..8'),
+            ('C', [], ': size 0 does not fulfill 1..2'),
+            ('C', ['1', '12'], ': size 2 does not fulfill 1..1'),
+            ('D',
+             {'a': ('b', {'d': 0, 'e': {'d': -1}})},
+             'a.b.e.d: -1 does not fulfill 0..MAX')
+        ]
+
+        for type_name, decoded, message in datas:
+            with self.assertRaises(asn1tools.ConstraintsError) as cm:
+                foo.check_constraints(type_name, decoded)
+
+            self.assertEqual(str(cm.exception), message)
+
+    def test_extensible(self):
+        foo = asn1tools.compile_string(
+            "Foo DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "A ::= INTEGER (0..10, ...) "
+            "B ::= SEQUENCE (SIZE (1..2, ...)) OF INTEGER (0..1) "
+            "C ::= IA5String (FROM (\"a\"..\"c\", ...)) "
+            "END",
+            'uper')
+
+        # Values outside the root of extensible constraints are valid.
+        datas = [
+            ('A', 11),
+            ('B', [0, 1, 0]),
+            ('C', 'xyz')
+        ]
+
+        for type_name, decoded in datas:
+            foo.check_constraints(type_name, decoded)
+            foo.encode(type_name, decoded, check_constraints=True)
+
+        with self.assertRaises(asn1tools.ConstraintsError) as cm:
+            foo.check_constraints('B', [0, 2])
+
+        self.assertEqual(str(cm.exception), ': 2 does not fulfill 0..1')
+
+    def test_permitted_alphabet(self):
+        foo = asn1tools.compile_string(
+            "Foo DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "A ::= IA5String (FROM (\"a\"..\"c\")) "
+            "B ::= VisibleString (SIZE (1..3)) (FROM (\"a\"..\"c\" | \"xy\")) "
+            "C ::= SEQUENCE { a A OPTIONAL } "
+            "END")
+
+        # Ok.
+        datas = [
+            ('A', ''),
+            ('A', 'abcba'),
+            ('B', 'ax'),
+            ('B', 'cyb'),
+            ('C', {'a': 'cab'})
+        ]
+
+        for type_name, decoded in datas:
+            foo.check_constraints(type_name, decoded)
+
+        # Not ok.
+        datas = [
+            ('A', 'xyz', ": character 'x' does not fulfill the permitted alphabet"),
+            ('B', 'abz', ": character 'z' does not fulfill the permitted alphabet"),
+            ('B', 'abcx', ': size 4 does not fulfill 1..3'),
+            ('C',
+             {'a': 'abd'},
+             "a: character 'd' does not fulfill the permitted alphabet")
+        ]
+
+        for type_name, decoded, message in datas:
+            with self.assertRaises(asn1tools.ConstraintsError) as cm:
+                foo.check_constraints(type_name, decoded)
+
+            self.assertEqual(str(cm.exception), message)
+
+    def test_encode(self):
+        foo = asn1tools.compile_string(
+            "Foo DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "A ::= INTEGER (0..3) "
+            "END",
+            'ber')
+
+        self.assertEqual(foo.encode('A', 5), b'\x02\x01\x05')
+
+        with self.assertRaises(asn1tools.ConstraintsError) as cm:
+            foo.encode('A', 5, check_constraints=True)
+
+        self.assertEqual(str(cm.exception), ': 5 does not fulfill 0..3')
+
+
+    def test_encoded(self):
+        foo = asn1tools.compile_string(
+            "Foo DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "A ::= SEQUENCE { "
+            "  a INTEGER (0..3), "
+            "  b SEQUENCE OF B, "
+            "  c CHOICE { "
+            "    d B "
+            "  } "
+            "} "
+            "B ::= IA5String (SIZE (1..2)) "
+            "END",
+            'ber')
+
+        # Already encoded values are not checked.
+        a = asn1tools.Encoded(b'\x80\x01\x05')
+        b = foo.pre_encode('B', 'abc')
+        decoded = {'a': a, 'b': [b, 'x'], 'c': ('d', b)}
+        foo.check_constraints('A', decoded)
+        foo.check_constraints('A', foo.pre_encode('A', decoded))
+        self.assertEqual(foo.encode('A', decoded, check_constraints=True),
+                         foo.encode('A', decoded))
+
+        with self.assertRaises(asn1tools.ConstraintsError) as cm:
+            foo.encode('A', {'a': a, 'b': [b, 'xyz'], 'c': ('d', b)},
+                       check_constraints=True)
 
-                self.assertEqual(str(cm.exception), message)
+        self.assertEqual(str(cm.exception), 'b: size 3 does not fulfill 1..2')
 
 
 if __name__ == '__main__':
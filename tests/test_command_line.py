@@ -1,5 +1,12 @@
+import os
 import sys
+import binascii
+import threading
+import subprocess
+import random
 import unittest
+from io import BytesIO
+from io import TextIOWrapper
 
 try:
     from StringIO import StringIO
@@ -14,6 +21,22 @@ except ImportError:
 import asn1tools
 
 
+class PipeOutput(object):
+    """Records the writes of a conversion, and if it flushed.
+
+    """
+
+    def __init__(self):
+        self.writes = []
+        self.flushed = threading.Event()
+
+    def write(self, data):
+        self.writes.append(data)
+
+    def flush(self):
+        self.flushed.set()
+
+
 class Asn1ToolsCommandLineTest(unittest.TestCase):
 
     maxDiff = None
@@ -29,7 +52,8 @@ class Asn1ToolsCommandLineTest(unittest.TestCase):
                     asn1tools._main()
 
         expected_output = [
-            "usage: asn1tools [-h] [-d] [-v {0,1,2}] [--version] {convert,shell} ...",
+            "usage: asn1tools [-h] [-d] [-v {0,1,2}] [--version]",
+            "{convert,transcode,profile,generate,generate-python,shell}",
             "",
             "Various ASN.1 utilities.",
             "",
@@ -46,7 +70,7 @@ class Asn1ToolsCommandLineTest(unittest.TestCase):
             "  --version             Print version information and exit.",
             "",
             "subcommands:",
-            "  {convert,shell}"
+            "  {convert,transcode,profile,generate,generate-python,shell}"
         ]
 
         print(stdout.getvalue())
@@ -107,6 +131,105 @@ class Asn1ToolsCommandLineTest(unittest.TestCase):
 
         self.assertEqual(expected_output, stdout.getvalue())
 
+    def test_command_line_profile_uper_foo_question(self):
+        argv = [
+            'asn1tools',
+            'profile',
+            '--codec', 'uper',
+            '--iterations', '3',
+            '--top', '2',
+            'tests/files/foo.asn',
+            'Question',
+            '01010993cd03156c5eb37e'
+        ]
+
+        stdout = StringIO()
+
+        with patch('sys.stdout', stdout):
+            with patch('sys.argv', argv):
+                asn1tools._main()
+
+        lines = stdout.getvalue().splitlines()
+
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[0].split(),
+                         ['PATH', 'TYPE', 'CALLS', 'ENCODE', '[s]', 'DECODE', '[s]'])
+        self.assertEqual(lines[1].split()[:3], ['Question', 'SEQUENCE', '6'])
+
+        # No iterations.
+        argv[5] = '0'
+        stdout = StringIO()
+
+        with patch('sys.stdout', stdout):
+            with patch('sys.argv', argv):
+                asn1tools._main()
+
+        lines = stdout.getvalue().splitlines()
+
+        self.assertEqual(len(lines), 1)
+
+    def test_command_line_generate_uper_foo_question(self):
+        argv = [
+            'asn1tools',
+            'generate',
+            '--codec', 'uper',
+            '--number-of-samples', '5',
+            '--seed', '1',
+            'tests/files/foo.asn',
+            'Question'
+        ]
+
+        stdout = StringIO()
+
+        with patch('sys.stdout', stdout):
+            with patch('sys.argv', argv):
+                asn1tools._main()
+
+        lines = stdout.getvalue().splitlines()
+        foo = asn1tools.compile_files('tests/files/foo.asn', 'uper')
+        randomizer = random.Random(1)
+
+        self.assertEqual(len(lines), 5)
+
+        for line in lines:
+            self.assertEqual(foo.decode('Question', binascii.unhexlify(line)),
+                             foo.generate('Question', randomizer))
+
+    def test_command_line_generate_python_uper_foo(self):
+        argv = [
+            'asn1tools',
+            'generate-python',
+            '--codec', 'uper',
+            'tests/files/foo.asn'
+        ]
+
+        stdout = StringIO()
+
+        with patch('sys.stdout', stdout):
+            with patch('sys.argv', argv):
+                asn1tools._main()
+
+        generated = {}
+        exec(stdout.getvalue(), generated)
+        foo = asn1tools.compile_files('tests/files/foo.asn', 'uper')
+        decoded = {'id': 1, 'question': 'Is 1+1=3?'}
+        encoded = b'\x01\x01\x09\x93\xcd\x03\x15\x6c\x5e\xb3\x7e'
+
+        self.assertEqual(sorted(generated['specification'].types),
+                         sorted(foo.types))
+        self.assertEqual(generated['specification'].encode('Question', decoded),
+                         encoded)
+        self.assertEqual(generated['specification'].decode('Question', encoded),
+                         decoded)
+
+        with self.assertRaises(asn1tools.CompileError) as cm:
+            asn1tools.frozen.load(generated['SPECIFICATION'], 'uper', '0.0.0')
+
+        self.assertEqual(
+            str(cm.exception),
+            "the module was generated by asn1tools 0.0.0, but asn1tools {} is "
+            "installed, please generate it again".format(asn1tools.__version__))
+
     def test_command_line_convert_ber_foo_question_stdin(self):
         argv = [
             'asn1tools',
@@ -156,6 +279,164 @@ ff0e0201011609497320312b313d333f
 
         self.assertEqual(expected_output, stdout.getvalue())
 
+    def test_command_line_convert_framings_foo_question_stdin(self):
+        encoded = b'\x30\x0e\x02\x01\x01\x16\x09Is 1+1=3?'
+        datas = [
+            (['--framing', 'ber'], encoded + encoded + b'\x30\x03\x02\x01'),
+            (['--framing', 'length-prefixed', '--prefix-size', '2', '--jobs', '2'],
+             b'\x00\x10' + encoded + b'\x00\x10' + encoded + b'\x00\x04\x30\x03\x02\x01')
+        ]
+        expected_output = (
+            "01010993cd03156c5eb37e\n"
+            "01010993cd03156c5eb37e\n"
+            "30030201\n"
+            ": expected at least 3 contents byte(s) at offset 2, but got 2\n"
+        )
+
+        for options, data in datas:
+            argv = ['asn1tools', 'convert', '-o', 'uper', '--stats']
+            argv += options
+            argv += ['tests/files/foo.asn', 'Question', '-']
+            stdout = StringIO()
+            stderr = StringIO()
+
+            with patch('sys.stdin', TextIOWrapper(BytesIO(data))):
+                with patch('sys.stdout', stdout):
+                    with patch('sys.stderr', stderr):
+                        with patch('sys.argv', argv):
+                            asn1tools._main()
+
+            self.assertEqual(expected_output, stdout.getvalue())
+            statistics = stderr.getvalue()
+            self.assertTrue(statistics.startswith('Converted 3 messages in '))
+            self.assertTrue(statistics.endswith(' messages/s) with 1 errors.\n'))
+
+    def test_command_line_convert_framing_ber_indefinite_length(self):
+        encoded = b'\x30\x0e\x02\x01\x01\x16\x09Is 1+1=3?'
+        data = encoded + b'\x30\x80\x02\x01\x01\x00\x00' + encoded
+        expected_output = (
+            "01010993cd03156c5eb37e\n"
+            "3080020101000030" "0e0201011609497320312b313d333f\n"
+            ": expected definite length at offset 1, but got indefinite\n"
+        )
+        argv = [
+            'asn1tools', 'convert', '-o', 'uper', '--framing', 'ber', '--stats',
+            'tests/files/foo.asn', 'Question', '-'
+        ]
+        stdout = StringIO()
+        stderr = StringIO()
+
+        with patch('sys.stdin', TextIOWrapper(BytesIO(data))):
+            with patch('sys.stdout', stdout):
+                with patch('sys.stderr', stderr):
+                    with patch('sys.argv', argv):
+                        asn1tools._main()
+
+        self.assertEqual(expected_output, stdout.getvalue())
+        self.assertTrue(stderr.getvalue().endswith(' with 1 errors.\n'))
+
+    def test_command_line_convert_bad_jobs(self):
+        argv = [
+            'asn1tools', 'convert', '--jobs', '0',
+            'tests/files/foo.asn', 'Question', '-'
+        ]
+
+        with patch('sys.stdin', StringIO('')):
+            with patch('sys.argv', argv):
+                with self.assertRaises(SystemExit) as cm:
+                    asn1tools._main()
+
+        self.assertEqual(str(cm.exception),
+                         'error: expected at least one job, but got 0')
+
+    def test_convert_stream_pipe(self):
+        # Each line written to a pipe is converted and flushed without
+        # waiting for more input or the end of the stream.
+        parsed = asn1tools.parse_files('tests/files/foo.asn')
+        fdin, fdout = os.pipe()
+        fin = os.fdopen(fdin, 'rb')
+        fout = PipeOutput()
+        thread = threading.Thread(target=asn1tools.batch.convert_stream,
+                                  args=(parsed, 'ber', 'uper', 'Question',
+                                        fin, fout))
+        thread.start()
+
+        try:
+            os.write(fdout, b'300e0201011609497320312b313d333f\n')
+            self.assertTrue(fout.flushed.wait(10))
+            self.assertEqual(fout.writes, ['01010993cd03156c5eb37e\n'])
+        finally:
+            os.close(fdout)
+            thread.join()
+            fin.close()
+
+    def test_convert_stream_pipe_bursts(self):
+        # Messages written to a pipe in bursts are converted in chunks
+        # of several messages, not one chunk per message. The pipe is
+        # written by another process, as worker processes would inherit
+        # the writing end of a pipe of this process.
+        parsed = asn1tools.parse_files('tests/files/foo.asn')
+        script = (
+            "import os, time\n"
+            "for _ in range(4):\n"
+            "    os.write(1, 50 * b'300e0201011609497320312b313d333f\\n')\n"
+            "    time.sleep(0.05)\n"
+        )
+
+        for jobs in [1, 2]:
+            writer = subprocess.Popen([sys.executable, '-c', script],
+                                      stdout=subprocess.PIPE)
+            fout = PipeOutput()
+
+            try:
+                asn1tools.batch.convert_stream(parsed,
+                                               'ber',
+                                               'uper',
+                                               'Question',
+                                               writer.stdout,
+                                               fout,
+                                               jobs=jobs)
+            finally:
+                writer.stdout.close()
+                writer.wait()
+
+            self.assertEqual(''.join(fout.writes),
+                             200 * '01010993cd03156c5eb37e\n')
+            self.assertLessEqual(len(fout.writes), 8)
+
+    def test_command_line_transcode_uper_ber_foo_question_stdin(self):
+        argv = [
+            'asn1tools',
+            'transcode',
+            '--input-codec', 'uper',
+            '--output-codec', 'ber',
+            'tests/files/foo.asn',
+            'Question'
+        ]
+        input_data = '''\
+2018-02-24 11:22:09
+01010993cd03156c5eb37e
+
+01
+'''
+
+        expected_output = (
+            "2018-02-24 11:22:09\n"
+            "300e0201011609497320312b313d333f\n"
+            "\n"
+            "01\n"
+            "id: out of data at bit offset 8 (1.0 bytes)\n"
+        )
+
+        stdout = StringIO()
+
+        with patch('sys.stdin', StringIO(input_data)):
+            with patch('sys.stdout', stdout):
+                with patch('sys.argv', argv):
+                    asn1tools._main()
+
+        self.assertEqual(expected_output, stdout.getvalue())
+
     def test_command_line_convert_rfc1155_1157(self):
         argv = [
             'asn1tools',
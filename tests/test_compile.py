@@ -1,7 +1,22 @@
+import os
 import sys
+import json
+import time
+import random
+import shutil
+import threading
+import tempfile
+import subprocess
 import unittest
 import asn1tools
 from copy import deepcopy
+from asn1tools import columns
+from asn1tools.cache import size_of_decoded
+
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
 
 sys.path.append('tests/files')
 sys.path.append('tests/files/ietf')
@@ -120,6 +135,21 @@ class Asn1ToolsCompileTest(unittest.TestCase):
         self.assertEqual(str(cm.exception),
                          "Module 'A' cannot import value 'b' from missing module 'C'.")
 
+    def test_import_re_exported(self):
+        """Types and values imported from a module that itself imports
+        them.
+
+        """
+
+        spec = asn1tools.compile_string(
+            'A DEFINITIONS ::= BEGIN IMPORTS B, c FROM C; D ::= SEQUENCE { a B } END '
+            'C DEFINITIONS ::= BEGIN IMPORTS B, c FROM E; END '
+            'E DEFINITIONS ::= BEGIN B ::= INTEGER (1..c) c INTEGER ::= 5 END',
+            'uper')
+
+        self.assertEqual(spec.encode('D', {'a': 5}), b'\x80')
+        self.assertEqual(spec.decode('D', b'\x80'), {'a': 5})
+
     def test_duplicated_type(self):
         """Duplicated types are not part of types dictionary.
 
@@ -132,6 +162,634 @@ class Asn1ToolsCompileTest(unittest.TestCase):
 
         self.assertEqual(spec.types, {})
 
+    def test_decode_cache(self):
+        specification = (
+            "Foo DEFINITIONS AUTOMATIC TAGS ::= BEGIN "
+            "A ::= SEQUENCE { a INTEGER, b SEQUENCE OF OCTET STRING } "
+            "END")
+        encoded_1 = b'\x01\x01\x01\x01\x12'
+        encoded_2 = b'\x01\x02\x00'
+        encoded_3 = b'\x01\x03\x00'
+        encoded_4 = b'\x01\x04\x00'
+        decoded_1 = {'a': 1, 'b': [b'\x12']}
+        decoded_5 = {'a': 5, 'b': 32 * [b'\x12']}
+
+        # Entries count both the encoded and the decoded data.
+        spec = asn1tools.compile_string(specification,
+                                        'uper',
+                                        decode_cache_size=2,
+                                        decode_cache_bytes=None)
+        spec.decode('A', encoded_1)
+        size_1 = spec.decode_cache_info().number_of_bytes
+        spec.decode('A', encoded_2)
+        size_2 = spec.decode_cache_info().number_of_bytes - size_1
+        self.assertGreater(size_2, len(encoded_2) + size_of_decoded({}))
+        self.assertGreater(size_1, size_2)
+        self.assertLess(size_1, 2 * size_2)
+
+        spec = asn1tools.compile_string(specification,
+                                        'uper',
+                                        decode_cache_size=2,
+                                        decode_cache_bytes=2 * size_2)
+        maximum = 2 * size_2
+        encoded_5 = spec.encode('A', decoded_5)
+
+        self.assertEqual(spec.decode_cache_info(), (0, 0, 0, 2, 0, maximum))
+
+        # Miss followed by hits. Modifying the decoded value must not
+        # modify the cached value.
+        decoded = spec.decode('A', encoded_1)
+        self.assertEqual(decoded, decoded_1)
+        decoded['b'].append(b'\x34')
+
+        for data in [encoded_1, bytearray(encoded_1), memoryview(encoded_1)]:
+            decoded = spec.decode('A', data)
+            self.assertEqual(decoded, decoded_1)
+            decoded['b'][0] = b'\x56'
+
+        self.assertEqual(spec.decode_cache_info(), (3, 1, 1, 2, size_1, maximum))
+
+        # Evicted by the byte limit.
+        spec.decode('A', encoded_2)
+        self.assertEqual(spec.decode_cache_info(), (3, 2, 1, 2, size_2, maximum))
+        spec.decode('A', encoded_3)
+        self.assertEqual(spec.decode_cache_info(),
+                         (3, 3, 2, 2, 2 * size_2, maximum))
+
+        # Evicted by the entry limit, least recently used first.
+        spec.decode('A', encoded_2)
+        spec.decode('A', encoded_4)
+        self.assertEqual(spec.decode_cache_info(),
+                         (4, 4, 2, 2, 2 * size_2, maximum))
+        spec.decode('A', encoded_2)
+        self.assertEqual(spec.decode_cache_info(),
+                         (5, 4, 2, 2, 2 * size_2, maximum))
+
+        # Too big to be cached, as its decoded data is big.
+        self.assertLess(len(encoded_5), maximum)
+        self.assertEqual(spec.decode('A', encoded_5), decoded_5)
+        self.assertEqual(spec.decode_cache_info(),
+                         (5, 5, 2, 2, 2 * size_2, maximum))
+
+        # Bypass the cache.
+        self.assertEqual(spec.decode('A', encoded_1, cache=False), decoded_1)
+        self.assertEqual(spec.decode_cache_info(),
+                         (5, 5, 2, 2, 2 * size_2, maximum))
+
+        spec.decode_cache_clear()
+        self.assertEqual(spec.decode_cache_info(), (0, 0, 0, 2, 0, maximum))
+
+        # Per call cache with a specification compiled without cache.
+        spec = asn1tools.compile_string(
+            "Foo DEFINITIONS AUTOMATIC TAGS ::= BEGIN A ::= INTEGER END",
+            'uper')
+        self.assertIsNone(spec.decode_cache_info())
+        self.assertEqual(spec.decode('A', b'\x01\x05'), 5)
+        self.assertIsNone(spec.decode_cache_info())
+        self.assertEqual(spec.decode('A', b'\x01\x05', cache=True), 5)
+        self.assertEqual(spec.decode('A', b'\x01\x05', cache=True), 5)
+        self.assertEqual(spec.decode_cache_info(),
+                         (1, 1, 1, 128, 2 + size_of_decoded(5), 1048576))
+
+    def test_profiling(self):
+        decoded = {'id': 1, 'question': 'Is 1+1=3?'}
+        sizes = [
+            ('ber', 'bytes', 16, 3),
+            ('der', 'bytes', 16, 3),
+            ('per', 'bits', 96, 16),
+            ('uper', 'bits', 87, 16),
+            ('jer', None, 0, 0),
+            ('xer', None, 0, 0)
+        ]
+
+        for codec, size_unit, size, id_size in sizes:
+            foo = asn1tools.compile_files('tests/files/foo.asn', codec)
+            encoded = foo.encode('Question', decoded)
+            profiler = foo.enable_profiling()
+            self.assertIs(foo.enable_profiling(), profiler)
+            self.assertEqual(foo.encode('Question', decoded), encoded)
+            self.assertEqual(foo.decode('Question', encoded), decoded)
+            self.assertEqual(foo.decode('Question', encoded), decoded)
+            foo.disable_profiling()
+            foo.encode('Question', decoded)
+
+            statistics = profiler.as_dict()
+            self.assertEqual(sorted(statistics),
+                             ['Question', 'Question.id', 'Question.question'])
+            question = statistics['Question']
+            self.assertEqual(question['type'], 'SEQUENCE')
+            self.assertEqual(question['size-unit'], size_unit)
+            self.assertEqual(question['encode']['calls'], 1)
+            self.assertEqual(question['encode']['size'], size)
+            self.assertEqual(question['decode']['calls'], 2)
+            self.assertEqual(question['decode']['size'], 2 * size)
+            self.assertEqual(statistics['Question.id']['encode']['size'], id_size)
+            self.assertEqual(profiler.top(1)[0][0], 'Question')
+            self.assertEqual(json.loads(profiler.as_json()), statistics)
+            self.assertNotIn('encode', vars(foo.types['Question'].type))
+
+    def test_profiling_decode_cache(self):
+        foo = asn1tools.compile_files('tests/files/foo.asn', decode_cache_size=4)
+        encoded = b'0\x0e\x02\x01\x01\x16\x09Is 1+1=3?'
+        foo.decode('Question', encoded)
+
+        # The decode cache is bypassed while profiling.
+        profiler = foo.enable_profiling()
+
+        for _ in range(2):
+            self.assertEqual(foo.decode('Question', encoded),
+                             {'id': 1, 'question': 'Is 1+1=3?'})
+
+        foo.disable_profiling()
+
+        self.assertEqual(profiler.as_dict()['Question']['decode']['calls'], 2)
+        self.assertEqual(foo.decode_cache_info()[:2], (0, 1))
+
+    def test_profiling_fixed_size_members(self):
+        foo = asn1tools.compile_string(
+            "Foo DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "A ::= SEQUENCE { "
+            "  a BOOLEAN, "
+            "  b INTEGER (0..7), "
+            "  c SEQUENCE OF BOOLEAN "
+            "} "
+            "END",
+            'uper')
+        decoded = {'a': True, 'b': 5, 'c': [True, False, True]}
+        encoded = foo.encode('A', decoded)
+
+        # Members and elements encoded in a fixed number of bits are
+        # written and read one at a time when profiling.
+        profiler = foo.enable_profiling()
+        self.assertEqual(foo.encode('A', decoded), encoded)
+        self.assertEqual(foo.decode('A', encoded), decoded)
+        foo.disable_profiling()
+
+        statistics = profiler.as_dict()
+        self.assertEqual(sorted(statistics), ['A', 'A.a', 'A.b', 'A.c', 'A.c[]'])
+        self.assertEqual(statistics['A.b']['encode']['size'], 3)
+        self.assertEqual(statistics['A.c[]']['encode']['calls'], 3)
+        self.assertEqual(statistics['A.c[]']['decode']['calls'], 3)
+
+        # Packing is restored when profiling is disabled.
+        a = foo.types['A'].type
+        self.assertEqual([mask for _, mask in a.root_members_layout], [None, 0])
+        self.assertEqual(a.root_members[2].element_type.fixed_number_of_bits, 1)
+        self.assertEqual(foo.encode('A', decoded), encoded)
+
+    def test_generate(self):
+        spec = asn1tools.compile_string(
+            "A DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "B ::= SEQUENCE { "
+            "  a INTEGER (-5..5), "
+            "  b IA5String (SIZE (2..4)), "
+            "  c SEQUENCE (SIZE (1..100)) OF BIT STRING (SIZE (3)), "
+            "  d CHOICE { e NULL, f OCTET STRING (SIZE (16)), ... , g BOOLEAN }, "
+            "  e ENUMERATED { a, b, ..., c } OPTIONAL, "
+            "  ..., "
+            "  f INTEGER (0..1000) "
+            "} "
+            "END",
+            'uper')
+        randomizer = random.Random(0)
+        present = set()
+
+        for _ in range(500):
+            decoded = spec.generate('B', randomizer, size_hint=3)
+            spec.check_constraints('B', decoded)
+            self.assertEqual(spec.decode('B', spec.encode('B', decoded)), decoded)
+            self.assertLessEqual(len(decoded['c']), 4)
+            present.update(decoded)
+            present.add(decoded['d'][0])
+
+        self.assertEqual(present, set(['a', 'b', 'c', 'd', 'e', 'f', 'g']))
+        self.assertEqual(spec.generate('B', seed=5), spec.generate('B', seed=5))
+
+        with self.assertRaises(asn1tools.Error) as cm:
+            spec.generate('Foo')
+
+        self.assertEqual(str(cm.exception),
+                         "type 'Foo' not found in types dictionary")
+
+        # Recursive types.
+        spec = asn1tools.compile_string(
+            "A DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "C ::= SEQUENCE { a C OPTIONAL, b SEQUENCE OF C } "
+            "END")
+
+        for seed in range(50):
+            decoded = spec.generate('C', seed)
+            self.assertEqual(spec.decode('C', spec.encode('C', decoded)), decoded)
+
+    def test_records(self):
+        decoded = {'id': 1, 'question': 'Is 1+1=3?'}
+
+        for codec in ['ber', 'der', 'jer', 'per', 'uper', 'xer']:
+            foo = asn1tools.compile_files('tests/files/foo.asn',
+                                          codec,
+                                          container='records')
+            encoded = foo.encode('Question', decoded)
+            question = foo.decode('Question', encoded)
+            self.assertEqual(type(question).__name__, 'Question')
+            self.assertEqual(question.id, 1)
+            self.assertEqual(question['question'], 'Is 1+1=3?')
+            self.assertEqual(question, decoded)
+            self.assertEqual(question.to_dict(), decoded)
+            self.assertEqual(type(question.to_dict()), dict)
+            self.assertEqual(foo.encode('Question', question), encoded)
+            self.assertFalse(hasattr(question, '__dict__'))
+
+        # Nested and optional members, and ASN.1 names that are not
+        # Python identifiers.
+        spec = asn1tools.compile_string(
+            "A DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "B ::= SEQUENCE { "
+            "  a-b INTEGER, "
+            "  class SEQUENCE OF SET { c BOOLEAN OPTIONAL }, "
+            "  ..., "
+            "  [[ d BOOLEAN ]] "
+            "} "
+            "END",
+            'uper',
+            container='records')
+        decoded = {'a-b': 1, 'class': [{'c': True}, {}], 'd': False}
+        b = spec.decode('B', spec.encode('B', decoded))
+        self.assertEqual(b.a_b, 1)
+        self.assertEqual(b.class_[0].c, True)
+        self.assertNotIn('c', b.class_[1])
+        self.assertEqual(b.d, False)
+        self.assertEqual(b.to_dict(), decoded)
+        self.assertEqual(repr(b),
+                         "B(a_b=1, class_=[class_(c=True), class_()], d=False)")
+
+        # Members named as record methods.
+        spec = asn1tools.compile_string(
+            "A DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "B ::= SEQUENCE { "
+            "  keys INTEGER, "
+            "  to-dict BOOLEAN, "
+            "  copy SEQUENCE { items INTEGER } OPTIONAL "
+            "} "
+            "END",
+            'ber',
+            container='records')
+        decoded = {'keys': 1, 'to-dict': True, 'copy': {'items': 2}}
+        b = spec.decode('B', spec.encode('B', decoded))
+        self.assertEqual(b.keys_, 1)
+        self.assertEqual(b.to_dict_, True)
+        self.assertEqual(b.copy_.items_, 2)
+        self.assertEqual(b.keys(), ['keys', 'to-dict', 'copy'])
+        self.assertEqual(b, decoded)
+        self.assertEqual(b.to_dict(), decoded)
+        self.assertEqual(b.copy(), b)
+        self.assertEqual(spec.encode('B', b), spec.encode('B', decoded))
+
+        # Members with the same attribute name.
+        parsed = asn1tools.parse_string(
+            "A DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "B ::= SEQUENCE { "
+            "  a-b INTEGER, "
+            "  c INTEGER "
+            "} "
+            "END")
+        parsed['A']['types']['B']['members'][1]['name'] = 'a_b'
+
+        with self.assertRaises(asn1tools.CompileError) as cm:
+            asn1tools.compile_dict(parsed, container='records')
+
+        self.assertEqual(
+            str(cm.exception),
+            "Members 'a-b' and 'a_b' of type 'B' have the same record "
+            "attribute name 'a_b'.")
+
+        with self.assertRaises(asn1tools.CompileError) as cm:
+            asn1tools.compile_files('tests/files/foo.asn', container='list')
+
+        self.assertEqual(str(cm.exception), "unsupported container 'list'")
+
+    def test_decode_columns(self):
+        spec = asn1tools.compile_string(
+            "A DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "B ::= SEQUENCE { "
+            "  a INTEGER, "
+            "  b C OPTIONAL, "
+            "  c CHOICE { d BOOLEAN, e ENUMERATED { x(3), y(7) } }, "
+            "  f SEQUENCE OF REAL, "
+            "  g OCTET STRING "
+            "} "
+            "C ::= SEQUENCE { h INTEGER } "
+            "END")
+        messages = [
+            spec.encode('B', {'a': 1, 'b': {'h': 5}, 'c': ('d', True),
+                              'f': [1.5], 'g': b''}),
+            spec.encode('B', {'a': -2, 'c': ('e', 'y'), 'f': [], 'g': b''})
+        ]
+
+        values, valid = spec.decode_columns('B', iter(messages))
+        self.assertEqual(sorted(values), ['a', 'b.h', 'c.d', 'c.e'])
+        self.assertEqual(list(values['a']), [1, -2])
+        self.assertEqual(list(valid['a']), [1, 1])
+        self.assertEqual(list(values['b.h']), [5, 0])
+        self.assertEqual(list(valid['b.h']), [1, 0])
+        self.assertEqual(list(values['c.d']), [1, 0])
+        self.assertEqual(list(valid['c.d']), [1, 0])
+        self.assertEqual(list(values['c.e']), [0, 7])
+        self.assertEqual(list(valid['c.e']), [0, 1])
+
+        values, valid = spec.decode_columns('B', messages, ['f.0'])
+        self.assertEqual(list(values['f.0']), [1.5, 0.0])
+        self.assertEqual(list(valid['f.0']), [1, 0])
+
+        # Integers of more than 64 bits.
+        big_messages = [
+            spec.encode('B', {'a': 1, 'c': ('d', True), 'f': [], 'g': b''}),
+            spec.encode('B', {'a': 2 ** 70, 'c': ('d', True), 'f': [], 'g': b''})
+        ]
+        values, valid = spec.decode_columns('B', big_messages, ['a', 'c.d'])
+        self.assertEqual(list(values['a']), [1, 2 ** 70])
+        self.assertEqual(list(valid['a']), [1, 1])
+        self.assertEqual(list(values['c.d']), [1, 1])
+
+        # ENUMERATED values not in the type are kept as they are.
+        field = columns.Field('e', ((columns.MEMBER, 'e'), ), columns.INTEGER, {'x': 3})
+        field.append({'e': 'x'})
+        field.append({'e': 'z'})
+        field.append({})
+        values, valid = field.as_arrays()
+        self.assertEqual(list(values), [3, 'z', 0])
+        self.assertEqual(list(valid), [1, 1, 0])
+
+        with self.assertRaises(asn1tools.DecodeError) as cm:
+            spec.decode_columns('B', messages, ['g'])
+
+        self.assertEqual(
+            str(cm.exception),
+            "field 'g' of type OCTET STRING is not numeric, boolean or enumerated")
+
+        with self.assertRaises(asn1tools.DecodeError) as cm:
+            spec.decode_columns('B', messages, ['b.i'])
+
+        self.assertEqual(str(cm.exception), "field 'b.i' not found")
+
+    def test_generate_python_source(self):
+        source = asn1tools.generate_python_source('tests/files/x691_a2.asn',
+                                                  'uper',
+                                                  decode_cache_size=2,
+                                                  decode_cache_bytes=None,
+                                                  container='records')
+        generated = {}
+        exec(source, generated)
+        spec = generated['specification']
+        x691_a2 = asn1tools.compile_files('tests/files/x691_a2.asn', 'uper')
+        decoded = x691_a2.generate('PersonnelRecord', 0)
+        encoded = x691_a2.encode('PersonnelRecord', decoded)
+
+        self.assertEqual(spec.decode_cache_info().maximum_size, 2)
+        self.assertIsNone(spec.decode_cache_info().maximum_number_of_bytes)
+
+        # Types are compiled once, also when first used by several
+        # threads at the same time.
+        results = []
+
+        def decode():
+            results.append(spec.decode('PersonnelRecord', encoded))
+
+        threads = [threading.Thread(target=decode) for _ in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 8)
+
+        for record in results:
+            self.assertEqual(type(record).__name__, 'PersonnelRecord')
+            self.assertEqual(record, decoded)
+
+        self.assertIs(type(results[0]), type(results[1]))
+
+        with self.assertRaises(asn1tools.CompileError) as cm:
+            asn1tools.frozen.load(generated['SPECIFICATION'],
+                                  'uper',
+                                  asn1tools.__version__,
+                                  container='list')
+
+        self.assertEqual(str(cm.exception), "unsupported container 'list'")
+
+    def test_codecs(self):
+        specification = asn1tools.parse_files('tests/files/foo.asn')
+        expected = deepcopy(specification)
+        foo = asn1tools.compile_dict(specification, codecs=['ber', 'uper', 'jer'])
+        decoded = {'id': 1, 'question': 'Is 1+1=3?'}
+
+        self.assertEqual(foo.codecs, ('ber', 'uper', 'jer'))
+        self.assertEqual(list(foo), ['ber', 'uper', 'jer'])
+        self.assertEqual(len(foo), 3)
+        self.assertIn('uper', foo)
+        self.assertNotIn('per', foo)
+
+        for codec in foo:
+            self.assertEqual(
+                foo[codec].encode('Question', decoded),
+                asn1tools.compile_files('tests/files/foo.asn',
+                                        codec).encode('Question', decoded))
+
+        self.assertIs(foo['uper'], foo['uper'])
+        self.assertEqual(specification, expected)
+        self.assertEqual(foo.keys(), ['ber', 'uper', 'jer'])
+        self.assertIs(foo.get('jer'), foo['jer'])
+        self.assertIsNone(foo.get('per'))
+        self.assertEqual(dict(foo), {codec: foo[codec] for codec in foo})
+
+        with self.assertRaises(KeyError) as cm:
+            foo['per']
+
+        self.assertEqual(str(cm.exception), "'per'")
+
+    def test_transcode(self):
+        foo = asn1tools.compile_string(
+            'A DEFINITIONS AUTOMATIC TAGS ::= BEGIN '
+            'A ::= SEQUENCE { '
+            '  a INTEGER (0..7), '
+            '  b BOOLEAN, '
+            '  c INTEGER DEFAULT 5, '
+            '  d [10] EXPLICIT CHOICE { e NULL, f IA5String } OPTIONAL, '
+            '  g SEQUENCE (SIZE (0..3)) OF INTEGER (0..3), '
+            '  h SEQUENCE OF SEQUENCE { i BOOLEAN OPTIONAL }, '
+            '  ..., '
+            '  j INTEGER OPTIONAL '
+            '} '
+            'END',
+            codecs=['per', 'uper', 'ber', 'jer'])
+        values = [
+            {'a': 1, 'b': True, 'g': [], 'h': []},
+            {'a': 7, 'b': False, 'c': 5, 'g': [1, 2, 3], 'h': [{}]},
+            {
+                'a': 3,
+                'b': True,
+                'c': -1,
+                'd': ('f', 'foo'),
+                'g': [0],
+                'h': [{'i': True}, {}],
+                'j': 1000
+            },
+            {'a': 0, 'b': True, 'd': ('e', None), 'g': [], 'h': []}
+        ]
+
+        for from_codec, to_codec in [('per', 'ber'),
+                                     ('uper', 'ber'),
+                                     ('ber', 'jer'),
+                                     ('ber', 'uper')]:
+            for value in values:
+                encoded = foo[from_codec].encode('A', value)
+                self.assertEqual(
+                    asn1tools.transcode(foo, 'A', encoded, from_codec, to_codec),
+                    foo[to_codec].encode('A', foo[from_codec].decode('A', encoded)))
+
+        with self.assertRaises(asn1tools.DecodeError) as cm:
+            asn1tools.transcode(foo, 'B', b'', 'uper', 'ber')
+
+        self.assertEqual(str(cm.exception),
+                         "type 'B' not found in types dictionary")
+
+        with self.assertRaises(asn1tools.DecodeError) as cm:
+            asn1tools.transcode(foo, 'A', b'\x00', 'uper', 'ber')
+
+        self.assertEqual(str(cm.exception),
+                         "g: out of data at bit offset 7 (0.7 bytes)")
+
+    def test_specification_watcher(self):
+        directory = tempfile.mkdtemp()
+        filenames = [os.path.join(directory, 'a.asn'),
+                     os.path.join(directory, 'b.asn')]
+
+        def write(filename, string, mtime):
+            with open(filename, 'w') as fout:
+                fout.write(string)
+
+            os.utime(filename, (mtime, mtime))
+
+        write(filenames[0],
+              'A DEFINITIONS AUTOMATIC TAGS ::= BEGIN '
+              'A ::= SEQUENCE { a INTEGER (0..7) } '
+              'END',
+              1000)
+        write(filenames[1],
+              'B DEFINITIONS AUTOMATIC TAGS ::= BEGIN '
+              'IMPORTS A FROM A; '
+              'B ::= SEQUENCE { a A } '
+              'C ::= BOOLEAN '
+              'END '
+              'D DEFINITIONS AUTOMATIC TAGS ::= BEGIN '
+              'D ::= INTEGER (0..255) '
+              'END',
+              1000)
+
+        try:
+            spec = asn1tools.SpecificationWatcher(filenames,
+                                                  'uper',
+                                                  decode_cache_size=10)
+            specification = spec.specification
+
+            self.assertEqual(spec.encode('A', {'a': 5}), b'\xa0')
+            self.assertEqual(spec.decode('B', b'\xa0'), {'a': {'a': 5}})
+            self.assertEqual(spec.decode('D', b'\x05'), 5)
+            self.assertEqual(spec.decode_cache_info().size, 2)
+            self.assertFalse(spec.reload())
+
+            # Modified files without modified modules.
+            write(filenames[1],
+                  'B DEFINITIONS AUTOMATIC TAGS ::= BEGIN '
+                  'IMPORTS A FROM A; '
+                  'B ::= SEQUENCE { a A } '
+                  'C ::= BOOLEAN '
+                  'END '
+                  'D DEFINITIONS AUTOMATIC TAGS ::= BEGIN '
+                  'D ::= INTEGER (0..255) '
+                  'END ',
+                  2000)
+            self.assertFalse(spec.reload())
+            self.assertIs(spec.specification, specification)
+
+            # Types of modules that neither were modified nor import
+            # from a modified module are kept in the decode cache.
+            write(filenames[0],
+                  'A DEFINITIONS AUTOMATIC TAGS ::= BEGIN '
+                  'A ::= SEQUENCE { a INTEGER (0..15) } '
+                  'END',
+                  2000)
+            self.assertTrue(spec.reload())
+            self.assertIsNot(spec.specification, specification)
+            self.assertEqual(specification.encode('A', {'a': 5}), b'\xa0')
+            self.assertEqual(spec.encode('A', {'a': 5}), b'\x50')
+            self.assertEqual(spec.decode_cache_info().size, 1)
+            self.assertIs(spec.modules['D']['D'], specification.modules['D']['D'])
+            self.assertIsNot(spec.modules['B']['B'], specification.modules['B']['B'])
+            self.assertEqual(spec.decode('B', b'\x50'), {'a': {'a': 5}})
+
+            # The previous specification is kept if compiling fails.
+            specification = spec.specification
+
+            with patch('asn1tools.watcher.LOGGER') as logger:
+                write(filenames[0], 'A DEFINITIONS ::= BEGIN', 3000)
+                self.assertFalse(spec.reload())
+
+            self.assertEqual(logger.warning.call_count, 1)
+            self.assertIs(spec.specification, specification)
+
+            # Reloaded by the background thread.
+            filename = os.path.join(directory, 'd.asn')
+            write(filename,
+                  'D DEFINITIONS AUTOMATIC TAGS ::= BEGIN '
+                  'D ::= INTEGER (0..255) '
+                  'END',
+                  1000)
+            spec = asn1tools.compile_files(filename, 'uper', watch=True)
+
+            try:
+                self.assertEqual(spec.decode('D', b'\x05'), 5)
+                write(filename,
+                      'D DEFINITIONS AUTOMATIC TAGS ::= BEGIN '
+                      'D ::= INTEGER (0..15) '
+                      'END',
+                      3000)
+
+                for _ in range(100):
+                    if spec.decode('D', b'\x50') == 5:
+                        break
+
+                    time.sleep(0.05)
+
+                self.assertEqual(spec.decode('D', b'\x50'), 5)
+            finally:
+                spec.stop()
+        finally:
+            shutil.rmtree(directory)
+
+    def test_lazy_imports(self):
+        # The parser, the codecs and prompt_toolkit are imported on
+        # first use.
+        code = ("import sys; import asn1tools; "
+                "asn1tools.compile_dict({}, 'per'); "
+                "print(' '.join(sorted(sys.modules)))")
+        modules = subprocess.check_output([sys.executable, '-c', code])
+        modules = modules.decode('ascii').split()
+
+        self.assertIn('asn1tools.codecs.per', modules)
+        self.assertNotIn('asn1tools.codecs.xer', modules)
+        self.assertNotIn('asn1tools.parser', modules)
+        self.assertNotIn('pyparsing', modules)
+        self.assertNotIn('prompt_toolkit', modules)
+
 
 if __name__ == '__main__':
     unittest.main()
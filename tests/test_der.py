@@ -178,5 +178,84 @@ class Asn1ToolsDerTest(Asn1ToolsBaseTest):
             self.assert_encode_decode(foo, type_name, decoded, encoded)
 
 
+    def test_encoded(self):
+        foo = asn1tools.compile_string(
+            "Foo DEFINITIONS ::= "
+            "BEGIN "
+            "A ::= SEQUENCE { "
+            "  a [0] B, "
+            "  b SEQUENCE OF B, "
+            "  c CHOICE { "
+            "    d B, "
+            "    e [3] INTEGER "
+            "  } "
+            "} "
+            "B ::= SEQUENCE { "
+            "  x INTEGER "
+            "} "
+            "END",
+            'der')
+
+        b = foo.pre_encode('B', {'x': 5})
+        self.assertEqual(b, asn1tools.Encoded(b'\x30\x03\x02\x01\x05'))
+        encoded = (
+            b'\x30\x18\xa0\x05\x30\x03\x02\x01\x05\x30\x0a\x30\x03\x02\x01'
+            b'\x05\x30\x03\x02\x01\x05\xa3\x03\x02\x01\x07'
+        )
+        datas = [
+            {'a': b, 'b': [b, {'x': 5}], 'c': ('e', 7)},
+            {
+                'a': asn1tools.Encoded(b'\xa0\x05\x30\x03\x02\x01\x05'),
+                'b': [{'x': 5}, b],
+                'c': ('e', asn1tools.Encoded(b'\x02\x01\x07'))
+            }
+        ]
+
+        for decoded in datas:
+            self.assertEqual(foo.encode('A', decoded), encoded)
+
+        self.assertEqual(foo.decode('A', encoded),
+                         {'a': {'x': 5}, 'b': [{'x': 5}, {'x': 5}], 'c': ('e', 7)})
+
+        with self.assertRaises(asn1tools.EncodeError) as cm:
+            foo.encode('A', {'a': asn1tools.Encoded(b'\x02\x01\x05'),
+                             'b': [],
+                             'c': ('d', b)})
+
+        self.assertEqual(str(cm.exception),
+                         "expected encoded data with tag 'a0', but got '02'")
+
+
+    def test_encoded_automatic_tags(self):
+        foo = asn1tools.compile_string(
+            "Foo DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "A ::= SEQUENCE { "
+            "  a B, "
+            "  b SEQUENCE OF B, "
+            "  c INTEGER "
+            "} "
+            "B ::= SEQUENCE { "
+            "  x INTEGER "
+            "} "
+            "END",
+            'der')
+
+        b = foo.pre_encode('B', {'x': 5})
+        encoded = (
+            b'\x30\x0f\xa0\x03\x80\x01\x05\xa1\x05\x30\x03\x80\x01\x05'
+            b'\x82\x01\x07'
+        )
+        self.assertEqual(foo.encode('A', {'a': {'x': 5}, 'b': [{'x': 5}], 'c': 7}),
+                         encoded)
+        self.assertEqual(foo.encode('A',
+                                    {
+                                        'a': b,
+                                        'b': [b],
+                                        'c': asn1tools.Encoded(b'\x02\x01\x07')
+                                    }),
+                         encoded)
+
+
 if __name__ == '__main__':
     unittest.main()
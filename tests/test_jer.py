@@ -566,6 +566,63 @@ class Asn1ToolsJerTest(unittest.TestCase):
             for line in encoded.splitlines():
                 self.assertIn(line, encoded_lines)
 
+    def test_json_backend_fallback(self):
+        foo = asn1tools.compile_string(
+            "Foo DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "A ::= SEQUENCE { "
+            "  a INTEGER, "
+            "  b SEQUENCE OF INTEGER, "
+            "  c UTF8String "
+            "} "
+            "END",
+            'jer')
+
+        # Integers outside the 64 bits range and non-ASCII characters
+        # are handled by the json module regardless of backend.
+        datas = [
+            ('A',
+             {'a': 1, 'b': [2], 'c': u'foo'},
+             b'{"a":1,"b":[2],"c":"foo"}'),
+            ('A',
+             {'a': 2 ** 70, 'b': [-2 ** 80], 'c': u'foo'},
+             b'{"a":1180591620717411303424,'
+             b'"b":[-1208925819614629174706176],"c":"foo"}'),
+            ('A',
+             {'a': 1, 'b': [], 'c': u'\xe5'},
+             b'{"a":1,"b":[],"c":"\\u00e5"}')
+        ]
+
+        for type_name, decoded, encoded in datas:
+            self.assertEqual(foo.encode(type_name, decoded), encoded)
+            self.assertEqual(foo.decode(type_name, encoded), decoded)
+            self.assertEqual(foo.decode(type_name, memoryview(encoded)),
+                             decoded)
+
+        # Floats in an INTEGER are decoded as is.
+        self.assertEqual(foo.decode('A', b'{"a":1,"b":[1,2.5],"c":""}'),
+                         {'a': 1, 'b': [1, 2.5], 'c': u''})
+
+    def test_json_backend_real(self):
+        foo = asn1tools.compile_string(
+            "Foo DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "A ::= SEQUENCE OF CHOICE { a REAL, b INTEGER } "
+            "END",
+            'jer')
+
+        # Floats are formatted as by the json module regardless of
+        # backend.
+        datas = [
+            ('A',
+             [('a', 1e100), ('a', 1e-7), ('a', 0.5), ('b', 5)],
+             b'[{"a":1e+100},{"a":1e-07},{"a":0.5},{"b":5}]')
+        ]
+
+        for type_name, decoded, encoded in datas:
+            self.assertEqual(foo.encode(type_name, decoded), encoded)
+            self.assertEqual(foo.decode(type_name, encoded), decoded)
+
 
 if __name__ == '__main__':
     unittest.main()
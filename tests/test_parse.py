@@ -1,4 +1,7 @@
+import os
 import sys
+import shutil
+import tempfile
 import unittest
 import importlib
 
@@ -84,6 +87,28 @@ class Asn1ToolsParseTest(unittest.TestCase):
     def test_parse_s1ap_14_4_0(self):
         self.parse_and_verify('s1ap_14_4_0', '3gpp')
 
+    def test_parse_s1ap_14_4_0_jobs_and_cache_dir(self):
+        """Parse the modules in two processes and save them in a cache
+        directory, then load them from the cache.
+
+        """
+
+        cache_dir = tempfile.mkdtemp()
+        module = importlib.import_module('s1ap_14_4_0')
+
+        try:
+            actual = asn1tools.parse_files('tests/files/3gpp/s1ap_14_4_0.asn',
+                                           jobs=2,
+                                           cache_dir=cache_dir)
+            self.assertEqual(actual, module.EXPECTED)
+            self.assertEqual(len(os.listdir(cache_dir)), 6)
+
+            actual = asn1tools.parse_files('tests/files/3gpp/s1ap_14_4_0.asn',
+                                           cache_dir=cache_dir)
+            self.assertEqual(actual, module.EXPECTED)
+        finally:
+            shutil.rmtree(cache_dir)
+
     def test_parse_lpp_14_3_0(self):
         self.parse_and_verify('lpp_14_3_0', '3gpp')
 
@@ -209,6 +234,34 @@ class Asn1ToolsParseTest(unittest.TestCase):
 
         self.assertEqual(actual, expected)
 
+    def test_parse_error_line_number_in_second_module(self):
+        cache_dir = tempfile.mkdtemp()
+        filename = os.path.join(cache_dir, 'two_modules.asn')
+
+        with open(filename, 'w') as fout:
+            fout.write('A DEFINITIONS ::= BEGIN END\n'
+                       'B DEFINITIONS ::= BEGIN\n'
+                       'c ::= INTEGER\n'
+                       'END\n')
+
+        try:
+            with self.assertRaises(asn1tools.ParseError) as cm:
+                asn1tools.parse_files(filename)
+
+            self.assertEqual(str(cm.exception),
+                             "{}: Invalid ASN.1 syntax at line 3, column 3: "
+                             "'c >!<::= INTEGER': Expected Type.".format(filename))
+
+            # In a second file, parsed in another process.
+            with self.assertRaises(asn1tools.ParseError) as cm:
+                asn1tools.parse_files(['tests/files/foo.asn', filename], jobs=2)
+
+            self.assertEqual(str(cm.exception),
+                             "{}: Invalid ASN.1 syntax at line 3, column 3: "
+                             "'c >!<::= INTEGER': Expected Type.".format(filename))
+        finally:
+            shutil.rmtree(cache_dir)
+
     def test_parse_error_empty_string(self):
         with self.assertRaises(asn1tools.ParseError) as cm:
             asn1tools.parse_string('')
@@ -1008,6 +1008,83 @@ class Asn1ToolsUPerTest(Asn1ToolsBaseTest):
 
         self.assert_encode_decode(its, 'Traces', decoded, encoded)
 
+    def test_s1ap_14_4_0(self):
+        s1ap = asn1tools.compile_files('tests/files/3gpp/s1ap_14_4_0.asn',
+                                       'uper')
+
+        # Message 1.
+        decoded = (
+            'successfulOutcome',
+            {
+                'procedureCode': 17,
+                'criticality': 'reject',
+                'value': {
+                    'protocolIEs': [
+                        {
+                            'id': 105,
+                            'criticality': 'reject',
+                            'value': [
+                                {
+                                    'servedPLMNs': [
+                                        b'\xab\xcd\xef',
+                                        b'\x12\x34\x56'
+                                    ],
+                                    'servedGroupIDs': [
+                                        b'\x22\x22'
+                                    ],
+                                    'servedMMECs': [
+                                        b'\x11'
+                                    ]
+                                }
+                            ]
+                        }
+                    ]
+                }
+            }
+        )
+
+        encoded = (
+            b'\x22\x20\xa0\x00\x04\x01\xa4\x0e\x00\x6a\xf3\x7b\xc4\x8d\x15\x80'
+            b'\x00\x08\x88\x80\x04\x40\x00'
+        )
+
+        self.assert_encode_decode(s1ap, 'S1AP-PDU', decoded, encoded)
+
+    def test_information_object(self):
+        information_object = asn1tools.compile_files(
+            'tests/files/information_object.asn',
+            'uper')
+
+        datas = [
+            (
+                'ItemWithoutConstraints',
+                {'id': 0, 'value': b'\x05', 'comment': 'item 0', 'extra': 2},
+                b'\x01\x00\x01\x05\x06\xd3\xd3\x2e\xd4\x0c\x00\x40\x80'
+            ),
+            (
+                'ItemWithConstraints',
+                {'id': 0, 'value': True, 'comment': 'item 0', 'extra': 2},
+                b'\x01\x00\x01\x80\x06\xd3\xd3\x2e\xd4\x0c\x00\x40\x80'
+            ),
+            (
+                'ItemWithConstraints',
+                {
+                    'id': 1,
+                    'value': {'myValue': 7, 'myType': 0},
+                    'comment': 'item 1',
+                    'extra': 5
+                },
+                b'\x01\x01\x05\x02\x01\x07\x01\x00\x06\xd3\xd3\x2e\xd4\x0c\x40'
+                b'\x41\x40'
+            )
+        ]
+
+        for type_name, decoded, encoded in datas:
+            self.assert_encode_decode(information_object,
+                                      type_name,
+                                      decoded,
+                                      encoded)
+
     def test_encode_all_types(self):
         all_types = asn1tools.compile_files('tests/files/all_types.asn',
                                             'uper')
@@ -1427,6 +1504,14 @@ class Asn1ToolsUPerTest(Asn1ToolsBaseTest):
             "B ::= SEQUENCE SIZE (2) OF INTEGER "
             "C ::= SEQUENCE SIZE (1..5) OF INTEGER "
             "D ::= SEQUENCE SIZE (1..2, ...) OF INTEGER "
+            "E ::= SEQUENCE OF INTEGER (-2..5) "
+            "F ::= SEQUENCE SIZE (3) OF BOOLEAN "
+            "G ::= SEQUENCE SIZE (0..4) OF ENUMERATED { a, b, c } "
+            "H ::= SEQUENCE OF INTEGER (0..255) "
+            "I ::= SEQUENCE { "
+            "  a BOOLEAN, "
+            "  b SEQUENCE SIZE (3) OF INTEGER (0..7) "
+            "} "
             "END",
             'uper')
 
@@ -1439,12 +1524,31 @@ class Asn1ToolsUPerTest(Asn1ToolsBaseTest):
             ('B', [4663, 222322233], b'\x02\x12\x37\x04\x0d\x40\x5e\x39'),
             ('C',               [1], b'\x00\x20\x20'),
             ('C',            [1, 2], b'\x20\x20\x20\x20\x40'),
-            ('D',            [2, 1], b'\x40\x40\x80\x40\x40')
+            ('D',            [2, 1], b'\x40\x40\x80\x40\x40'),
+            ('E',                 [], b'\x00'),
+            ('E',         [-2, 5, 0], b'\x03\x1d\x00'),
+            ('F', [True, False, True], b'\xa0'),
+            ('G',    ['c', 'a', 'b'], b'\x70\x80'),
+            ('H',           [1, 255], b'\x02\x01\xff'),
+            ('I', {'a': True, 'b': [1, 2, 7]}, b'\x95\xc0')
         ]
 
         for type_name, decoded, encoded in datas:
             self.assert_encode_decode(foo, type_name, decoded, encoded)
 
+        # Element values out of range.
+        with self.assertRaises(asn1tools.EncodeError) as cm:
+            foo.encode('E', [1, 6])
+
+        self.assertEqual(str(cm.exception),
+                         'expected integers in the range -2..5, but got 6')
+
+        with self.assertRaises(asn1tools.EncodeError) as cm:
+            foo.encode('E', [-3, 1])
+
+        self.assertEqual(str(cm.exception),
+                         'expected integers in the range -2..5, but got -3')
+
         # Long sequences are not yet supported.
         with self.assertRaises(NotImplementedError) as cm:
             foo.encode('A', 16384 * [1])
@@ -1755,6 +1859,65 @@ class Asn1ToolsUPerTest(Asn1ToolsBaseTest):
         self.assertEqual(foo.decode('Q', b'\xc0\x40\x60\x00\x59\x00'),
                          {'a': {'a': True}, 'b': 100})
 
+    def test_sequence_fixed_size_members(self):
+        foo = asn1tools.compile_string(
+            "Foo DEFINITIONS AUTOMATIC TAGS ::= "
+            "BEGIN "
+            "A ::= SEQUENCE { "
+            "  a BOOLEAN, "
+            "  b INTEGER (-1..5), "
+            "  c ENUMERATED { x, y, z }, "
+            "  d OCTET STRING OPTIONAL, "
+            "  e BOOLEAN, "
+            "  f BOOLEAN, "
+            "  g INTEGER (0..255) "
+            "} "
+            "END",
+            'uper')
+
+        datas = [
+            ('A',
+             {'a': True, 'b': 5, 'c': 'z', 'e': False, 'f': True, 'g': 3},
+             b'\x74\x81\x80'),
+            ('A',
+             {
+                 'a': False,
+                 'b': -1,
+                 'c': 'x',
+                 'd': b'\x12',
+                 'e': True,
+                 'f': False,
+                 'g': 255
+             },
+             b'\x80\x02\x25\x7f\x80')
+        ]
+
+        for type_name, decoded, encoded in datas:
+            self.assert_encode_decode(foo, type_name, decoded, encoded)
+
+        # Missing member in a run of fixed size members.
+        with self.assertRaises(asn1tools.EncodeError) as cm:
+            foo.encode('A', {'a': True, 'b': 5, 'e': False, 'f': True, 'g': 3})
+
+        self.assertEqual(
+            str(cm.exception),
+            "Sequence member 'c' not found in {'a': True, 'b': 5, 'e': False, "
+            "'f': True, 'g': 3}.")
+
+        # Bad enumeration index in a run of fixed size members.
+        with self.assertRaises(asn1tools.DecodeError) as cm:
+            foo.decode('A', b'\x7f\xff')
+
+        self.assertEqual(str(cm.exception),
+                         'c: expected enumeration index in [0, 1, 2], but got 3')
+
+        # Out of data in a run of fixed size members.
+        with self.assertRaises(asn1tools.codecs.per.OutOfDataError) as cm:
+            foo.decode('A', b'\x74')
+
+        self.assertEqual(str(cm.exception),
+                         'f: out of data at bit offset 8 (1.0 bytes)')
+
     def test_choice(self):
         foo = asn1tools.compile_string(
             "Foo DEFINITIONS AUTOMATIC TAGS ::= "